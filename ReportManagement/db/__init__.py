@@ -0,0 +1,9 @@
+"""
+Database connection reuse for the project.
+
+The engines in this package are the stock PostgreSQL and SQLite backends
+with per-worker connection counters (metrics) and, for PostgreSQL, an
+optional in-process connection pool (pool). They are selected in
+``DATABASES`` in settings. The router sends dashboard and report reads to
+read replicas.
+"""
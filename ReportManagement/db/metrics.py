@@ -0,0 +1,75 @@
+"""
+Per-process counters of database connections opened and reused.
+
+Every gunicorn worker process keeps its own counters, so the numbers read
+through connection_stats() describe the worker that serves the request.
+``reused`` counts requests that started on a connection kept open from an
+earlier request (CONN_MAX_AGE); ``pool_reused`` counts connections handed
+out again by the connection pool.
+"""
+import os
+import threading
+
+from django.core.signals import request_started
+from django.db import connections
+from django.dispatch import receiver
+
+from . import pool
+
+
+COUNTERS = ("opened", "reused", "pool_reused", "health_check_failures")
+
+_lock = threading.Lock()
+_stats = {}
+_pid = os.getpid()
+
+
+def record(alias, counter):
+    global _pid
+    with _lock:
+        if _pid != os.getpid():
+            # A forked worker starts from zero rather than the parent's counts
+            _pid = os.getpid()
+            _stats.clear()
+        _stats.setdefault(alias, dict.fromkeys(COUNTERS, 0))[counter] += 1
+
+
+def connection_stats():
+    """
+    {alias: counters} for this process, with the pool state of pooled aliases
+    """
+    with _lock:
+        stats = {alias: dict(counters) for alias, counters in _stats.items()} if _pid == os.getpid() else {}
+    for alias, counters in stats.items():
+        counters["pool"] = pool.pool_stats(alias)
+    return {"pid": os.getpid(), "databases": stats}
+
+
+def reset_connection_stats():
+    with _lock:
+        _stats.clear()
+
+
+class ConnectionMetricsMixin:
+    """
+    Counts physical connections and failed health checks of a database wrapper
+    """
+
+    def get_new_connection(self, conn_params):
+        connection = super().get_new_connection(conn_params)
+        record(self.alias, "opened")
+        return connection
+
+    def close_if_health_check_failed(self):
+        checking = self.connection is not None and self.health_check_enabled and not self.health_check_done
+        super().close_if_health_check_failed()
+        if checking and self.connection is None:
+            record(self.alias, "health_check_failures")
+
+
+@receiver(request_started)
+def count_reused_connections(**kwargs):
+    # Runs after Django closed the connections that are too old or broken
+    for connection in connections.all(initialized_only=True):
+        if connection.connection is not None and isinstance(connection, ConnectionMetricsMixin):
+            record(connection.alias, "reused")
@@ -0,0 +1,86 @@
+"""
+In-process connection pool shared by the threads of a worker.
+
+With threaded workers each thread owns its Django connection; the pool lets
+those threads hand connections to each other at the end of a request instead
+of closing them, and caps how many one process opens. Pools are per process:
+a forked worker never uses connections opened by its parent.
+"""
+import os
+import threading
+import time
+
+from django.db import OperationalError
+
+
+class ConnectionPool:
+    def __init__(self, size, timeout):
+        self.size = size
+        self.timeout = timeout
+        self.open = 0
+        self.idle = []
+        self.condition = threading.Condition()
+
+    def acquire(self, connect):
+        """
+        (connection, reused): an idle connection, or a new one from ``connect()``
+        while fewer than ``size`` are open. Waits up to ``timeout`` seconds.
+        """
+        deadline = time.monotonic() + self.timeout
+        with self.condition:
+            while True:
+                if self.idle:
+                    return self.idle.pop(), True
+                if self.open < self.size:
+                    self.open += 1
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or not self.condition.wait(remaining):
+                    raise OperationalError(f"No database connection free in the pool of {self.size}")
+
+        try:
+            return connect(), False
+        except Exception:
+            with self.condition:
+                self.open -= 1
+                self.condition.notify()
+            raise
+
+    def release(self, connection, discard=False):
+        with self.condition:
+            if discard:
+                self.open -= 1
+            else:
+                self.idle.append(connection)
+            self.condition.notify()
+        if discard:
+            try:
+                connection.close()
+            except Exception:
+                pass
+
+    def stats(self):
+        with self.condition:
+            return {"size": self.size, "open": self.open, "idle": len(self.idle)}
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+_pid = os.getpid()
+
+
+def get_pool(alias, size, timeout):
+    global _pid
+    with _pools_lock:
+        if _pid != os.getpid():
+            _pid = os.getpid()
+            _pools.clear()
+        if alias not in _pools:
+            _pools[alias] = ConnectionPool(size, timeout)
+        return _pools[alias]
+
+
+def pool_stats(alias):
+    with _pools_lock:
+        pool = _pools.get(alias) if _pid == os.getpid() else None
+    return pool.stats() if pool else None
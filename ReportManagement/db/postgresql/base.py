@@ -0,0 +1,82 @@
+"""
+PostgreSQL backend with connection counters and an optional connection pool.
+
+Set POOL_SIZE (and POOL_TIMEOUT, in seconds) on the database in settings to
+return connections to the process pool when Django closes them instead of
+disconnecting. A pooled connection is rolled back if it was left inside a
+transaction, dropped if it is broken, and with CONN_HEALTH_CHECKS checked
+with "SELECT 1" before it is handed out again.
+"""
+from django.db.backends.postgresql import base
+
+from ..metrics import ConnectionMetricsMixin, record
+from ..pool import get_pool
+
+
+Database = base.Database
+
+# connection.info.transaction_status (same values in psycopg2 and psycopg 3)
+TRANSACTION_STATUS_IDLE = 0
+TRANSACTION_STATUS_INTRANS = 2
+TRANSACTION_STATUS_INERROR = 3
+
+
+class DatabaseWrapper(ConnectionMetricsMixin, base.DatabaseWrapper):
+
+    @property
+    def pool(self):
+        size = self.settings_dict.get("POOL_SIZE") or 0
+        if size <= 0:
+            return None
+        return get_pool(self.alias, size, self.settings_dict.get("POOL_TIMEOUT", 10))
+
+    def get_new_connection(self, conn_params):
+        pool = self.pool
+        if pool is None:
+            return super().get_new_connection(conn_params)
+
+        def connect():
+            return super(DatabaseWrapper, self).get_new_connection(conn_params)
+
+        while True:
+            connection, reused = pool.acquire(connect)
+            if not reused:
+                return connection
+            if self.settings_dict["CONN_HEALTH_CHECKS"] and not self._ping(connection):
+                pool.release(connection, discard=True)
+                record(self.alias, "health_check_failures")
+                continue
+            record(self.alias, "pool_reused")
+            return connection
+
+    def _close(self):
+        pool = self.pool
+        if pool is None or self.connection is None:
+            return super()._close()
+        with self.wrap_database_errors:
+            pool.release(self.connection, discard=not self._reset(self.connection))
+
+    @staticmethod
+    def _ping(connection):
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT 1")
+            return True
+        except Database.Error:
+            return False
+
+    @staticmethod
+    def _reset(connection):
+        """
+        Leave ``connection`` outside any transaction; False if it can't be reused
+        """
+        if connection.closed:
+            return False
+        status = connection.info.transaction_status
+        if status in (TRANSACTION_STATUS_INTRANS, TRANSACTION_STATUS_INERROR):
+            try:
+                connection.rollback()
+            except Database.Error:
+                return False
+            return True
+        return status == TRANSACTION_STATUS_IDLE
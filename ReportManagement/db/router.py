@@ -0,0 +1,144 @@
+"""
+Read replica routing for dashboards and reports.
+
+Views decorated with ``read_from_replica`` read from one of the replicas in
+DATABASE_REPLICA_ALIASES on GET and HEAD requests; everything else, and every
+write, uses the primary. To keep read-after-write consistency, a request
+that writes sets a cookie pinning that browser to the primary for
+REPLICA_PIN_SECONDS, and reads later in the same request or inside a
+transaction also go to the primary. ReplicaRoutingMiddleware keeps the
+per-request state the router works from and watches the statements run on
+the primary for writes; outside requests (management commands, workers)
+every read uses the primary.
+"""
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.http import FileResponse, StreamingHttpResponse
+
+
+PIN_COOKIE = "db_primary_pin"
+
+WRITE_STATEMENTS = ("INSERT", "UPDATE", "DELETE")
+
+_state = ContextVar("replica_routing", default=None)
+
+
+class RoutingState:
+    def __init__(self, pinned=False):
+        self.pinned = pinned
+        self.wrote = False
+        self.replica_reads = False
+        # One replica per request, so its reads see a single point in time
+        aliases = settings.DATABASE_REPLICA_ALIASES
+        self.replica = random.choice(aliases) if aliases else None
+
+    def read_alias(self):
+        if not self.replica_reads or self.replica is None or self.pinned or self.wrote:
+            return None
+        if connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return None
+        return self.replica
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        state = _state.get()
+        return state.read_alias() if state is not None else None
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same rows as the primary
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db not in settings.DATABASE_REPLICA_ALIASES
+
+
+class ReplicaRoutingMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        state = RoutingState(pinned=PIN_COOKIE in request.COOKIES)
+
+        def watch_writes(execute, sql, params, many, context):
+            if sql.lstrip()[:6].upper() in WRITE_STATEMENTS:
+                state.wrote = True
+            return execute(sql, params, many, context)
+
+        token = _state.set(state)
+        try:
+            with connections[DEFAULT_DB_ALIAS].execute_wrapper(watch_writes):
+                response = self.get_response(request)
+        finally:
+            _state.reset(token)
+        if state.wrote:
+            response.set_cookie(
+                PIN_COOKIE, "1", max_age=settings.REPLICA_PIN_SECONDS, httponly=True, samesite="Lax",
+            )
+        return response
+
+
+def read_from_replica(view):
+    """
+    Read from a replica while ``view`` serves a GET or HEAD request, including
+    while its streamed response is generated
+    """
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        state = _state.get()
+        if state is None or request.method not in ("GET", "HEAD"):
+            return view(request, *args, **kwargs)
+
+        state.replica_reads = True
+        try:
+            response = view(request, *args, **kwargs)
+        finally:
+            state.replica_reads = False
+
+        # Streamed content is produced after the middleware has returned
+        if isinstance(response, StreamingHttpResponse) and not isinstance(response, FileResponse):
+            stream_state = RoutingState(pinned=state.pinned or state.wrote)
+            stream_state.replica = state.replica
+            response.streaming_content = _stream_with_state(response.streaming_content, stream_state)
+        return response
+
+    return wrapper
+
+
+def _stream_with_state(content, state):
+    state.replica_reads = True
+    chunks = iter(content)
+    while True:
+        token = _state.set(state)
+        try:
+            chunk = next(chunks, None)
+        finally:
+            _state.reset(token)
+        if chunk is None:
+            return
+        yield chunk
+
+
+@contextmanager
+def primary_reads():
+    """
+    Read from the primary inside the block, e.g. to compute data that is
+    cached for everyone
+    """
+    state = _state.get()
+    if state is None or not state.replica_reads:
+        yield
+        return
+    state.replica_reads = False
+    try:
+        yield
+    finally:
+        state.replica_reads = True
@@ -11,7 +11,7 @@ https://docs.djangoproject.com/en/5.0/ref/settings/
 """
 
 from pathlib import Path
-from decouple import config
+from decouple import Csv, config
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -43,6 +43,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
     'tailwind',
     'accounts',
     'manufacturing',
@@ -57,6 +58,7 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'ReportManagement.db.router.ReplicaRoutingMiddleware',
 ]
 
 ROOT_URLCONF = 'ReportManagement.urls'
@@ -77,6 +79,7 @@ TEMPLATES = [
                 'django.template.context_processors.request',
                 'django.contrib.auth.context_processors.auth',
                 'django.contrib.messages.context_processors.messages',
+                'accounts.context_processors.user_role',
             ],
         },
     },
@@ -88,23 +91,91 @@ WSGI_APPLICATION = 'ReportManagement.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/5.0/ref/settings/#databases
 
-DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.postgresql',
-        'NAME': config('DATABASE_NAME'),
-        'USER': config('DATABASE_USER'),
-        'PASSWORD': config('DATABASE_PASSWORD'),
-        'HOST': config('DATABASE_HOST'),
-        'PORT': config('DATABASE_PORT'),
-    }
+# Set DATABASE_ENGINE=sqlite to run locally (and run the tests) without Postgres.
+# Postgres-only extras (trigram search indexes) are skipped on SQLite.
+#
+# Connections are reused across requests (ReportManagement/db): each worker
+# thread keeps its connection for DB_CONN_MAX_AGE seconds, checked with a
+# "SELECT 1" before the first query of a request. With DB_POOL_SIZE > 0 the
+# connections go back to a per-process pool of that size at the end of every
+# request instead (meant for threaded workers, so DB_CONN_MAX_AGE defaults to 0);
+# a request waits up to DB_POOL_TIMEOUT seconds for a free connection. Opened
+# and reused counts per worker are served by /api/db-connections/stats/.
+DB_POOL_SIZE = config('DB_POOL_SIZE', default=0, cast=int)
+DB_CONNECTION = {
+    'CONN_MAX_AGE': config('DB_CONN_MAX_AGE', default=0 if DB_POOL_SIZE else 600, cast=int),
+    'CONN_HEALTH_CHECKS': config('DB_CONN_HEALTH_CHECKS', default=True, cast=bool),
 }
 
+if config('DATABASE_ENGINE', default='postgresql') == 'sqlite':
+    DATABASES = {
+        'default': {
+            'ENGINE': 'ReportManagement.db.sqlite3',
+            'NAME': config('DATABASE_NAME', default=str(BASE_DIR / 'db.sqlite3')),
+            **DB_CONNECTION,
+        }
+    }
+else:
+    DATABASES = {
+        'default': {
+            'ENGINE': 'ReportManagement.db.postgresql',
+            'NAME': config('DATABASE_NAME'),
+            'USER': config('DATABASE_USER'),
+            'PASSWORD': config('DATABASE_PASSWORD'),
+            'HOST': config('DATABASE_HOST'),
+            'PORT': config('DATABASE_PORT'),
+            'POOL_SIZE': DB_POOL_SIZE,
+            'POOL_TIMEOUT': config('DB_POOL_TIMEOUT', default=10, cast=int),
+            **DB_CONNECTION,
+        }
+    }
+
+# Read replicas (ReportManagement/db/router.py). DATABASE_REPLICAS lists replica
+# hosts (host or host:port, comma-separated) that share the primary's credentials;
+# on SQLite it lists database files, and naming the primary's own file gives a
+# second alias to try the routing locally. GET requests to dashboards and reports
+# read from a replica; a browser that wrote anything reads from the primary for
+# the next DATABASE_REPLICA_PIN_SECONDS, which must exceed the replication lag.
+DATABASE_REPLICA_ALIASES = []
+for number, replica in enumerate(config('DATABASE_REPLICAS', default='', cast=Csv()), start=1):
+    if DATABASES['default']['ENGINE'].endswith('sqlite3'):
+        location = {'NAME': replica}
+    else:
+        host, _, port = replica.partition(':')
+        location = {'HOST': host, 'PORT': port or DATABASES['default']['PORT']}
+    DATABASES[f'replica_{number}'] = {**DATABASES['default'], **location, 'TEST': {'MIRROR': 'default'}}
+    DATABASE_REPLICA_ALIASES.append(f'replica_{number}')
+
+DATABASE_ROUTERS = ['ReportManagement.db.router.ReplicaRouter']
+REPLICA_PIN_SECONDS = config('DATABASE_REPLICA_PIN_SECONDS', default=5, cast=int)
+
 CSRF_TRUSTED_ORIGINS = [
     "https://delval-report-management-production.up.railway.app",
 ]
 
 
 
+# Authentication and sessions
+
+# request.user is read from the cache (accounts.backends). ModelBackend stays
+# listed so sessions created before the cached backend keep working.
+AUTHENTICATION_BACKENDS = [
+    'accounts.backends.CachedModelBackend',
+    'django.contrib.auth.backends.ModelBackend',
+]
+
+# SESSION_BACKEND picks the session store:
+#   cached_db       cache in front of django_session (survives a cache flush)
+#   db              django_session only, a SELECT on every request
+#   cache           cache only; needs a shared, persistent CACHE_BACKEND
+#                   (sessions are lost on eviction or restart)
+#   signed_cookies  no server-side storage; the session lives in the cookie
+# Expired rows of the database stores are removed by `manage.py compact_sessions`,
+# which should run on a schedule (e.g. hourly cron).
+SESSION_BACKEND = config('SESSION_BACKEND', default='cached_db')
+SESSION_ENGINE = f'django.contrib.sessions.backends.{SESSION_BACKEND}'
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.0/ref/settings/#auth-password-validators
 
@@ -147,3 +218,28 @@ STATICFILES_DIRS = []
 # https://docs.djangoproject.com/en/5.0/ref/settings/#default-auto-field
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
+
+
+# Rendered report cache (heat annexure PDFs, printable order reports)
+
+REPORT_CACHE_DIR = config('REPORT_CACHE_DIR', default=str(BASE_DIR / 'report_cache'))
+REPORT_CACHE_MAX_BYTES = config('REPORT_CACHE_MAX_BYTES', default=256 * 1024 * 1024, cast=int)
+
+# Processes the export_heat_reports command renders heat reports in (1 = in-process).
+# ZIP exports from the web always render in the request's process.
+REPORT_EXPORT_WORKERS = config('REPORT_EXPORT_WORKERS', default=2, cast=int)
+
+# The assembler order page can post every heat number of a large order at once
+DATA_UPLOAD_MAX_NUMBER_FIELDS = config('DATA_UPLOAD_MAX_NUMBER_FIELDS', default=10000, cast=int)
+
+# Cache for dashboard query results (manufacturing.dashboard_cache). Local memory
+# is per process; with several workers set CACHE_BACKEND / CACHE_LOCATION to a
+# shared backend (e.g. django.core.cache.backends.redis.RedisCache and
+# redis://127.0.0.1:6379/1) so an invalidation reaches every worker.
+CACHES = {
+    'default': {
+        'BACKEND': config('CACHE_BACKEND', default='django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': config('CACHE_LOCATION', default=''),
+    }
+}
+DASHBOARD_CACHE_TIMEOUT = config('DASHBOARD_CACHE_TIMEOUT', default=300, cast=int)
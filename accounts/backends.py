@@ -0,0 +1,68 @@
+"""
+Authentication backend that keeps the logged-in user in the cache.
+
+Every authenticated request loads ``request.user`` through the backend's
+``get_user``; ModelBackend does that with an auth_user SELECT. The cache holds
+the user's fields minus the password hash, plus the session auth hash that
+``django.contrib.auth.get_user`` checks the session against. The entry is
+dropped by the User signals in accounts.models whenever the user is saved or
+deleted, so password, is_active and permission flag changes apply on the next
+request. Writes that bypass the ORM (``QuerySet.update``) show up after
+USER_CACHE_TIMEOUT at the latest.
+"""
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
+
+
+USER_CACHE_TIMEOUT = 300
+
+
+def user_cache_key(user_pk):
+    return f"accounts:user:{user_pk}"
+
+
+def cached_user_data(user):
+    """
+    What the cache keeps of ``user``: every field except the password hash
+    """
+    return {
+        "fields": {
+            field.attname: getattr(user, field.attname)
+            for field in user._meta.concrete_fields
+            if field.attname != "password"
+        },
+        "session_auth_hash": user.get_session_auth_hash(),
+    }
+
+
+def user_from_cache(data):
+    """
+    Rebuild a user from cached_user_data(); the password stays deferred
+    """
+    UserModel = get_user_model()
+    fields = data["fields"]
+    user = UserModel.from_db(DEFAULT_DB_ALIAS, list(fields), list(fields.values()))
+
+    def get_session_auth_hash():
+        # The cached hash stands in for the password until it is loaded or changed
+        if "password" in user.__dict__:
+            return UserModel.get_session_auth_hash(user)
+        return data["session_auth_hash"]
+
+    user.get_session_auth_hash = get_session_auth_hash
+    return user
+
+
+class CachedModelBackend(ModelBackend):
+    def get_user(self, user_id):
+        key = user_cache_key(user_id)
+        data = cache.get(key)
+        if data is None:
+            user = super().get_user(user_id)
+            if user is not None:
+                cache.set(key, cached_user_data(user), USER_CACHE_TIMEOUT)
+            return user
+        user = user_from_cache(data)
+        return user if self.user_can_authenticate(user) else None
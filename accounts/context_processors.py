@@ -0,0 +1,13 @@
+from django.utils.functional import SimpleLazyObject
+
+from .roles import get_user_role
+
+
+def user_role(request):
+    """
+    ``user_role`` for templates, resolved only if a template reads it
+    """
+    user = getattr(request, "user", None)
+    if user is None or not user.is_authenticated:
+        return {"user_role": ""}
+    return {"user_role": SimpleLazyObject(lambda: get_user_role(user))}
@@ -0,0 +1,97 @@
+import time
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from accounts.models import Profile
+from manufacturing.benchmarks.runner import percentile
+from manufacturing.models import MainActuator
+
+
+BENCH_USERNAME = "bench-assembler"
+ENGINES = ["db", "cached_db", "cache", "signed_cookies"]
+MODEL_BACKEND = "django.contrib.auth.backends.ModelBackend"
+CACHED_BACKEND = "accounts.backends.CachedModelBackend"
+
+
+class Command(BaseCommand):
+    help = (
+        "Request the assembler pages as a logged-in assembler under each session store and "
+        "report database round trips (total, session, user load) and latency per request. "
+        "The first row is the previous setup: database sessions with an uncached user."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--repeat", type=int, default=50, help="Timed requests per page")
+        parser.add_argument("--order", help="Order number for the order details page (default: newest order)")
+        parser.add_argument("--cleanup", action="store_true", help="Delete the benchmark user afterwards")
+
+    def handle(self, *args, **options):
+        user = self.bench_user()
+        pages = [reverse("assembler_dashboard")]
+        order_no = options["order"] or (
+            MainActuator.objects.order_by("-created_at").values_list("order_no", flat=True).first()
+        )
+        if order_no:
+            pages.append(reverse("assembler_order_details", args=[order_no]))
+
+        runs = [("db, uncached user", "db", MODEL_BACKEND)]
+        runs += [(engine, engine, CACHED_BACKEND) for engine in ENGINES]
+
+        self.stdout.write(
+            f"{'page':<40}{'sessions':<20}{'queries':>9}{'session':>9}{'user':>6}{'p50 ms':>9}{'p95 ms':>9}"
+        )
+        for label, engine, backend in runs:
+            with override_settings(
+                SESSION_ENGINE=f"django.contrib.sessions.backends.{engine}",
+                AUTHENTICATION_BACKENDS=[backend, MODEL_BACKEND],
+            ):
+                client = Client(HTTP_HOST="localhost")
+                client.force_login(user, backend=backend)
+                for page in pages:
+                    queries, session, user_loads, timings = self.measure(client, page, options["repeat"])
+                    self.stdout.write(
+                        f"{page:<40}{label:<20}{queries:>9.1f}{session:>9.1f}{user_loads:>6.1f}"
+                        f"{percentile(timings, 50):>9.2f}{percentile(timings, 95):>9.2f}"
+                    )
+                client.logout()
+
+        if options["cleanup"]:
+            user.delete()
+            self.stdout.write(f"Deleted user {BENCH_USERNAME}")
+
+    def bench_user(self):
+        user, created = User.objects.get_or_create(username=BENCH_USERNAME)
+        if created:
+            user.set_unusable_password()
+            user.save()
+        Profile.objects.update_or_create(user=user, defaults={"role": "Assembler"})
+        return user
+
+    def measure(self, client, page, repeat):
+        # One untimed request warms the session, user, role and dashboard caches
+        self.get(client, page)
+
+        queries = session = user_loads = 0
+        timings = []
+        for _ in range(repeat):
+            with CaptureQueriesContext(connection) as captured:
+                start = time.perf_counter()
+                self.get(client, page)
+                timings.append((time.perf_counter() - start) * 1000)
+            for query in captured.captured_queries:
+                sql = query["sql"]
+                queries += 1
+                session += '"django_session"' in sql
+                user_loads += 'FROM "auth_user" WHERE "auth_user"."id" =' in sql
+        return queries / repeat, session / repeat, user_loads / repeat, timings
+
+    @staticmethod
+    def get(client, page):
+        response = client.get(page)
+        if response.status_code != 200:
+            raise CommandError(f"GET {page} returned {response.status_code}")
@@ -0,0 +1,39 @@
+from django.contrib.sessions.models import Session
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.utils import timezone
+
+
+class Command(BaseCommand):
+    help = (
+        "Delete expired rows from django_session in small batches, so the table does not grow "
+        "without bound under the db and cached_db session stores. Run it on a schedule "
+        "(e.g. hourly); rows left behind after switching to the cache or signed_cookies "
+        "stores are removed the same way."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=5000, help="Sessions deleted per statement")
+        parser.add_argument(
+            "--vacuum", action="store_true",
+            help="VACUUM ANALYZE django_session afterwards (PostgreSQL) to reclaim the dead rows",
+        )
+
+    def handle(self, *args, **options):
+        now = timezone.now()
+        removed = 0
+        while True:
+            # Short deletes keep row locks brief while users are logging in
+            keys = list(
+                Session.objects.filter(expire_date__lt=now)
+                .values_list("session_key", flat=True)[:options["batch_size"]]
+            )
+            if not keys:
+                break
+            removed += Session.objects.filter(session_key__in=keys).delete()[0]
+
+        if options["vacuum"] and connection.vendor == "postgresql":
+            with connection.cursor() as cursor:
+                cursor.execute(f"VACUUM ANALYZE {Session._meta.db_table}")
+
+        self.stdout.write(self.style.SUCCESS(f"Removed {removed} expired sessions"))
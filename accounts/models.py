@@ -1,6 +1,7 @@
 from django.db import models
 from django.contrib.auth.models import User
-from django.db.models.signals import post_save
+from django.core.cache import cache
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 
 class Profile(models.Model):
@@ -22,6 +23,19 @@ class Profile(models.Model):
     def __str__(self):
         return f"{self.user.username} - {self.role}"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._saved_role = instance.role
+        return instance
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        self._saved_role = self.role
+
+    def has_unsaved_role(self):
+        return self.role != getattr(self, "_saved_role", None)
+
 @receiver(post_save, sender=User)
 def create_user_profile(sender, instance, created, **kwargs):
     if created:
@@ -29,4 +43,17 @@ def create_user_profile(sender, instance, created, **kwargs):
 
 @receiver(post_save, sender=User)
 def save_user_profile(sender, instance, **kwargs):
-    instance.profile.save()
+    # Only a profile loaded on this user and edited through it needs saving;
+    # plain User saves (e.g. last_login at every login) must not touch Profile
+    if User.profile.is_cached(instance) and instance.profile.has_unsaved_role():
+        instance.profile.save()
+
+@receiver([post_save, post_delete], sender=User)
+def forget_cached_user(sender, instance, **kwargs):
+    from .backends import user_cache_key
+    cache.delete(user_cache_key(instance.pk))
+
+@receiver([post_save, post_delete], sender=Profile)
+def forget_cached_role(sender, instance, **kwargs):
+    from .roles import role_cache_key
+    cache.delete(role_cache_key(instance.user_id))
@@ -0,0 +1,63 @@
+"""
+Role resolution for the logged-in user.
+
+A user's role decides their dashboard and is shown in the header of every page.
+It is read from the cache (falling back to the Profile row) and remembered on
+the request, so pages don't query Profile. The Profile signals in
+accounts.models drop the cached role whenever a profile is saved or deleted.
+"""
+from django.core.cache import cache
+from django.urls import reverse
+
+from .models import Profile
+
+
+ROLE_CACHE_TIMEOUT = 300
+
+# Dashboard URL name for each role; unknown roles land on the assembler dashboard
+ROLE_DASHBOARDS = {
+    'Assembly Engineer': 'assembly_engineer_dashboard',
+    'Assembler': 'assembler_dashboard',
+    'Tester': 'tester_dashboard',
+    'Painting Engineer': 'painting_engineer_dashboard',
+    'Painter': 'painter_dashboard',
+    'Blaster': 'blaster_dashboard',
+    'Name plate printer': 'name_plate_printer_dashboard',
+    'Finisher': 'finisher_dashboard',
+    'QA Engineer': 'qa_engineer_dashboard',
+}
+DEFAULT_DASHBOARD = 'assembler_dashboard'
+
+# Roles that record heat numbers and complete serials
+ASSEMBLY_ROLES = ('Assembly Engineer', 'Assembler')
+
+
+def role_cache_key(user_pk):
+    return f"accounts:role:{user_pk}"
+
+
+def get_user_role(user):
+    """
+    Role of ``user``, creating their profile if it is missing
+    """
+    role = getattr(user, "_cached_role", None)
+    if role is None:
+        key = role_cache_key(user.pk)
+        role = cache.get(key)
+        if role is None:
+            profile, _ = Profile.objects.get_or_create(user=user)
+            role = profile.role
+            cache.set(key, role, ROLE_CACHE_TIMEOUT)
+        user._cached_role = role
+    return role
+
+
+def dashboard_url(user):
+    return reverse(ROLE_DASHBOARDS.get(get_user_role(user), DEFAULT_DASHBOARD))
+
+
+def can_edit_serials(user):
+    """
+    Whether ``user`` may change heat numbers and complete serials
+    """
+    return user.is_staff or get_user_role(user) in ASSEMBLY_ROLES
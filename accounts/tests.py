@@ -1,3 +1,174 @@
-from django.test import TestCase
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
 
-# Create your tests here.
+from .backends import CachedModelBackend, user_cache_key
+from .models import Profile
+from .roles import ROLE_DASHBOARDS, get_user_role, role_cache_key
+
+
+PASSWORD = "budget-Passw0rd"
+
+
+@override_settings(PASSWORD_HASHERS=["django.contrib.auth.hashers.MD5PasswordHasher"])
+class AuthQueryBudgetTests(TestCase):
+    """
+    Query-count budgets for the login, registration and dashboard views.
+    Every request starts with an empty cache unless it says otherwise.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user("budget-engineer", password=PASSWORD)
+        Profile.objects.filter(user=cls.user).update(role="Assembly Engineer")
+
+    def setUp(self):
+        cache.clear()
+
+    def test_login_page(self):
+        with self.assertNumQueries(0):
+            response = self.client.get(reverse("login"))
+        self.assertEqual(response.status_code, 200)
+
+    def test_login(self):
+        with self.assertNumQueries(10):
+            response = self.client.post(reverse("login"), {"username": self.user.username, "password": PASSWORD})
+        self.assertRedirects(response, reverse("assembly_engineer_dashboard"), fetch_redirect_response=False)
+
+    def test_failed_login(self):
+        # Each backend looks the user up and checks the password
+        with self.assertNumQueries(2):
+            response = self.client.post(reverse("login"), {"username": self.user.username, "password": "wrong"})
+        self.assertEqual(response.status_code, 200)
+
+    def test_register_page(self):
+        with self.assertNumQueries(0):
+            response = self.client.get(reverse("register"))
+        self.assertEqual(response.status_code, 200)
+
+    def test_register(self):
+        data = {
+            "username": "budget-new", "email": "new@example.com", "first_name": "New", "last_name": "User",
+            "password1": PASSWORD, "password2": PASSWORD,
+        }
+        with self.assertNumQueries(13):
+            response = self.client.post(reverse("register"), data)
+        self.assertRedirects(response, reverse("assembler_dashboard"), fetch_redirect_response=False)
+
+    def test_logout(self):
+        self.client.force_login(self.user)
+        with self.assertNumQueries(3):
+            response = self.client.get(reverse("logout"))
+        self.assertRedirects(response, reverse("login"), fetch_redirect_response=False)
+
+    def test_dashboard_serves_role_dashboard(self):
+        """
+        /dashboard/ runs no more queries than the role's own dashboard
+        """
+        self.client.force_login(self.user)
+        for role, url_name in ROLE_DASHBOARDS.items():
+            Profile.objects.filter(user=self.user).update(role=role)
+            with self.subTest(role):
+                cache.clear()
+                self.client.get(reverse("tester_dashboard"))
+                with CaptureQueriesContext(connection) as queries:
+                    self.client.get(reverse(url_name))
+                budget = len(queries)
+                cache.clear()
+                self.client.get(reverse("tester_dashboard"))
+                with self.assertNumQueries(budget):
+                    response = self.client.get(reverse("dashboard"))
+                self.assertEqual(response.status_code, 200)
+
+
+@override_settings(PASSWORD_HASHERS=["django.contrib.auth.hashers.MD5PasswordHasher"])
+class CachedUserTests(TestCase):
+    """
+    request.user comes from the cache, but account changes still apply on the next request
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user("cached-engineer", password=PASSWORD)
+        Profile.objects.filter(user=self.user).update(role="Assembly Engineer")
+        self.client.force_login(self.user)
+        # Loads the user into the cache
+        self.assertEqual(self.client.get(reverse("dashboard")).status_code, 200)
+
+    def assertLoggedOut(self):
+        response = self.client.get(reverse("dashboard"))
+        self.assertEqual(response.status_code, 302)
+        self.assertTrue(response.url.startswith(reverse("login")))
+
+    def test_cache_holds_no_password_hash(self):
+        data = cache.get(user_cache_key(self.user.pk))
+        self.assertEqual(data["fields"]["username"], self.user.username)
+        self.assertNotIn("password", data["fields"])
+        self.assertNotIn(self.user.password, repr(data))
+
+    def test_password_change(self):
+        user = User.objects.get(pk=self.user.pk)
+        user.set_password("changed-Passw0rd")
+        user.save()
+        self.assertLoggedOut()
+
+    def test_deactivation(self):
+        user = User.objects.get(pk=self.user.pk)
+        user.is_active = False
+        user.save()
+        self.assertLoggedOut()
+
+    def test_session_auth_hash_of_cached_user(self):
+        cached = CachedModelBackend().get_user(self.user.pk)
+        with self.assertNumQueries(0):
+            self.assertEqual(cached.get_session_auth_hash(), self.user.get_session_auth_hash())
+        # Once the password changes the hash follows it, e.g. for update_session_auth_hash()
+        cached.set_password("changed-Passw0rd")
+        self.assertEqual(cached.get_session_auth_hash(), cached._get_session_auth_hash())
+        self.assertNotEqual(cached.get_session_auth_hash(), self.user.get_session_auth_hash())
+
+
+class UserRoleTests(TestCase):
+    """
+    Profile writes only happen for role changes, and every role change reaches the role cache
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user("role-user")
+
+    def profile_queries(self, queries):
+        return [query["sql"] for query in queries if '"accounts_profile"' in query["sql"]]
+
+    def test_user_save_without_role_change(self):
+        user = User.objects.get(pk=self.user.pk)
+        user.first_name = "Renamed"
+        with CaptureQueriesContext(connection) as queries:
+            user.save()
+        self.assertEqual(self.profile_queries(queries), [])
+
+        # A loaded but unchanged profile is not written either
+        user = User.objects.select_related("profile").get(pk=self.user.pk)
+        with CaptureQueriesContext(connection) as queries:
+            user.save()
+        self.assertEqual(self.profile_queries(queries), [])
+
+    def test_role_change_through_user(self):
+        user = User.objects.select_related("profile").get(pk=self.user.pk)
+        user.profile.role = "Tester"
+        user.save()
+        self.assertEqual(Profile.objects.get(user=self.user).role, "Tester")
+
+    def test_role_change_clears_cached_role(self):
+        self.assertEqual(get_user_role(User(pk=self.user.pk)), "Assembler")
+        with self.assertNumQueries(0):
+            self.assertEqual(get_user_role(User(pk=self.user.pk)), "Assembler")
+
+        profile = Profile.objects.get(user=self.user)
+        profile.role = "QA Engineer"
+        profile.save()
+        self.assertIsNone(cache.get(role_cache_key(self.user.pk)))
+        self.assertEqual(get_user_role(User(pk=self.user.pk)), "QA Engineer")
@@ -3,8 +3,9 @@ from django.contrib.auth.forms import AuthenticationForm
 from django.contrib.auth import login, logout
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
-from accounts.models import Profile
+from django.urls import resolve
 from accounts.forms import CustomUserCreationForm
+from accounts.roles import dashboard_url
 
 
 # ================================================================
@@ -24,9 +25,10 @@ def register_view(request):
             user = form.save()
             print(f"User created: {user.username}")
             
-            login(request, user)
+            # Several backends are configured; the user was not authenticated by one
+            login(request, user, backend='accounts.backends.CachedModelBackend')
             messages.success(request, 'Registration successful!')
-            return redirect('dashboard')
+            return redirect(dashboard_url(user))
         else:
             # Debug form errors
             print("Form is invalid")
@@ -52,7 +54,8 @@ def login_view(request):
             next_url = request.GET.get('next')
             if next_url and next_url.startswith('/'):
                 return redirect(next_url)
-            return redirect('dashboard')
+            # Straight to the role's dashboard, without a hop through /dashboard/
+            return redirect(dashboard_url(user))
         else:
             messages.error(request, 'Invalid username or password. Please try again.')
     else:
@@ -75,38 +78,9 @@ def logout_view(request):
 # ================================================================
 @login_required
 def dashboard_view(request):
-    try:
-        role = request.user.profile.role
-        # Map role names to URL names
-        role_url_map = {
-            'Assembly Engineer': 'assembly_engineer/',
-            'Assembler': 'assembler/',
-            'Tester': 'dashboard/tester/',
-            'Painting Engineer': 'dashboard/painting_engineer/',
-            'Painter': 'dashboard/painter/',
-            'Blaster': 'dashboard/blaster/',
-            'Name plate printer': 'dashboard/name_plate_printer/',
-            'Finisher': 'dashboard/finisher/',
-            'QA Engineer': 'dashboard/qa_engineer/',
-        }
-        
-        # Get the URL for the role, default to assembler if not found
-        dashboard_url = role_url_map.get(role, 'assembler/')
-        return redirect(dashboard_url)
-    except AttributeError:
-        # Profile doesn't exist, create it
-        Profile.objects.create(user=request.user)
-        role = request.user.profile.role
-        role_url_map = {
-            'Assembly Engineer': 'dashboard/assembly_engineer/',
-            'Assembler': 'assembler/',
-            'Tester': 'dashboard/tester/',
-            'Painting Engineer': 'dashboard/painting_engineer/',
-            'Painter': 'dashboard/painter/',
-            'Blaster': 'dashboard/blaster/',
-            'Name plate printer': 'dashboard/name_plate_printer/',
-            'Finisher': 'dashboard/finisher/',
-            'QA Engineer': 'dashboard/qa_engineer/',
-        }
-        dashboard_url = role_url_map.get(role, 'assembler/')
-        return redirect(dashboard_url)
\ No newline at end of file
+    """
+    Serve the dashboard of the user's role (see accounts/roles.py) in place of
+    redirecting to it. Its query-string links and action-less forms come back
+    here and are handled by the same view.
+    """
+    return resolve(dashboard_url(request.user)).func(request)
\ No newline at end of file
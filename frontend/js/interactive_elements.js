@@ -7,6 +7,7 @@ class InteractiveElements {
     constructor() {
         this.tooltips = new Map();
         this.modals = new Map();
+        this.serialSaves = new WeakMap();
         this.init();
     }
 
@@ -16,6 +17,7 @@ class InteractiveElements {
         this.setupDropdowns();
         this.setupAccordions();
         this.setupKeyboardNavigation();
+        this.setupSerialRows();
     }
 
     setupTooltips() {
@@ -304,6 +306,94 @@ class InteractiveElements {
         });
     }
 
+    setupSerialRows() {
+        // Assembler order page: save each edited heat number and submit rows through the JSON API
+        const form = document.querySelector('[data-serial-submit-url]');
+        if (!form || form.dataset.serialRowsBound) return;
+        form.dataset.serialRowsBound = 'true';
+
+        const csrfToken = form.querySelector('[name="csrfmiddlewaretoken"]').value;
+
+        form.addEventListener('change', (e) => {
+            const row = e.target.closest('[data-serial-url]');
+            if (row && e.target.matches('input[type="text"]')) {
+                const previous = this.serialSaves.get(row) || Promise.resolve();
+                this.serialSaves.set(row, previous.then(() => this.patchSerialField(row, e.target, csrfToken)));
+            }
+        });
+
+        form.addEventListener('click', (e) => {
+            const button = e.target.closest('button[name="submit_row"]');
+            if (button) {
+                e.preventDefault();
+                this.submitSerialRow(form, button.closest('[data-serial-url]'), csrfToken);
+            }
+        });
+    }
+
+    async patchSerialField(row, input, csrfToken) {
+        const field = input.name.replace(/-\d+$/, '');
+
+        try {
+            const response = await fetch(row.dataset.serialUrl, {
+                method: 'PATCH',
+                headers: { 'Content-Type': 'application/json', 'X-CSRFToken': csrfToken },
+                body: JSON.stringify({ [field]: input.value }),
+            });
+            const data = await response.json();
+            if (!response.ok) {
+                throw new Error((data.errors || ['Save failed']).join(' '));
+            }
+
+            input.value = data.values[field];
+            input.defaultValue = input.value;
+            input.classList.remove('border-red-500');
+        } catch (error) {
+            input.classList.add('border-red-500');
+            window.showToast(`${row.dataset.serialNo}: ${error.message}`, { type: 'error' });
+        }
+    }
+
+    async submitSerialRow(form, row, csrfToken) {
+        // Let edits still in flight for this row land first
+        await (this.serialSaves.get(row) || Promise.resolve());
+
+        const id = Number(row.dataset.serialId);
+        try {
+            const response = await fetch(form.dataset.serialSubmitUrl, {
+                method: 'POST',
+                headers: { 'Content-Type': 'application/json', 'X-CSRFToken': csrfToken },
+                body: JSON.stringify({ ids: [id] }),
+            });
+            const data = await response.json();
+            if (!response.ok) {
+                throw new Error('Submit failed');
+            }
+
+            const error = data.errors[String(id)];
+            if (error) {
+                window.showToast(`${row.dataset.serialNo}: ${error}`, { type: 'error' });
+                return;
+            }
+
+            row.querySelector('[data-serial-status]').innerHTML =
+                '<span class="px-2 py-1 bg-green-100 text-green-700 rounded text-xs">Completed</span>';
+            data.progress.forEach(progress => this.updateProgress(progress));
+            window.showToast(`${row.dataset.serialNo} marked completed.`, { type: 'success' });
+        } catch (error) {
+            window.showToast(`${row.dataset.serialNo}: ${error.message}`, { type: 'error' });
+        }
+    }
+
+    updateProgress(progress) {
+        document.querySelectorAll(`[data-progress-order="${progress.order_no}"] [data-progress]`).forEach(element => {
+            const key = element.dataset.progress;
+            if (key in progress) {
+                element.textContent = progress[key];
+            }
+        });
+    }
+
     // Public methods
     createTooltip(element, text, position = 'top') {
         element.setAttribute('data-tooltip', text);
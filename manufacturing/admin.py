@@ -1,6 +1,8 @@
 from django.contrib import admin
-from .models import MainActuator, OrderDetails_21_Series, OrderDetails_25_Series
+from .models import HeatNumberTrace, MainActuator, OrderCount, OrderDetails_21_Series, OrderDetails_25_Series
 
 admin.site.register(MainActuator)
 admin.site.register(OrderDetails_21_Series)
 admin.site.register(OrderDetails_25_Series)
+admin.site.register(HeatNumberTrace)
+admin.site.register(OrderCount)
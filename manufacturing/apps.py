@@ -3,3 +3,6 @@ from django.apps import AppConfig
 
 class ManufacturingConfig(AppConfig):
     name = 'manufacturing'
+
+    def ready(self):
+        from . import signals  # noqa: F401
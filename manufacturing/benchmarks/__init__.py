@@ -0,0 +1,9 @@
+"""
+Load and latency benchmarks at production volume.
+
+``dataset`` bulk-generates synthetic orders, serial units, heat traces and
+assembler users; ``scenarios`` describes a request for every URL in
+manufacturing.urls; ``runner`` times those requests and saves the results as
+JSON for comparison between commits. The seed_benchmark_data and
+run_benchmarks management commands drive them.
+"""
@@ -0,0 +1,174 @@
+"""
+Synthetic production-scale dataset.
+
+Orders are numbered LOAD-0000001 onwards and spread over both series, every
+status, several branches and customers. Order quantities average
+``serials / orders``; units of orders past assembly are completed with heat
+numbers drawn from a fixed pool, so recall searches return realistic
+numbers of rows. Everything is written with bulk statements in batches of
+orders, each in its own transaction, and seeding resumes where a previous
+run stopped.
+"""
+import random
+from datetime import timedelta
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.db import connection, transaction
+from django.utils import timezone
+
+from accounts.models import Profile
+
+from ..dashboard_cache import invalidate_dashboards
+from ..models import HeatNumberTrace, MainActuator, SERIES_DETAIL_MODELS
+from ..order_counts import count_new_orders, rebuild_order_counts
+from ..order_import import build_serials
+from ..traceability import sync_heat_traces
+
+
+ORDER_PREFIX = "LOAD-"
+ASSEMBLER_PREFIX = "bench-assembler-"
+
+CUSTOMERS = [
+    "Reliance Industries", "Larsen & Toubro", "Tata Projects", "Thermax",
+    "Bharat Petroleum", "Indian Oil", "Kirloskar Brothers", "Forbes Marshall",
+    "Hindustan Zinc", "NTPC", "ONGC", "Essar Oil",
+]
+BRANCHES = ["Pune", "Mumbai", "Chennai", "Vadodara", "Kolkata"]
+
+# (status, share of orders); orders past assembly have every unit completed
+STATUS_MIX = [
+    ("pending", 10),
+    ("under_assembly", 30),
+    ("under_testing", 10),
+    ("under_painting", 10),
+    ("under_finishing", 10),
+    ("under_qa", 5),
+    ("finished_goods", 25),
+]
+
+# Distinct heat numbers per component
+HEAT_POOL_SIZE = 100_000
+
+
+def assembler_users(count):
+    """
+    The first ``count`` benchmark assemblers, created as needed
+    """
+    usernames = [f"{ASSEMBLER_PREFIX}{i:03d}" for i in range(1, count + 1)]
+    existing = set(User.objects.filter(username__in=usernames).values_list("username", flat=True))
+    missing = [User(username=name, password=make_password(None)) for name in usernames if name not in existing]
+    if missing:
+        # bulk_create skips the signal that creates profiles
+        User.objects.bulk_create(missing)
+        created = User.objects.filter(username__in=[user.username for user in missing])
+        Profile.objects.bulk_create([Profile(user=user, role="Assembler") for user in created])
+    return list(User.objects.filter(username__in=usernames).order_by("username"))
+
+
+def seed_dataset(orders, serials, assemblers=50, batch_size=1000, traces=True, log=None):
+    """
+    Add benchmark orders until there are ``orders`` of them, with about
+    ``serials`` serial units in total. Returns the numbers of orders and
+    serials added.
+    """
+    users = assembler_users(assemblers) if assemblers else []
+    existing = MainActuator.objects.filter(order_no__startswith=ORDER_PREFIX).count()
+    mean_qty = max(1, round(serials / orders)) if orders else 1
+    rng = random.Random(existing)
+    statuses = [status for status, _ in STATUS_MIX]
+    weights = [share for _, share in STATUS_MIX]
+    now = timezone.now()
+
+    added = {"orders": 0, "serials": 0}
+    for start in range(existing, orders, batch_size):
+        batch = []
+        for i in range(start, min(start + batch_size, orders)):
+            qty = rng.randint(1, 2 * mean_qty - 1)
+            status = rng.choices(statuses, weights)[0]
+            if status == "pending":
+                completed = 0
+            elif status == "under_assembly":
+                completed = rng.randint(0, qty - 1)
+            else:
+                completed = qty
+            batch.append(MainActuator(
+                order_no=f"{ORDER_PREFIX}{i + 1:07d}",
+                sales_order_no=f"SO-{i // 4 + 1:07d}",
+                line_item=str(i % 4 + 1),
+                customer=rng.choice(CUSTOMERS),
+                series=rng.choice(list(SERIES_DETAIL_MODELS)),
+                type=rng.choice(["DA", "SR"]),
+                size=str(rng.choice([50, 65, 80, 100, 125])),
+                cylinder_size=str(rng.choice([4, 6, 8, 10, 12])),
+                moc=rng.choice(["Aluminium", "SS316", "WCB"]),
+                order_qty=qty,
+                order_status=status,
+                item_code=f"ITM-{rng.randint(0, 99999):05d}",
+                creation_date=now - timedelta(minutes=(orders - i) * 5),
+                branch=rng.choice(BRANCHES),
+                total_qty=qty,
+                completed_qty=completed,
+                pending_qty=qty - completed,
+            ))
+
+        with transaction.atomic():
+            created = MainActuator.objects.bulk_create(batch)
+            count_new_orders(created)
+            for series, model in SERIES_DETAIL_MODELS.items():
+                rows = []
+                for order in created:
+                    if order.series != series:
+                        continue
+                    units = build_serials(order, order.total_qty)
+                    for unit in units[:order.completed_qty]:
+                        unit.assembler_status = "completed"
+                        unit.assembler_name = rng.choice(users) if users else None
+                        for field in model.HEAT_FIELDS:
+                            setattr(unit, field, f"HT-{rng.randrange(HEAT_POOL_SIZE):05d}")
+                    rows.extend(units)
+                model.objects.bulk_create(rows, batch_size=5000)
+                added["serials"] += len(rows)
+                if traces:
+                    sync_heat_traces(model, model.objects.filter(order_no__in=[order.pk for order in created]))
+        added["orders"] += len(created)
+        if log:
+            log(f"{start + len(created)}/{orders} orders, {added['serials']} serials added")
+
+    if added["orders"]:
+        invalidate_dashboards(everything=True)
+        analyze_tables()
+    return added
+
+
+def delete_dataset(batch_size=1000):
+    """
+    Delete every benchmark order with its serials and traces, and the
+    benchmark assemblers. Returns the number of orders deleted.
+    """
+    orders = MainActuator.objects.filter(order_no__startswith=ORDER_PREFIX)
+    deleted = 0
+    while True:
+        ids = list(orders.values_list("pk", flat=True)[:batch_size])
+        if not ids:
+            break
+        with transaction.atomic():
+            # Raw deletes skip the per-row signals; counts and caches are rebuilt below
+            HeatNumberTrace.objects.filter(order_id__in=ids)._raw_delete(connection.alias)
+            for model in SERIES_DETAIL_MODELS.values():
+                model.objects.filter(order_no_id__in=ids)._raw_delete(connection.alias)
+            MainActuator.objects.filter(pk__in=ids)._raw_delete(connection.alias)
+        deleted += len(ids)
+
+    User.objects.filter(username__startswith=ASSEMBLER_PREFIX).delete()
+    rebuild_order_counts()
+    invalidate_dashboards(everything=True)
+    return deleted
+
+
+def analyze_tables():
+    if connection.vendor == "postgresql":
+        tables = [model._meta.db_table for model in (MainActuator, HeatNumberTrace, *SERIES_DETAIL_MODELS.values())]
+        with connection.cursor() as cursor:
+            for table in tables:
+                cursor.execute(f"ANALYZE {table}")
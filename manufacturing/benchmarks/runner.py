@@ -0,0 +1,201 @@
+"""
+Time benchmark scenarios and keep the results.
+
+In process, each scenario goes through the Django test client: after one
+warm-up request, every timed request records its latency and the queries it
+ran on all databases, and one extra request runs under tracemalloc for the
+peak Python memory of the view. Against a running server (``base_url``) the
+read-only scenarios are sent over HTTP from concurrent threads, which gives
+latency and throughput only.
+"""
+import json
+import statistics
+import subprocess
+import threading
+import time
+import tracemalloc
+import urllib.error
+import urllib.request
+from contextlib import ExitStack
+from datetime import datetime, timezone as dt_timezone
+
+from django.conf import settings
+from django.db import connection, connections
+from django.test.utils import CaptureQueriesContext
+
+from ..dashboard_cache import invalidate_dashboards
+from ..models import MainActuator, SERIES_DETAIL_MODELS
+
+
+def percentile(values, pct):
+    """
+    The ``pct``th percentile of ``values``; every benchmark command reports p50/p95 with it
+    """
+    if len(values) < 2:
+        return values[0]
+    return statistics.quantiles(values, n=100)[pct - 1]
+
+
+def _summary(scenario, timings, statuses, **extra):
+    return {
+        "key": scenario["key"],
+        "name": scenario["name"],
+        "method": scenario["method"],
+        "path": scenario["path"],
+        "status": sorted(set(statuses)),
+        "requests": len(timings),
+        "p50_ms": round(percentile(timings, 50), 2),
+        "p95_ms": round(percentile(timings, 95), 2),
+        "mean_ms": round(statistics.fmean(timings), 2),
+        **extra,
+    }
+
+
+def send(client, scenario):
+    """
+    Send ``scenario`` with the test client and read the whole response
+    """
+    kwargs = {}
+    if scenario["json"] is not None:
+        kwargs = {"data": scenario["json"], "content_type": "application/json"}
+    response = getattr(client, scenario["method"].lower())(scenario["path"], **kwargs)
+    if getattr(response, "streaming", False):
+        b"".join(response.streaming_content)
+    return response
+
+
+def run_in_process(client, scenarios, repeat, cold=False, log=None):
+    """
+    Time ``repeat`` requests of every scenario. With ``cold`` the dashboard
+    cache is invalidated before each request.
+    """
+    results = []
+    for scenario in scenarios:
+        send(client, scenario)
+
+        timings, statuses, queries = [], [], []
+        for _ in range(repeat):
+            if cold:
+                invalidate_dashboards(everything=True)
+            with ExitStack() as stack:
+                captures = [stack.enter_context(CaptureQueriesContext(connections[alias])) for alias in connections]
+                start = time.perf_counter()
+                response = send(client, scenario)
+                timings.append((time.perf_counter() - start) * 1000)
+            statuses.append(response.status_code)
+            queries.append(sum(len(capture) for capture in captures))
+
+        tracemalloc.start()
+        try:
+            send(client, scenario)
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+        result = _summary(
+            scenario, timings, statuses,
+            queries=round(statistics.fmean(queries), 1),
+            peak_kb=round(peak / 1024),
+        )
+        results.append(result)
+        if log:
+            log(format_result(result))
+    return results
+
+
+def run_over_http(base_url, cookie, scenarios, repeat, concurrency=1, log=None):
+    """
+    Send ``repeat`` requests of every GET scenario to a running server from
+    ``concurrency`` threads
+    """
+    results = []
+    for scenario in scenarios:
+        if scenario["method"] != "GET":
+            continue
+        url = base_url.rstrip("/") + scenario["path"]
+        timings, statuses = [], []
+        lock = threading.Lock()
+
+        def work(count):
+            for _ in range(count):
+                request = urllib.request.Request(url, headers={"Cookie": cookie})
+                start = time.perf_counter()
+                try:
+                    with urllib.request.urlopen(request) as response:
+                        response.read()
+                        status = response.status
+                except urllib.error.HTTPError as exc:
+                    status = exc.code
+                with lock:
+                    timings.append((time.perf_counter() - start) * 1000)
+                    statuses.append(status)
+
+        threads = [
+            threading.Thread(target=work, args=(repeat // concurrency + (i < repeat % concurrency),))
+            for i in range(concurrency)
+        ]
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start
+
+        result = _summary(scenario, timings, statuses, req_per_s=round(len(timings) / elapsed, 1))
+        results.append(result)
+        if log:
+            log(format_result(result))
+    return results
+
+
+def format_result(result):
+    queries = result.get("queries")
+    peak_kb = result.get("peak_kb")
+    return (
+        f"{result['method']:<7}{result['path'][:60]:<62}{result['p50_ms']:>9.2f}{result['p95_ms']:>9.2f}"
+        f"{queries if queries is not None else '-':>9}{peak_kb if peak_kb is not None else '-':>10}"
+        f"  {','.join(map(str, result['status']))}"
+    )
+
+
+def run_metadata(mode, **options):
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=settings.BASE_DIR,
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "commit": commit,
+        "started_at": datetime.now(dt_timezone.utc).isoformat(timespec="seconds"),
+        "mode": mode,
+        "database": connection.vendor,
+        "orders": MainActuator.objects.count(),
+        "serials": sum(model.objects.count() for model in SERIES_DETAIL_MODELS.values()),
+        **options,
+    }
+
+
+def save_results(path, meta, results):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w") as fileobj:
+        json.dump({"meta": meta, "results": results}, fileobj, indent=2)
+
+
+def compare_results(baseline, results):
+    """
+    Rows of (key, baseline p50, p50, change %, baseline queries, queries) for
+    the scenarios present in both runs
+    """
+    before = {result["key"]: result for result in baseline["results"]}
+    rows = []
+    for result in results:
+        old = before.get(result["key"])
+        if old is None:
+            continue
+        change = (result["p50_ms"] - old["p50_ms"]) / old["p50_ms"] * 100 if old["p50_ms"] else 0.0
+        rows.append((
+            result["key"], old["p50_ms"], result["p50_ms"], change, old.get("queries"), result.get("queries"),
+        ))
+    return rows
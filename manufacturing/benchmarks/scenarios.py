@@ -0,0 +1,113 @@
+"""
+One or more benchmark requests for every URL in manufacturing.urls.
+
+Path parameters and "{name}" placeholders are filled from sample_values():
+a completed serial of a benchmark order and its heat number. Writes repeat
+values the rows already hold, so the dataset is the same after a run.
+Adding a URL without a scenario makes build_scenarios() fail.
+"""
+import re
+from urllib.parse import urlencode
+
+from ..models import MainActuator, SERIES_DETAIL_MODELS
+from .dataset import ORDER_PREFIX
+
+
+SCENARIOS = {
+    "assembly_engineer_dashboard": [
+        {},
+        {"query": {"status": "under_assembly"}},
+        {"query": {"sort": "customer", "order": "asc"}},
+        {"query": {"search": "toubro"}},
+    ],
+    "order_search_autocomplete": [{"query": {"q": "{order_no}"}}, {"query": {"q": "toubro"}}],
+    "assembler_dashboard": [{}],
+    "assembler_order_details": [{}],
+    "print_order_report": [{}],
+    "serial_patch_api": [{"method": "PATCH", "json": {"housing_heat_no": "{heat_no}"}}],
+    "serial_submit_api": [{"method": "POST", "json": {"ids": ["{pk}"]}}],
+    "order_rollup_api": [{"query": {"by": "customer"}}, {"query": {"by": "branch", "status": "pending"}}],
+    "dashboard_cache_stats_api": [{}],
+    "db_connection_stats_api": [{}],
+    "order_progress_api": [{}],
+    "generate_heat_report": [{}],
+    "export_heat_reports": [{"query": {"order_no": "{order_no}"}}],
+    "heat_trace_search": [{"query": {"q": "{heat_no}"}}],
+    "heat_trace_export": [{"query": {"q": "{heat_no}"}}],
+    "heat_trace_api": [{"query": {"q": "{heat_no}"}}],
+    "tester_dashboard": [{}],
+    "painting_engineer_dashboard": [{}],
+    "painter_dashboard": [{}],
+    "blaster_dashboard": [{}],
+    "name_plate_printer_dashboard": [{}],
+    "finisher_dashboard": [{}],
+    "qa_engineer_dashboard": [{}],
+}
+
+PATH_PARAMETER_RE = re.compile(r"<(?:\w+:)?(\w+)>")
+PLACEHOLDER_RE = re.compile(r"^\{(\w+)\}$")
+
+
+def sample_values(series="25"):
+    """
+    Values for URL parameters, from the newest benchmark order of ``series``
+    (any order if none is seeded) that has a completed serial
+    """
+    model = SERIES_DETAIL_MODELS[series]
+    orders = MainActuator.objects.filter(series=series)
+    if orders.filter(order_no__startswith=ORDER_PREFIX).exists():
+        orders = orders.filter(order_no__startswith=ORDER_PREFIX)
+    serial = (
+        model.objects.filter(order_no__in=orders.values("pk"), assembler_status="completed")
+        .select_related("order_no")
+        .order_by("-order_no_id")
+        .first()
+    )
+    if serial is None:
+        raise ValueError(f"No completed {series} series serial to benchmark with; seed the dataset first")
+    return {
+        "order_no": serial.order_no.order_no,
+        "series": series,
+        "pk": serial.pk,
+        "heat_no": serial.housing_heat_no,
+    }
+
+
+def _fill(value, samples):
+    if isinstance(value, dict):
+        return {key: _fill(item, samples) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_fill(item, samples) for item in value]
+    if isinstance(value, str):
+        match = PLACEHOLDER_RE.match(value)
+        if match:
+            return samples[match[1]]
+        return value.format(**samples)
+    return value
+
+
+def build_scenarios(urlpatterns, samples, prefix="/"):
+    """
+    [{"key", "name", "method", "path", "json"}] for every pattern in
+    ``urlpatterns``; ``key`` stays the same between runs and datasets
+    """
+    scenarios = []
+    seen = {}
+    for pattern in urlpatterns:
+        if pattern.name not in SCENARIOS:
+            raise ValueError(f"No benchmark scenario for URL '{pattern.name}'; add one to SCENARIOS")
+        route = PATH_PARAMETER_RE.sub(lambda match: str(samples[match[1]]), str(pattern.pattern))
+        for variant in SCENARIOS[pattern.name]:
+            path = prefix + route
+            query = _fill(variant.get("query", {}), samples)
+            if query:
+                path += "?" + urlencode(query)
+            seen[pattern.name] = seen.get(pattern.name, 0) + 1
+            scenarios.append({
+                "key": f"{pattern.name}:{seen[pattern.name]}",
+                "name": pattern.name,
+                "method": variant.get("method", "GET"),
+                "path": path,
+                "json": _fill(variant.get("json"), samples),
+            })
+    return scenarios
@@ -0,0 +1,152 @@
+"""
+Cached dashboard query results.
+
+Dashboard views keep the results of their order queries in the Django cache,
+keyed per view and per filter / sort / cursor. Every key embeds the current
+generation of the namespaces its data depends on:
+
+- ``orders``: anything that lists or counts orders (bumped by any order or
+  serial change),
+- ``order:<order_no>``: one order's progress counters,
+- ``all``: everything, for bulk repairs such as ``rebuild_progress``.
+
+Invalidating bumps generations once the writing transaction commits, so old
+entries are never read again and simply expire. For REPLICA_PIN_SECONDS after
+that, misses are computed on the primary: a lagging read replica could
+otherwise store pre-write data under the new generation. ORM saves and deletes are
+covered by the receivers in manufacturing.signals; bulk writes that bypass
+signals call ``invalidate_dashboards`` themselves. Heat numbers are not part of
+any cached data, so writes limited to them (serial saves with only heat fields
+in ``update_fields``, and the bulk paths in manufacturing.serial_updates)
+invalidate nothing.
+"""
+import hashlib
+import json
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from ReportManagement.db.router import primary_reads
+
+
+KEY_PREFIX = "dashboard"
+
+ORDERS = "orders"
+ALL = "all"
+
+# Views whose hit/miss counters are reported by cache_stats()
+CACHED_VIEWS = ("engineer_orders", "assembler_orders", "assembler_my_orders", "order_progress")
+
+_MISSING = object()
+
+
+def order_namespace(order_no):
+    return f"order:{order_no}"
+
+
+def _generation_key(namespace):
+    return f"{KEY_PREFIX}:gen:{namespace}"
+
+
+def _generations(namespaces):
+    keys = [_generation_key(namespace) for namespace in namespaces]
+    found = cache.get_many(keys)
+    for key in keys:
+        if key not in found:
+            # Start from the clock rather than 1 so an evicted generation can
+            # never come back to a value older entries were stored under
+            cache.add(key, time.time_ns(), timeout=None)
+            found[key] = cache.get(key)
+    return [found[key] for key in keys]
+
+
+def _recent_key(namespace):
+    return f"{KEY_PREFIX}:recent:{namespace}"
+
+
+def _bump(namespaces):
+    for namespace in namespaces:
+        key = _generation_key(namespace)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, time.time_ns(), timeout=None)
+    cache.set_many({_recent_key(namespace): True for namespace in namespaces}, settings.REPLICA_PIN_SECONDS)
+
+
+def _count(view, outcome):
+    key = f"{KEY_PREFIX}:stats:{view}:{outcome}"
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.add(key, 0, timeout=None)
+        cache.incr(key)
+
+
+def cached_dashboard_data(view, params, compute, namespaces=(ORDERS,)):
+    """
+    Return ``compute()`` for ``view`` and its ``params`` (a JSON-serialisable
+    list of filter / sort / cursor values), from the cache while none of
+    ``namespaces`` has been invalidated
+    """
+    generations = _generations([ALL, *namespaces])
+    raw = json.dumps([view, params, generations], sort_keys=True, default=str)
+    key = f"{KEY_PREFIX}:{view}:{hashlib.sha1(raw.encode()).hexdigest()}"
+
+    value = cache.get(key, _MISSING)
+    if value is _MISSING:
+        _count(view, "misses")
+        if cache.get_many([_recent_key(namespace) for namespace in [ALL, *namespaces]]):
+            with primary_reads():
+                value = compute()
+        else:
+            value = compute()
+        cache.set(key, value, settings.DASHBOARD_CACHE_TIMEOUT)
+    else:
+        _count(view, "hits")
+    return value
+
+
+def invalidate_dashboards(order_nos=(), everything=False):
+    """
+    Drop cached order lists and counts, plus the progress of ``order_nos``
+    (or of every order with ``everything``), once the current transaction commits
+    """
+    namespaces = [ORDERS, *(order_namespace(order_no) for order_no in order_nos)]
+    if everything:
+        namespaces.append(ALL)
+    transaction.on_commit(lambda: _bump(namespaces))
+
+
+def cache_stats():
+    """
+    {view: {"hits", "misses", "hit_rate"}} since the counters were last reset
+    """
+    keys = {
+        (view, outcome): f"{KEY_PREFIX}:stats:{view}:{outcome}"
+        for view in CACHED_VIEWS
+        for outcome in ("hits", "misses")
+    }
+    found = cache.get_many(keys.values())
+
+    stats = {}
+    for view in CACHED_VIEWS:
+        hits = found.get(keys[view, "hits"], 0)
+        misses = found.get(keys[view, "misses"], 0)
+        total = hits + misses
+        stats[view] = {
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": round(hits / total, 3) if total else None,
+        }
+    return stats
+
+
+def reset_cache_stats():
+    cache.delete_many([
+        f"{KEY_PREFIX}:stats:{view}:{outcome}"
+        for view in CACHED_VIEWS
+        for outcome in ("hits", "misses")
+    ])
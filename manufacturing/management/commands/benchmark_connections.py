@@ -0,0 +1,122 @@
+import threading
+import time
+
+from django.contrib.auth.models import User
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connection, connections
+from django.test import Client, RequestFactory
+
+from accounts.models import Profile
+from manufacturing.benchmarks.runner import percentile
+from manufacturing.models import MainActuator
+from ReportManagement.db.metrics import connection_stats, reset_connection_stats
+
+
+BENCH_USERNAME = "bench-connections"
+
+
+class Command(BaseCommand):
+    help = (
+        "Load test one page with concurrent clients under each connection reuse mode: a new "
+        "connection per request, persistent connections (CONN_MAX_AGE) and, with the "
+        "ReportManagement.db.postgresql engine, the connection pool. Reports latency, "
+        "throughput and connections opened vs reused. Point it at a local PostgreSQL."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=400, help="Requests per mode")
+        parser.add_argument("--concurrency", type=int, default=4, help="Client threads")
+        parser.add_argument("--pool-size", type=int, default=4, help="Pool size for the pooled mode")
+        parser.add_argument("--path", help="Page to request (default: order details of the newest order)")
+        parser.add_argument("--cleanup", action="store_true", help="Delete the benchmark user afterwards")
+
+    def handle(self, *args, **options):
+        path = options["path"]
+        if not path:
+            order_no = MainActuator.objects.order_by("-created_at").values_list("order_no", flat=True).first()
+            if order_no is None:
+                raise CommandError("No orders to request; create one or pass --path")
+            path = f"/assembler/order/{order_no}/"
+
+        if connection.vendor != "postgresql":
+            self.stderr.write("Not on PostgreSQL: connection setup costs will not be representative")
+
+        user, _ = User.objects.get_or_create(username=BENCH_USERNAME)
+        Profile.objects.update_or_create(user=user, defaults={"role": "Assembler"})
+
+        settings_dict = connections.settings[DEFAULT_DB_ALIAS]
+        modes = [
+            ("new connection per request", {"CONN_MAX_AGE": 0, "POOL_SIZE": 0}),
+            ("persistent (CONN_MAX_AGE)", {"CONN_MAX_AGE": 600, "POOL_SIZE": 0}),
+        ]
+        if hasattr(connection, "pool"):
+            modes.append((f"pool of {options['pool_size']}", {"CONN_MAX_AGE": 0, "POOL_SIZE": options["pool_size"]}))
+
+        saved = {key: settings_dict.get(key) for key in ("CONN_MAX_AGE", "POOL_SIZE")}
+        connections.close_all()
+        self.stdout.write(
+            f"{'mode':<30}{'p50 ms':>9}{'p95 ms':>9}{'req/s':>9}{'opened':>8}{'reused':>8}{'pooled':>8}"
+        )
+        try:
+            for label, overrides in modes:
+                settings_dict.update(overrides)
+                timings, elapsed = self.run_clients(user, path, options["requests"], options["concurrency"])
+                counts = connection_stats()["databases"].get(DEFAULT_DB_ALIAS, {})
+                self.stdout.write(
+                    f"{label:<30}{percentile(timings, 50):>9.2f}{percentile(timings, 95):>9.2f}"
+                    f"{len(timings) / elapsed:>9.1f}{counts.get('opened', 0):>8}"
+                    f"{counts.get('reused', 0):>8}{counts.get('pool_reused', 0):>8}"
+                )
+        finally:
+            settings_dict.update(saved)
+
+        if options["cleanup"]:
+            user.delete()
+            self.stdout.write(f"Deleted user {BENCH_USERNAME}")
+
+    def run_clients(self, user, path, total, concurrency):
+        # Requests go through a WSGIHandler, like under gunicorn: the test Client
+        # keeps connections open regardless of CONN_MAX_AGE
+        handler = WSGIHandler()
+        factory = RequestFactory(HTTP_HOST="localhost")
+        timings, errors = [], []
+        cookies = []
+        for _ in range(concurrency):
+            client = Client(HTTP_HOST="localhost")
+            client.force_login(user)
+            cookies.append(client.cookies.output(attrs=[], header="", sep=";").strip())
+        connections.close_all()
+        reset_connection_stats()
+
+        def start_response(status, headers):
+            if not status.startswith("200"):
+                raise CommandError(f"GET {path} returned {status}")
+
+        def work(cookie, count):
+            try:
+                for _ in range(count):
+                    start = time.perf_counter()
+                    response = handler(factory.get(path, HTTP_COOKIE=cookie).environ, start_response)
+                    b"".join(response)
+                    response.close()
+                    timings.append((time.perf_counter() - start) * 1000)
+            except Exception as exc:
+                errors.append(exc)
+            finally:
+                connections.close_all()
+
+        threads = [
+            threading.Thread(target=work, args=(cookie, total // concurrency + (i < total % concurrency)))
+            for i, cookie in enumerate(cookies)
+        ]
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start
+
+        if errors:
+            raise errors[0]
+        return timings, elapsed
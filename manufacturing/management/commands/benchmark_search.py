@@ -0,0 +1,68 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+from manufacturing.benchmarks.dataset import ORDER_PREFIX, delete_dataset, seed_dataset
+from manufacturing.benchmarks.runner import percentile
+from manufacturing.models import MainActuator
+from manufacturing.search import filter_orders, search_orders
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed the benchmark dataset (see seed_benchmark_data) and compare order "
+        "search latency with and without the trigram indexes (Postgres) or the "
+        "plain scan (SQLite)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--orders", type=int, default=100_000, help="Benchmark orders to seed")
+        parser.add_argument("--repeat", type=int, default=20, help="Timed runs per query")
+        parser.add_argument("--cleanup", action="store_true", help="Delete the benchmark dataset afterwards")
+
+    def handle(self, *args, **options):
+        # Search reads orders only: one serial each, no assemblers or heat traces
+        added = seed_dataset(options["orders"], options["orders"], assemblers=0, traces=False)
+        if added["orders"]:
+            self.stdout.write(f"Seeded {added['orders']} benchmark orders")
+
+        terms = [
+            f"{ORDER_PREFIX}{options['orders'] // 2:07d}",  # exact order no
+            f"{options['orders'] // 3:05d}"[:4],             # order no fragment
+            "toubro",                                        # customer substring
+            "ITM-42",                                        # item code prefix
+            "no-such-order",                                 # miss
+        ]
+
+        modes = [("search", None)]
+        if connection.vendor == "postgresql":
+            modes = [("seq scan", False), ("trigram index", True)]
+
+        self.stdout.write(f"{'query':<22}{'mode':<16}{'p50 ms':>10}{'p95 ms':>10}{'rows':>8}")
+        for term in terms:
+            for label, use_index in modes:
+                timings, rows = self.time_query(term, use_index, options["repeat"])
+                self.stdout.write(
+                    f"{term:<22}{label:<16}{percentile(timings, 50):>10.2f}{percentile(timings, 95):>10.2f}{rows:>8}"
+                )
+
+        if options["cleanup"]:
+            deleted = delete_dataset()
+            self.stdout.write(f"Deleted {deleted} benchmark orders")
+
+    def time_query(self, term, use_index, repeat):
+        timings = []
+        rows = 0
+        for _ in range(repeat):
+            with transaction.atomic():
+                if use_index is False:
+                    with connection.cursor() as cursor:
+                        cursor.execute("SET LOCAL enable_indexscan = off")
+                        cursor.execute("SET LOCAL enable_bitmapscan = off")
+                start = time.perf_counter()
+                page = list(filter_orders(MainActuator.objects.all(), term).order_by("-created_at", "-id")[:20])
+                suggestions = list(search_orders(MainActuator.objects.all(), term).values("order_no")[:10])
+                timings.append((time.perf_counter() - start) * 1000)
+            rows = len(page) + len(suggestions)
+        return timings, rows
@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+
+from manufacturing.dashboard_cache import cache_stats, reset_cache_stats
+
+
+class Command(BaseCommand):
+    help = (
+        "Show the hit/miss counters of the dashboard query cache. With the local memory "
+        "backend every process counts separately; use a shared cache to see the site totals."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--reset",
+            action="store_true",
+            help="Zero the counters after printing them",
+        )
+
+    def handle(self, *args, **options):
+        self.stdout.write(f"{'view':<22}{'hits':>10}{'misses':>10}{'hit rate':>10}")
+        for view, stats in cache_stats().items():
+            rate = "-" if stats["hit_rate"] is None else f"{stats['hit_rate']:.1%}"
+            self.stdout.write(f"{view:<22}{stats['hits']:>10}{stats['misses']:>10}{rate:>10}")
+
+        if options["reset"]:
+            reset_cache_stats()
+            self.stdout.write(self.style.SUCCESS("Counters reset"))
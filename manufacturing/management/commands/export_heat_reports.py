@@ -0,0 +1,44 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.dateparse import parse_date
+
+from manufacturing.models import MainActuator
+from manufacturing.report_export import iter_heat_report_zip, select_export_orders
+
+
+class Command(BaseCommand):
+    help = "Write the heat annexure PDFs of many orders into one ZIP file"
+
+    def add_arguments(self, parser):
+        parser.add_argument("order_no", nargs="*", help="Orders to export")
+        parser.add_argument("--from", dest="date_from", help="First creation date (YYYY-MM-DD)")
+        parser.add_argument("--to", dest="date_to", help="Last creation date (YYYY-MM-DD)")
+        parser.add_argument("--status", choices=[value for value, _ in MainActuator.STATUS_CHOICES])
+        parser.add_argument("--output", "-o", default="heat_reports.zip", help="ZIP file to write")
+        parser.add_argument("--workers", type=int, help="Rendering processes (default: REPORT_EXPORT_WORKERS)")
+
+    def handle(self, *args, **options):
+        dates = {}
+        for key in ("date_from", "date_to"):
+            value = options[key]
+            try:
+                dates[key] = parse_date(value) if value else None
+            except ValueError:
+                dates[key] = None
+            if value and dates[key] is None:
+                raise CommandError(f"Invalid date '{value}'")
+
+        if not (options["order_no"] or dates["date_from"] or dates["date_to"] or options["status"]):
+            raise CommandError("Give order numbers, --from/--to or --status.")
+
+        orders = select_export_orders(order_nos=options["order_no"], status=options["status"], **dates)
+        count = orders.count()
+        if not count:
+            raise CommandError("No orders match the export filters.")
+
+        workers = settings.REPORT_EXPORT_WORKERS if options["workers"] is None else options["workers"]
+        with open(options["output"], "wb") as output:
+            for chunk in iter_heat_report_zip(orders, workers=workers):
+                output.write(chunk)
+
+        self.stdout.write(self.style.SUCCESS(f"Wrote {count} heat reports to {options['output']}"))
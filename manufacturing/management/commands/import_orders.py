@@ -0,0 +1,34 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from manufacturing.order_import import import_orders
+
+
+class Command(BaseCommand):
+    help = "Bulk-import orders and their serial units from a CSV/XLSX ERP export"
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="CSV or XLSX file to import")
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Validate every row and report errors without writing anything",
+        )
+
+    def handle(self, *args, **options):
+        path = options["path"]
+        try:
+            with open(path, "rb") as fileobj:
+                report = import_orders(fileobj, path, dry_run=options["dry_run"])
+        except (OSError, ValueError) as e:
+            raise CommandError(f"Failed to import {path}: {e}")
+
+        for error in report["errors"]:
+            self.stderr.write(
+                f"Row {error['row']} ({error['order_no'] or '-'}): {' '.join(error['errors'])}"
+            )
+
+        verb = "Validated" if options["dry_run"] else "Imported"
+        self.stdout.write(self.style.SUCCESS(
+            f"{verb} {report['created_orders']} of {report['rows']} orders, "
+            f"{report['created_serials']} serial units, {len(report['errors'])} rows with errors"
+        ))
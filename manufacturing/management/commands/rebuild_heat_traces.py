@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+
+from manufacturing.models import SERIES_DETAIL_MODELS
+from manufacturing.traceability import sync_heat_traces
+
+
+class Command(BaseCommand):
+    help = "Rebuild the heat number traceability index from the serial tables"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "order_no",
+            nargs="*",
+            help="Only rebuild serials of these orders (default: all serials)",
+        )
+
+    def handle(self, *args, **options):
+        written = 0
+        for series, model in SERIES_DETAIL_MODELS.items():
+            serials = None
+            if options["order_no"]:
+                serials = model.objects.filter(order_no__order_no__in=options["order_no"])
+            count = sync_heat_traces(model, serials)
+            self.stdout.write(f"{series} series: {count} heat numbers")
+            written += count
+
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {written} heat number traces"))
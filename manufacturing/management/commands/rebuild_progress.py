@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+
+from manufacturing.models import MainActuator
+from manufacturing.progress import rebuild_progress
+
+
+class Command(BaseCommand):
+    help = "Recompute the per-order assembly progress counters from the serial tables"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "order_no",
+            nargs="*",
+            help="Only rebuild these orders (default: all orders)",
+        )
+
+    def handle(self, *args, **options):
+        orders = None
+        if options["order_no"]:
+            orders = MainActuator.objects.filter(order_no__in=options["order_no"])
+
+        updated = rebuild_progress(orders)
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt progress counters for {updated} orders"))
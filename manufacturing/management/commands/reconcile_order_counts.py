@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from manufacturing.order_counts import rebuild_order_counts
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute the order count summary used by the dashboard stats from the orders table. "
+        "Run it periodically (e.g. nightly) to correct drift from writes that bypass the ORM."
+    )
+
+    def handle(self, *args, **options):
+        corrected = rebuild_order_counts()
+        self.stdout.write(self.style.SUCCESS(f"Reconciled order counts: {corrected} corrected"))
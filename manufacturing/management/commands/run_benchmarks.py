@@ -0,0 +1,88 @@
+import json
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client
+from django.utils import timezone
+
+from accounts.models import Profile
+from manufacturing import urls
+from manufacturing.benchmarks.runner import (
+    compare_results, run_in_process, run_metadata, run_over_http, save_results,
+)
+from manufacturing.benchmarks.scenarios import build_scenarios, sample_values
+
+
+RUNNER_USERNAME = "bench-runner"
+
+
+class Command(BaseCommand):
+    help = (
+        "Request every URL in manufacturing/urls.py (see manufacturing/benchmarks/scenarios.py) and "
+        "report p50/p95 latency, queries and peak memory per view. Results are saved as JSON; "
+        "pass an earlier file to --compare to see the change between commits. Seed data first "
+        "with seed_benchmark_data."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--repeat", type=int, default=20, help="Timed requests per scenario")
+        parser.add_argument("--only", action="append", default=[], help="Only this URL name (repeatable)")
+        parser.add_argument("--series", default="25", help="Series of the sample order and serial")
+        parser.add_argument("--cold", action="store_true", help="Invalidate the dashboard cache before each request")
+        parser.add_argument("--base-url", help="Load test a running server instead, e.g. http://127.0.0.1:8000")
+        parser.add_argument("--concurrency", type=int, default=4, help="Client threads with --base-url")
+        parser.add_argument("--output", help="Results file (default: benchmark_results/<time>-<commit>.json)")
+        parser.add_argument("--compare", help="Earlier results file to compare with")
+
+    def handle(self, *args, **options):
+        try:
+            samples = sample_values(options["series"])
+        except (KeyError, ValueError) as exc:
+            raise CommandError(exc)
+        scenarios = build_scenarios(urls.urlpatterns, samples)
+        if options["only"]:
+            scenarios = [scenario for scenario in scenarios if scenario["name"] in options["only"]]
+            if not scenarios:
+                raise CommandError(f"No URL named {', '.join(options['only'])}")
+
+        client = Client(HTTP_HOST="localhost")
+        client.force_login(self.runner_user())
+
+        self.stdout.write(f"{'method':<7}{'path':<62}{'p50 ms':>9}{'p95 ms':>9}{'queries':>9}{'peak KB':>10}  status")
+        if options["base_url"]:
+            cookie = f"{settings.SESSION_COOKIE_NAME}={client.cookies[settings.SESSION_COOKIE_NAME].value}"
+            mode = "http"
+            results = run_over_http(
+                options["base_url"], cookie, scenarios, options["repeat"], options["concurrency"],
+                log=self.stdout.write,
+            )
+        else:
+            mode = "in-process"
+            results = run_in_process(client, scenarios, options["repeat"], options["cold"], log=self.stdout.write)
+
+        meta = run_metadata(
+            mode, repeat=options["repeat"], cold=options["cold"], concurrency=options["concurrency"],
+            samples=samples,
+        )
+        output = Path(options["output"] or Path(settings.BASE_DIR) / "benchmark_results" / (
+            f"{timezone.now():%Y%m%d-%H%M%S}-{meta['commit'] or 'nocommit'}.json"
+        ))
+        save_results(output, meta, results)
+        self.stdout.write(self.style.SUCCESS(f"Saved {len(results)} results to {output}"))
+
+        if options["compare"]:
+            with open(options["compare"]) as fileobj:
+                baseline = json.load(fileobj)
+            self.stdout.write(f"\n{'scenario':<36}{'p50 before':>12}{'p50 now':>10}{'change':>9}{'queries':>14}")
+            for key, old_p50, p50, change, old_queries, queries in compare_results(baseline, results):
+                self.stdout.write(
+                    f"{key:<36}{old_p50:>12.2f}{p50:>10.2f}{change:>+8.0f}%{f'{old_queries} -> {queries}':>14}"
+                )
+
+    def runner_user(self):
+        # Staff, so the stats APIs answer instead of returning 403
+        user, _ = User.objects.get_or_create(username=RUNNER_USERNAME, defaults={"is_staff": True})
+        Profile.objects.update_or_create(user=user, defaults={"role": "Assembly Engineer"})
+        return user
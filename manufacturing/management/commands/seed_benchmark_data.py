@@ -0,0 +1,37 @@
+from django.core.management.base import BaseCommand
+
+from manufacturing.benchmarks.dataset import delete_dataset, seed_dataset
+
+
+class Command(BaseCommand):
+    help = (
+        "Bulk-generate a synthetic production-scale dataset for run_benchmarks: LOAD-* orders over "
+        "both series and every status, their serial units, heat traces and assembler users. "
+        "Re-running tops the dataset up to the requested size."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--orders", type=int, default=200_000, help="Benchmark orders to have in total")
+        parser.add_argument("--serials", type=int, default=5_000_000, help="Approximate serial units in total")
+        parser.add_argument("--assemblers", type=int, default=50, help="Assembler users completing the units")
+        parser.add_argument("--batch-size", type=int, default=1000, help="Orders written per transaction")
+        parser.add_argument("--no-traces", action="store_true", help="Skip the heat number trace index")
+        parser.add_argument("--delete", action="store_true", help="Delete the benchmark dataset instead")
+
+    def handle(self, *args, **options):
+        if options["delete"]:
+            deleted = delete_dataset(options["batch_size"])
+            self.stdout.write(self.style.SUCCESS(f"Deleted {deleted} benchmark orders"))
+            return
+
+        added = seed_dataset(
+            options["orders"],
+            options["serials"],
+            assemblers=options["assemblers"],
+            batch_size=options["batch_size"],
+            traces=not options["no_traces"],
+            log=self.stdout.write,
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f"Added {added['orders']} orders and {added['serials']} serials"
+        ))
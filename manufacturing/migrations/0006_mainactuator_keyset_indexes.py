@@ -0,0 +1,41 @@
+# Generated by Django 5.0.3 on 2026-10-17 00:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('manufacturing', '0005_rename_sr_no_orderdetails_21_series_actuator_serial_no'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='mainactuator',
+            index=models.Index(fields=['created_at', 'id'], name='mainact_created_at_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='mainactuator',
+            index=models.Index(fields=['creation_date', 'id'], name='mainact_creation_date_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='mainactuator',
+            index=models.Index(fields=['sales_order_no', 'id'], name='mainact_sales_order_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='mainactuator',
+            index=models.Index(fields=['customer', 'id'], name='mainact_customer_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='mainactuator',
+            index=models.Index(fields=['item_code', 'id'], name='mainact_item_code_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='mainactuator',
+            index=models.Index(fields=['order_qty', 'id'], name='mainact_order_qty_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='mainactuator',
+            index=models.Index(fields=['order_status', 'id'], name='mainact_order_status_id_idx'),
+        ),
+    ]
@@ -0,0 +1,40 @@
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+
+# GIN trigram indexes on UPPER(column) - the expression icontains compiles to on Postgres
+SEARCH_INDEXES = {
+    "mainact_order_no_trgm_idx": "order_no",
+    "mainact_sales_order_trgm_idx": "sales_order_no",
+    "mainact_customer_trgm_idx": "customer",
+    "mainact_item_code_trgm_idx": "item_code",
+}
+
+
+def create_search_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for name, column in SEARCH_INDEXES.items():
+        schema_editor.execute(
+            f"CREATE INDEX IF NOT EXISTS {name} ON manufacturing_mainactuator "
+            f"USING gin (UPPER({column}) gin_trgm_ops)"
+        )
+
+
+def drop_search_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for name in SEARCH_INDEXES:
+        schema_editor.execute(f"DROP INDEX IF EXISTS {name}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('manufacturing', '0006_mainactuator_keyset_indexes'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.RunPython(create_search_indexes, drop_search_indexes),
+    ]
@@ -0,0 +1,53 @@
+# Generated by Django 5.0.3 on 2026-10-17 00:40
+
+from django.db import migrations, models
+from django.db.models import Count, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def backfill_progress(apps, schema_editor):
+    MainActuator = apps.get_model('manufacturing', 'MainActuator')
+    detail_models = {
+        '25': apps.get_model('manufacturing', 'OrderDetails_25_Series'),
+        '21': apps.get_model('manufacturing', 'OrderDetails_21_Series'),
+    }
+
+    def count(model, **filters):
+        counts = (
+            model.objects.filter(order_no=OuterRef('pk'), **filters)
+            .order_by().values('order_no').annotate(n=Count('id')).values('n')
+        )
+        return Coalesce(Subquery(counts, output_field=IntegerField()), Value(0))
+
+    for series, model in detail_models.items():
+        total = count(model)
+        completed = count(model, assembler_status='completed')
+        MainActuator.objects.filter(series=series).update(
+            total_qty=total, completed_qty=completed, pending_qty=total - completed,
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('manufacturing', '0007_mainactuator_search_trigram_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='mainactuator',
+            name='completed_qty',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='mainactuator',
+            name='pending_qty',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='mainactuator',
+            name='total_qty',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_progress, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.0.3 on 2026-10-17 00:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('manufacturing', '0008_mainactuator_progress_counters'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='mainactuator',
+            index=models.Index(condition=models.Q(('pending_qty__gt', 0)), fields=['created_at', 'id'], name='mainact_under_assembly_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='mainactuator',
+            index=models.Index(condition=models.Q(('pending_qty__lte', 0)), fields=['created_at', 'id'], name='mainact_assembled_idx'),
+        ),
+    ]
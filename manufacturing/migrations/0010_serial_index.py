@@ -0,0 +1,56 @@
+# Generated by Django 5.0.3 on 2026-10-17 00:52
+
+from django.db import migrations, models
+
+
+BATCH_SIZE = 1000
+
+
+def parse_serial_index(order_no, serial_no):
+    # Serials are generated as "<order_no>-<n>"; fall back to the last "-<n>" suffix
+    prefix = f'{order_no}-'
+    suffix = serial_no[len(prefix):] if serial_no.startswith(prefix) else serial_no.rpartition('-')[2]
+    return int(suffix) if suffix.isdigit() else 0
+
+
+def backfill_serial_index(apps, schema_editor):
+    for name in ('OrderDetails_25_Series', 'OrderDetails_21_Series'):
+        model = apps.get_model('manufacturing', name)
+        batch = []
+        rows = model.objects.values_list('pk', 'actuator_serial_no', 'order_no__order_no')
+        for pk, serial_no, order_no in rows.iterator(chunk_size=BATCH_SIZE):
+            batch.append(model(pk=pk, serial_index=parse_serial_index(order_no, serial_no)))
+            if len(batch) == BATCH_SIZE:
+                model.objects.bulk_update(batch, ['serial_index'])
+                batch = []
+        if batch:
+            model.objects.bulk_update(batch, ['serial_index'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('manufacturing', '0009_mainactuator_assembly_tab_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='orderdetails_21_series',
+            name='serial_index',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='orderdetails_25_series',
+            name='serial_index',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_serial_index, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='orderdetails_21_series',
+            index=models.Index(fields=['order_no', 'serial_index'], name='od21_order_serial_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='orderdetails_25_series',
+            index=models.Index(fields=['order_no', 'serial_index'], name='od25_order_serial_idx'),
+        ),
+    ]
@@ -0,0 +1,66 @@
+# Generated by Django 5.0.3 on 2026-10-17 00:55
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+BATCH_SIZE = 2000
+
+SERIES_HEAT_FIELDS = {
+    ('25', 'OrderDetails_25_Series'): (
+        'housing_heat_no', 'yoke_heat_no', 'top_cover_heat_no', 'da_side_adaptor_plate_heat_no',
+        'spring_side_adaptor_heat_no', 'da_side_end_plate_heat_no', 'spring_side_end_plate_heat_no',
+    ),
+    ('21', 'OrderDetails_21_Series'): ('body', 'end_cap_right', 'end_cap_left', 'pinion'),
+}
+
+
+def backfill_heat_traces(apps, schema_editor):
+    trace = apps.get_model('manufacturing', 'HeatNumberTrace')
+    for (series, name), fields in SERIES_HEAT_FIELDS.items():
+        model = apps.get_model('manufacturing', name)
+        batch = []
+        rows = model.objects.values_list('pk', 'order_no_id', 'actuator_serial_no', *fields)
+        for pk, order_id, serial_no, *values in rows.iterator(chunk_size=BATCH_SIZE):
+            for field, value in zip(fields, values):
+                heat_no = ' '.join(str(value).split()).upper() if value else ''
+                if heat_no:
+                    batch.append(trace(
+                        heat_no=heat_no, component=field, series=series,
+                        serial_id=pk, actuator_serial_no=serial_no, order_id=order_id,
+                    ))
+            if len(batch) >= BATCH_SIZE:
+                trace.objects.bulk_create(batch)
+                batch = []
+        if batch:
+            trace.objects.bulk_create(batch)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('manufacturing', '0010_serial_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='HeatNumberTrace',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('heat_no', models.CharField(help_text='Normalised (trimmed, upper case) heat number', max_length=100)),
+                ('component', models.CharField(help_text='Heat number field on the serial model', max_length=50)),
+                ('series', models.CharField(max_length=2)),
+                ('serial_id', models.BigIntegerField()),
+                ('actuator_serial_no', models.CharField(max_length=100)),
+                ('order', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='heat_traces', to='manufacturing.mainactuator')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['heat_no'], name='heattrace_heat_no_idx', opclasses=['varchar_pattern_ops'])],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='heatnumbertrace',
+            constraint=models.UniqueConstraint(fields=('series', 'serial_id', 'component'), name='heattrace_serial_component_uniq'),
+        ),
+        migrations.RunPython(backfill_heat_traces, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 5.0.3 on 2026-10-17 00:57
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+# The (order_no, ...) composite indexes are created before the single-column
+# order_no index they make redundant is dropped
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('manufacturing', '0011_heat_number_trace'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='mainactuator',
+            index=models.Index(fields=['order_status', 'created_at', 'id'], name='mainact_status_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='orderdetails_21_series',
+            index=models.Index(fields=['order_no', 'assembler_status'], name='od21_order_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='orderdetails_25_series',
+            index=models.Index(fields=['order_no', 'assembler_status'], name='od25_order_status_idx'),
+        ),
+        migrations.AlterField(
+            model_name='orderdetails_21_series',
+            name='order_no',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='order_details_21', to='manufacturing.mainactuator'),
+        ),
+        migrations.AlterField(
+            model_name='orderdetails_25_series',
+            name='order_no',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='order_details_25', to='manufacturing.mainactuator'),
+        ),
+    ]
@@ -0,0 +1,47 @@
+# Generated by Django 5.0.3 on 2026-10-17 00:58
+
+from django.db import migrations
+
+
+BATCH_SIZE = 1000
+
+
+def normalise_order_qty(apps, schema_editor):
+    # Rewrite every order_qty as plain digits so 0014 can cast the column to an
+    # integer. Values that are not a whole number fall back to the number of
+    # serials created for the order (total_qty) and are listed.
+    MainActuator = apps.get_model('manufacturing', 'MainActuator')
+    invalid = []
+    batch = []
+
+    rows = MainActuator.objects.values_list('pk', 'order_no', 'order_qty', 'total_qty')
+    for pk, order_no, value, total_qty in rows.iterator(chunk_size=BATCH_SIZE):
+        text = (value or '').strip()
+        if text.isascii() and text.isdigit():
+            qty = int(text)
+        else:
+            qty = max(total_qty, 0)
+            invalid.append((order_no, value, qty))
+        if value != str(qty):
+            batch.append(MainActuator(pk=pk, order_qty=str(qty)))
+        if len(batch) == BATCH_SIZE:
+            MainActuator.objects.bulk_update(batch, ['order_qty'])
+            batch = []
+    if batch:
+        MainActuator.objects.bulk_update(batch, ['order_qty'])
+
+    if invalid:
+        print(f'\n  {len(invalid)} orders had an unparseable order_qty (order_no: old -> new):')
+        for order_no, value, qty in invalid:
+            print(f'    {order_no}: {value!r} -> {qty}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('manufacturing', '0012_hot_path_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(normalise_order_qty, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.0.3 on 2026-10-17 00:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('manufacturing', '0013_normalise_order_qty'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='mainactuator',
+            name='order_qty',
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 5.0.3 on 2026-10-17 01:01
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def backfill_order_counts(apps, schema_editor):
+    MainActuator = apps.get_model('manufacturing', 'MainActuator')
+    OrderCount = apps.get_model('manufacturing', 'OrderCount')
+    rows = (
+        MainActuator.objects.order_by()
+        .values_list('order_status', 'series', 'branch')
+        .annotate(n=Count('id'))
+    )
+    OrderCount.objects.bulk_create(
+        OrderCount(order_status=status, series=series, branch=branch, count=n)
+        for status, series, branch, n in rows
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('manufacturing', '0014_mainactuator_order_qty_integer'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OrderCount',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('order_status', models.CharField(choices=[('pending', 'Pending'), ('under_assembly', 'Under Assembly'), ('under_testing', 'Under Testing'), ('under_painting', 'Under Painting'), ('under_finishing', 'Under Finishing'), ('under_qa', 'Under QA'), ('finished_goods', 'Finished goods')], max_length=20)),
+                ('series', models.CharField(max_length=50)),
+                ('branch', models.CharField(max_length=50)),
+                ('count', models.IntegerField(default=0)),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='ordercount',
+            constraint=models.UniqueConstraint(fields=('order_status', 'series', 'branch'), name='ordercount_key_uniq'),
+        ),
+        migrations.RunPython(backfill_order_counts, migrations.RunPython.noop),
+    ]
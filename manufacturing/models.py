@@ -23,18 +23,93 @@ class MainActuator(models.Model):
     cylinder_size = models.CharField(max_length=50, help_text="Cylinder size in inch")
     spring_size = models.CharField(max_length=50, blank=True, null=True)
     moc = models.CharField(max_length=50, help_text="Material of Construction")
-    order_qty = models.CharField(max_length=50, default="0")
+    order_qty = models.PositiveIntegerField(default=0)
     order_status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
     item_code = models.CharField(max_length=50)
     creation_date = models.DateTimeField()
     branch = models.CharField(max_length=50)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+
+    # Assembly progress over the serial units, maintained by manufacturing.progress
+    total_qty = models.IntegerField(default=0)
+    completed_qty = models.IntegerField(default=0)
+    pending_qty = models.IntegerField(default=0)
+
+    # Fields OrderCount groups orders by (manufacturing.order_counts)
+    COUNT_KEY_FIELDS = ("order_status", "series", "branch")
     
 
     def __str__(self):
         return f"{self.order_no} - {self.item_code}"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # The count key as stored, so a save can move the order between counts
+        if set(cls.COUNT_KEY_FIELDS) <= set(field_names):
+            instance._saved_count_key = instance.count_key()
+        return instance
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        self._saved_count_key = self.count_key()
+
+    def refresh_from_db(self, using=None, fields=None, **kwargs):
+        super().refresh_from_db(using, fields, **kwargs)
+        # A reloaded key field may have changed; the next save reads the stored key again
+        if fields is None or set(fields) & set(self.COUNT_KEY_FIELDS):
+            self.__dict__.pop("_saved_count_key", None)
+
+    def count_key(self):
+        return tuple(getattr(self, field) for field in self.COUNT_KEY_FIELDS)
+
+    class Meta:
+        # (sort column, id) indexes for keyset pagination of the order list;
+        # order_no is already covered by its unique index
+        indexes = [
+            models.Index(fields=["created_at", "id"], name="mainact_created_at_id_idx"),
+            models.Index(fields=["creation_date", "id"], name="mainact_creation_date_id_idx"),
+            models.Index(fields=["sales_order_no", "id"], name="mainact_sales_order_id_idx"),
+            models.Index(fields=["customer", "id"], name="mainact_customer_id_idx"),
+            models.Index(fields=["item_code", "id"], name="mainact_item_code_id_idx"),
+            models.Index(fields=["order_qty", "id"], name="mainact_order_qty_id_idx"),
+            models.Index(fields=["order_status", "id"], name="mainact_order_status_id_idx"),
+            # Status-filtered order list in its default (created_at) order
+            models.Index(fields=["order_status", "created_at", "id"], name="mainact_status_created_idx"),
+            # Assembler dashboard tabs: orders still under assembly / fully assembled
+            models.Index(
+                fields=["created_at", "id"],
+                condition=models.Q(pending_qty__gt=0),
+                name="mainact_under_assembly_idx",
+            ),
+            models.Index(
+                fields=["created_at", "id"],
+                condition=models.Q(pending_qty__lte=0),
+                name="mainact_assembled_idx",
+            ),
+        ]
+
+
+class OrderCount(models.Model):
+    """
+    Number of orders per (order_status, series, branch), so dashboards read
+    their stats without counting MainActuator. Maintained by
+    manufacturing.order_counts.
+    """
+    order_status = models.CharField(max_length=20, choices=MainActuator.STATUS_CHOICES)
+    series = models.CharField(max_length=50)
+    branch = models.CharField(max_length=50)
+    count = models.IntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.order_status} / {self.series} / {self.branch}: {self.count}"
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["order_status", "series", "branch"], name="ordercount_key_uniq"),
+        ]
+
 
 
 
@@ -44,9 +119,19 @@ class OrderDetails_25_Series(models.Model):
         ('completed', 'Completed'),
     ]
 
-    order_no = models.ForeignKey(MainActuator, on_delete=models.CASCADE, related_name='order_details_25')
+    # Component heat numbers the assembler records; all are required to complete a unit
+    HEAT_FIELDS = [
+        'housing_heat_no', 'yoke_heat_no', 'top_cover_heat_no',
+        'da_side_adaptor_plate_heat_no', 'spring_side_adaptor_heat_no',
+        'da_side_end_plate_heat_no', 'spring_side_end_plate_heat_no',
+    ]
+
+    # Lookups by order use the (order_no, ...) composite indexes below
+    order_no = models.ForeignKey(MainActuator, on_delete=models.CASCADE, related_name='order_details_25', db_index=False)
     assembler_status = models.CharField(max_length=20, choices=STATUS_CHOICES, blank=True, null=True, default='pending')
     actuator_serial_no = models.CharField(max_length=100, unique=True)
+    # Position of the unit within its order (the i of OrderNo-i), used for ordering
+    serial_index = models.PositiveIntegerField(default=0)
     assembler_name = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True)
     housing_heat_no = models.CharField(max_length=100, blank=True, null=True)
     yoke_heat_no = models.CharField(max_length=100, blank=True, null=True)
@@ -64,6 +149,11 @@ class OrderDetails_25_Series(models.Model):
     class Meta:
         verbose_name = "Order Details (25 Series)"
         verbose_name_plural = "Order Details (25 Series)"
+        indexes = [
+            models.Index(fields=["order_no", "serial_index"], name="od25_order_serial_idx"),
+            # Per-order completed/pending counts and submit-all lookups
+            models.Index(fields=["order_no", "assembler_status"], name="od25_order_status_idx"),
+        ]
 
 
 class OrderDetails_21_Series(models.Model):
@@ -72,8 +162,14 @@ class OrderDetails_21_Series(models.Model):
         ('completed', 'Completed'),
     ]
 
-    order_no = models.ForeignKey(MainActuator, on_delete=models.CASCADE, related_name='order_details_21')
+    # Component heat numbers the assembler records; all are required to complete a unit
+    HEAT_FIELDS = ['body', 'end_cap_right', 'end_cap_left', 'pinion']
+
+    # Lookups by order use the (order_no, ...) composite indexes below
+    order_no = models.ForeignKey(MainActuator, on_delete=models.CASCADE, related_name='order_details_21', db_index=False)
     actuator_serial_no = models.CharField(max_length=100, unique=True, help_text="Auto-generated as OrderNo-SrNo format")
+    # Position of the unit within its order (the SrNo of OrderNo-SrNo), used for ordering
+    serial_index = models.PositiveIntegerField(default=0)
     assembler_status = models.CharField(max_length=20, choices=STATUS_CHOICES, blank=True, null=True, default='pending')
     assembler_name = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True)
     body = models.CharField(max_length=100, blank=True, null=True)
@@ -89,3 +185,40 @@ class OrderDetails_21_Series(models.Model):
     class Meta:
         verbose_name = "Order Details (21 Series)"
         verbose_name_plural = "Order Details (21 Series)"
+        indexes = [
+            models.Index(fields=["order_no", "serial_index"], name="od21_order_serial_idx"),
+            # Per-order completed/pending counts and submit-all lookups
+            models.Index(fields=["order_no", "assembler_status"], name="od21_order_status_idx"),
+        ]
+
+
+# Serial table used for each actuator series
+SERIES_DETAIL_MODELS = {
+    "25": OrderDetails_25_Series,
+    "21": OrderDetails_21_Series,
+}
+
+
+class HeatNumberTrace(models.Model):
+    """
+    One component heat number used by one serial unit, across both series.
+    Rows are derived from the serial tables by manufacturing.traceability.
+    """
+    heat_no = models.CharField(max_length=100, help_text="Normalised (trimmed, upper case) heat number")
+    component = models.CharField(max_length=50, help_text="Heat number field on the serial model")
+    series = models.CharField(max_length=2)
+    serial_id = models.BigIntegerField()
+    actuator_serial_no = models.CharField(max_length=100)
+    order = models.ForeignKey(MainActuator, on_delete=models.CASCADE, related_name='heat_traces')
+
+    def __str__(self):
+        return f"{self.heat_no} - {self.actuator_serial_no} ({self.component})"
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["series", "serial_id", "component"], name="heattrace_serial_component_uniq"),
+        ]
+        indexes = [
+            # Exact and prefix (LIKE 'X%') heat number lookups
+            models.Index(fields=["heat_no"], name="heattrace_heat_no_idx", opclasses=["varchar_pattern_ops"]),
+        ]
@@ -0,0 +1,105 @@
+"""
+Order counts per (order_status, series, branch).
+
+OrderCount mirrors ``COUNT(*) GROUP BY order_status, series, branch`` over
+MainActuator, so a dashboard stat is a read of a few summary rows instead of a
+count over every order. Single-order saves and deletes are counted by the
+receivers in manufacturing.signals; bulk inserts call ``count_new_orders`` in
+the same transaction as their write.
+``rebuild_order_counts`` (the reconcile_order_counts command) corrects drift
+from writes that bypass both, such as raw SQL.
+"""
+from collections import Counter
+
+from django.db import transaction
+from django.db.models import Count, F, Sum
+
+from .dashboard_cache import invalidate_dashboards
+from .models import MainActuator, OrderCount
+
+
+KEY_FIELDS = MainActuator.COUNT_KEY_FIELDS
+
+
+def order_key(order):
+    return order.count_key()
+
+
+def adjust_order_counts(deltas):
+    """
+    Add a {(order_status, series, branch): delta} mapping to the stored counts.
+
+    A count never goes below zero: a decrement that would is drift from a
+    write that bypassed the counts, and that key is recounted instead.
+    """
+    deltas = {key: delta for key, delta in deltas.items() if delta}
+    if not deltas:
+        return
+
+    with transaction.atomic():
+        OrderCount.objects.bulk_create(
+            [OrderCount(**dict(zip(KEY_FIELDS, key))) for key in deltas],
+            ignore_conflicts=True,
+        )
+        for key, delta in deltas.items():
+            fields = dict(zip(KEY_FIELDS, key))
+            counts = OrderCount.objects.filter(**fields)
+            if delta < 0:
+                counts = counts.filter(count__gte=-delta)
+            if not counts.update(count=F("count") + delta):
+                OrderCount.objects.filter(**fields).update(
+                    count=MainActuator.objects.filter(**fields).count()
+                )
+
+
+def count_new_orders(orders):
+    """
+    Count orders inserted without post_save (bulk_create)
+    """
+    adjust_order_counts(Counter(order_key(order) for order in orders))
+
+
+def order_count(**filters):
+    """
+    Number of orders matching ``filters`` on order_status / series / branch
+    """
+    return OrderCount.objects.filter(**filters).aggregate(n=Sum("count"))["n"] or 0
+
+
+def rebuild_order_counts():
+    """
+    Recompute every count from MainActuator with one GROUP BY.
+
+    Returns the number of (order_status, series, branch) counts that were wrong.
+    """
+    with transaction.atomic():
+        # Lock the summary first so orders created meanwhile are either seen
+        # by the GROUP BY or add their +1 after this transaction commits
+        stored = {
+            tuple(key): (pk, count)
+            for pk, count, *key in OrderCount.objects.select_for_update().values_list(
+                "pk", "count", *KEY_FIELDS
+            )
+        }
+        actual = {
+            tuple(key): count
+            for *key, count in MainActuator.objects.order_by()
+            .values_list(*KEY_FIELDS)
+            .annotate(n=Count("id"))
+        }
+
+        changed, missing = [], []
+        for key, count in actual.items():
+            if key not in stored:
+                missing.append(OrderCount(count=count, **dict(zip(KEY_FIELDS, key))))
+            elif stored[key][1] != count:
+                changed.append(OrderCount(pk=stored[key][0], count=count))
+        stale = [pk for key, (pk, count) in stored.items() if key not in actual and count]
+
+        OrderCount.objects.bulk_update(changed, ["count"])
+        OrderCount.objects.bulk_create(missing)
+        OrderCount.objects.filter(pk__in=stale).update(count=0)
+        if changed or missing or stale:
+            invalidate_dashboards()
+
+    return len(changed) + len(missing) + len(stale)
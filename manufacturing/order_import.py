@@ -0,0 +1,264 @@
+"""
+Bulk order import for the assembly engineer.
+
+Reads a CSV/XLSX ERP export row by row, validates every row against the same
+key aliases the QR/manual entry form accepts, and writes all valid orders and
+their serial units in batched statements inside one transaction.
+"""
+import csv
+import io
+from datetime import date, datetime
+
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+
+from .dashboard_cache import invalidate_dashboards
+from .models import MainActuator, SERIES_DETAIL_MODELS
+from .order_counts import count_new_orders
+
+
+# Accepted payload keys for each MainActuator field (QR scan, form, ERP export)
+FIELD_ALIASES = {
+    "order_no": ("order_no", "order no", "orderno"),
+    "sales_order_no": ("sales_order_no", "sales order no", "salesorder"),
+    "order_qty": ("order_qty", "order qty", "qty", "quantity"),
+    "line_item": ("line_item", "line item"),
+    "series": ("series",),
+    "type": ("type",),
+    "size": ("size",),
+    "cylinder_size": ("cylinder_size", "cylinder size"),
+    "spring_size": ("spring_size", "spring size"),
+    "moc": ("moc",),
+    "customer": ("customer",),
+    "item_code": ("item_code", "item code"),
+    "creation_date": ("creation_date", "creation date"),
+    "branch": ("branch",),
+}
+
+DATE_FORMATS = ("%d-%m-%Y", "%d/%m/%Y")
+
+IMPORT_BATCH_SIZE = 500
+
+
+def parse_quantity(value):
+    """
+    Return an order quantity as a positive int, or None if ``value`` is not one
+    """
+    try:
+        qty = int(str(value).strip())
+    except ValueError:
+        return None
+    return qty if qty >= 1 else None
+
+
+def get_field(data, field):
+    """
+    Return the first non-empty value for a MainActuator field from any of its aliases
+    """
+    for key in FIELD_ALIASES[field]:
+        if key in data and data[key] not in (None, ""):
+            return data[key]
+    return ""
+
+
+def build_serials(actuator, qty):
+    """
+    Build (unsaved) serial rows OrderNo-1 .. OrderNo-qty for an actuator
+    """
+    model = SERIES_DETAIL_MODELS[actuator.series]
+    return [
+        model(order_no=actuator, actuator_serial_no=f"{actuator.order_no}-{i}", serial_index=i)
+        for i in range(1, qty + 1)
+    ]
+
+
+# ================================================================
+#   FILE READERS
+# ================================================================
+def _cell(value):
+    # Spreadsheet cells come back typed; keep dates, stringify the rest
+    if value is None:
+        return ""
+    if isinstance(value, (date, datetime)):
+        return value
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    return str(value).strip()
+
+
+def _iter_csv(fileobj):
+    text = io.TextIOWrapper(fileobj, encoding="utf-8-sig", newline="")
+    try:
+        reader = csv.reader(text)
+        header = [h.strip().lower() for h in next(reader, [])]
+        for row_no, values in enumerate(reader, start=2):
+            yield row_no, dict(zip(header, (_cell(v) for v in values)))
+    finally:
+        # Do not let the wrapper close the underlying upload
+        text.detach()
+
+
+def _iter_xlsx(fileobj):
+    try:
+        from openpyxl import load_workbook
+    except ImportError:
+        raise ValueError("XLSX import requires the 'openpyxl' package.")
+
+    workbook = load_workbook(fileobj, read_only=True, data_only=True)
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        header = [str(h or "").strip().lower() for h in next(rows, ())]
+        for row_no, values in enumerate(rows, start=2):
+            yield row_no, dict(zip(header, (_cell(v) for v in values)))
+    finally:
+        workbook.close()
+
+
+def iter_rows(fileobj, filename):
+    """
+    Yield (row_number, {lowercased header: value}) for each data row of the file
+    """
+    if filename.lower().endswith((".xlsx", ".xlsm")):
+        return _iter_xlsx(fileobj)
+    return _iter_csv(fileobj)
+
+
+# ================================================================
+#   ROW VALIDATION
+# ================================================================
+def _parse_creation_date(value):
+    if isinstance(value, datetime):
+        parsed = value
+    elif isinstance(value, date):
+        parsed = datetime.combine(value, datetime.min.time())
+    else:
+        parsed = parse_datetime(value)
+        if parsed is None:
+            day = parse_date(value)
+            for fmt in DATE_FORMATS:
+                if day is not None:
+                    break
+                try:
+                    day = datetime.strptime(value, fmt).date()
+                except ValueError:
+                    pass
+            if day is None:
+                return None
+            parsed = datetime.combine(day, datetime.min.time())
+
+    if timezone.is_naive(parsed):
+        parsed = timezone.make_aware(parsed)
+    return parsed
+
+
+def clean_row(data):
+    """
+    Validate one payload and return (MainActuator field values, serial qty, errors)
+    """
+    fields = {name: get_field(data, name) for name in FIELD_ALIASES}
+    errors = []
+
+    for name in fields:
+        if name != "creation_date":
+            fields[name] = str(fields[name]).strip()
+
+    if not fields["order_no"] or not fields["sales_order_no"]:
+        errors.append("Order No and Sales Order No are required.")
+
+    if fields["series"] not in SERIES_DETAIL_MODELS:
+        errors.append("Series must be either '21' or '25'")
+
+    qty = parse_quantity(fields["order_qty"] or "1")
+    if qty is None:
+        errors.append(f"Invalid order quantity '{fields['order_qty']}'")
+    else:
+        fields["order_qty"] = qty
+
+    if not fields["creation_date"]:
+        errors.append("Creation date is required.")
+    else:
+        creation_date = _parse_creation_date(fields["creation_date"])
+        if creation_date is None:
+            errors.append(f"Invalid creation date '{fields['creation_date']}'")
+        fields["creation_date"] = creation_date
+
+    return fields, qty, errors
+
+
+# ================================================================
+#   BULK IMPORT
+# ================================================================
+def _flush(batch, report, dry_run):
+    order_nos = [fields["order_no"] for _, fields, _ in batch]
+    existing = set(
+        MainActuator.objects.filter(order_no__in=order_nos).values_list("order_no", flat=True)
+    )
+
+    actuators, quantities = [], []
+    for row_no, fields, qty in batch:
+        if fields["order_no"] in existing:
+            report["errors"].append({
+                "row": row_no,
+                "order_no": fields["order_no"],
+                "errors": [f"Order {fields['order_no']} already exists."],
+            })
+            continue
+        actuators.append(MainActuator(
+            order_status="under_assembly", total_qty=qty, pending_qty=qty, **fields
+        ))
+        quantities.append(qty)
+
+    report["created_orders"] += len(actuators)
+    report["created_serials"] += sum(quantities)
+    if dry_run or not actuators:
+        return
+
+    MainActuator.objects.bulk_create(actuators)
+    count_new_orders(actuators)
+    invalidate_dashboards()
+
+    serials = {series: [] for series in SERIES_DETAIL_MODELS}
+    for actuator, qty in zip(actuators, quantities):
+        serials[actuator.series].extend(build_serials(actuator, qty))
+    for series, rows in serials.items():
+        if rows:
+            SERIES_DETAIL_MODELS[series].objects.bulk_create(rows, batch_size=1000)
+
+
+def import_orders(fileobj, filename, dry_run=False, batch_size=IMPORT_BATCH_SIZE):
+    """
+    Import every valid row of a CSV/XLSX export in a single transaction.
+
+    Invalid rows are skipped and reported instead of aborting the import. Returns
+    {"rows", "created_orders", "created_serials", "errors"} where each error is
+    {"row", "order_no", "errors"}. With dry_run nothing is written.
+    """
+    report = {"rows": 0, "created_orders": 0, "created_serials": 0, "errors": []}
+    seen = set()
+    batch = []
+
+    with transaction.atomic():
+        for row_no, data in iter_rows(fileobj, filename):
+            if not any(v not in (None, "") for v in data.values()):
+                continue  # blank line
+
+            report["rows"] += 1
+            fields, qty, errors = clean_row(data)
+            if fields["order_no"] in seen:
+                errors.append(f"Order {fields['order_no']} is repeated in the file.")
+            if errors:
+                report["errors"].append({"row": row_no, "order_no": fields["order_no"], "errors": errors})
+                continue
+
+            seen.add(fields["order_no"])
+            batch.append((row_no, fields, qty))
+            if len(batch) >= batch_size:
+                _flush(batch, report, dry_run)
+                batch = []
+
+        if batch:
+            _flush(batch, report, dry_run)
+
+    report["errors"].sort(key=lambda e: e["row"])
+    return report
@@ -0,0 +1,92 @@
+"""
+Per-order assembly progress counters.
+
+MainActuator.total_qty / completed_qty / pending_qty are denormalised copies of
+the serial tables so dashboards never aggregate serial rows. They are set when
+an order's serials are created, bumped in the same transaction whenever serials
+flip to completed, lowered when a serial is deleted (manufacturing.signals) and
+can be rebuilt set-wise with ``rebuild_progress``.
+"""
+from django.db import transaction
+from django.db.models import Count, F, IntegerField, OuterRef, Q, Subquery, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from .dashboard_cache import invalidate_dashboards
+from .models import MainActuator, SERIES_DETAIL_MODELS
+
+
+def complete_serials(model, serial_ids, user):
+    """
+    Mark serials completed by ``user`` and update their orders' counters atomically.
+
+    Returns the number of serials that actually flipped from pending.
+    """
+    with transaction.atomic():
+        # Lock the rows that are about to flip so concurrent submits count them once
+        flipping = list(
+            model.objects.filter(pk__in=serial_ids)
+            .exclude(assembler_status="completed")
+            .select_for_update()
+            .values_list("order_no", flat=True)
+        )
+        model.objects.filter(pk__in=serial_ids).update(
+            assembler_status="completed",
+            assembler_name=user,
+            updated_at=timezone.now(),
+        )
+
+        per_order = {}
+        for order_id in flipping:
+            per_order[order_id] = per_order.get(order_id, 0) + 1
+        for order_id, count in per_order.items():
+            MainActuator.objects.filter(pk=order_id).update(
+                completed_qty=F("completed_qty") + count,
+                pending_qty=F("pending_qty") - count,
+            )
+        if per_order:
+            invalidate_dashboards(
+                MainActuator.objects.filter(pk__in=per_order).values_list("order_no", flat=True)
+            )
+
+    return len(flipping)
+
+
+def _count_subquery(model, **filters):
+    counts = (
+        model.objects.filter(order_no=OuterRef("pk"), **filters)
+        .order_by()
+        .values("order_no")
+        .annotate(n=Count("id"))
+        .values("n")
+    )
+    return Coalesce(Subquery(counts, output_field=IntegerField()), Value(0))
+
+
+def rebuild_progress(orders=None):
+    """
+    Recompute the counters from the serial tables with one UPDATE per series.
+
+    ``orders`` optionally limits the rebuild to a MainActuator queryset.
+    Returns the number of orders updated.
+    """
+    orders = MainActuator.objects.all() if orders is None else orders
+    updated = 0
+
+    with transaction.atomic():
+        for series, model in SERIES_DETAIL_MODELS.items():
+            total = _count_subquery(model)
+            completed = _count_subquery(model, assembler_status="completed")
+            updated += orders.filter(series=series).update(
+                total_qty=total,
+                completed_qty=completed,
+                pending_qty=total - completed,
+            )
+
+        # Orders without a serial table have nothing to assemble
+        updated += orders.filter(~Q(series__in=SERIES_DETAIL_MODELS)).update(
+            total_qty=0, completed_qty=0, pending_qty=0,
+        )
+        invalidate_dashboards(everything=True)
+
+    return updated
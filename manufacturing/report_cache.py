@@ -0,0 +1,147 @@
+"""
+Content-addressed disk cache for rendered order reports.
+
+Each rendered report is stored under REPORT_CACHE_DIR as
+``<kind>-<order pk>-<fingerprint><ext>``. The fingerprint covers everything the
+report is rendered from (order and serial ``updated_at``, serial count, report
+version and the printed date), so a stale file is simply never looked up
+again. Files are evicted least-recently-used once the directory grows past
+REPORT_CACHE_MAX_BYTES; only a deleted order's files are removed right away.
+"""
+import hashlib
+import os
+import tempfile
+from pathlib import Path
+
+from django.conf import settings
+from django.db.models import Count, Max
+from django.http import FileResponse
+from django.utils import timezone
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import quote_etag
+
+from .models import SERIES_DETAIL_MODELS
+
+
+def cache_dir():
+    path = Path(settings.REPORT_CACHE_DIR)
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def report_fingerprint(order, kind, version):
+    """
+    Hash of everything a report of ``kind`` for ``order`` is rendered from
+    """
+    stats = {"last": None, "n": 0}
+    model = SERIES_DETAIL_MODELS.get(order.series)
+    if model is not None:
+        stats = model.objects.filter(order_no=order).aggregate(last=Max("updated_at"), n=Count("id"))
+
+    parts = [
+        kind,
+        str(version),
+        str(order.pk),
+        order.updated_at.isoformat() if order.updated_at else "",
+        stats["last"].isoformat() if stats["last"] else "",
+        str(stats["n"]),
+        timezone.localdate().isoformat(),
+    ]
+    return hashlib.sha256("|".join(parts).encode()).hexdigest()[:32]
+
+
+def _store(path, render, evict_old=True):
+    # Render into a temp file next to the target so readers never see a partial report
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=".tmp-")
+    try:
+        with os.fdopen(fd, "wb") as fileobj:
+            render(fileobj)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+    if evict_old:
+        evict(keep=path)
+
+
+def evict(keep=None, max_bytes=None):
+    """
+    Delete least-recently-used reports until the cache fits in ``max_bytes``
+    """
+    max_bytes = settings.REPORT_CACHE_MAX_BYTES if max_bytes is None else max_bytes
+    entries = []
+    total = 0
+    for entry in os.scandir(cache_dir()):
+        if entry.is_file() and not entry.name.startswith("."):
+            stat = entry.stat()
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+            total += stat.st_size
+
+    entries.sort()
+    for _, size, path in entries:
+        if total <= max_bytes:
+            break
+        if keep is not None and path == str(keep):
+            continue
+        try:
+            os.unlink(path)
+        except FileNotFoundError:
+            pass
+        total -= size
+
+
+def invalidate_order(order_pk):
+    """
+    Drop every cached report of a deleted order
+    """
+    for path in cache_dir().glob(f"*-{order_pk}-*"):
+        try:
+            path.unlink()
+        except FileNotFoundError:
+            pass
+
+
+def cached_report_path(order, kind, version, render, ext, fingerprint=None, evict_old=True):
+    """
+    Return the cache file of a report, rendering it with ``render(fileobj)`` on a miss.
+
+    A new file trims the cache unless ``evict_old`` is false; the caller then
+    runs evict() once it has read the files it needs.
+    """
+    if fingerprint is None:
+        fingerprint = report_fingerprint(order, kind, version)
+
+    path = cache_dir() / f"{kind}-{order.pk}-{fingerprint}{ext}"
+    if path.exists():
+        path.touch()  # mark as recently used
+    else:
+        _store(path, render, evict_old)
+    return path
+
+
+def cached_report_response(request, order, kind, version, render, content_type, ext,
+                           filename=None):
+    """
+    Serve a report from the cache, rendering it with ``render(fileobj)`` on a miss.
+
+    Returns 304 when the client's If-None-Match matches the current fingerprint.
+    """
+    fingerprint = report_fingerprint(order, kind, version)
+    etag = quote_etag(fingerprint)
+
+    response = get_conditional_response(request, etag=etag)
+    if response is None:
+        path = cached_report_path(order, kind, version, render, ext, fingerprint=fingerprint)
+        response = FileResponse(
+            open(path, "rb"),
+            as_attachment=filename is not None,
+            filename=filename or "",
+            content_type=content_type,
+        )
+        if filename is None:
+            # Shown in the browser; don't leak the cache file name
+            del response["Content-Disposition"]
+
+    response["ETag"] = etag
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
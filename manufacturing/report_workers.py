@@ -0,0 +1,19 @@
+"""
+Entry points of the processes that render heat reports for a ZIP export.
+
+Workers are spawned with a fresh interpreter and unpickle these functions by
+importing this module before Django is set up, so it imports nothing that
+needs the app registry until setup() has run.
+"""
+import django
+
+
+def init():
+    django.setup()
+
+
+def render_heat_report(order_pk):
+    from .report_export import heat_report_path
+
+    # The parent trims the report cache once every report has been read
+    return heat_report_path(order_pk, evict_old=False)
@@ -0,0 +1,200 @@
+"""
+Heat annexure reports for an order: the PDF download and the printable HTML page.
+
+The PDF is laid out with ReportLab platypus so long orders flow over as many
+landscape pages as needed, with the column header repeated and a page number
+on every page. Serial rows are read with a ``.values_list()`` iterator into
+one table of plain values, so a 2,000 unit order never materialises model
+instances; platypus splits the table between pages and repeats its header
+row at the top of each. The HTML page is rendered from the ``reports/``
+templates one chunk of rows at a time.
+"""
+from datetime import datetime
+
+from django.template.loader import get_template
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import A4, landscape
+from reportlab.lib.styles import ParagraphStyle
+from reportlab.lib.units import cm
+from reportlab.platypus import Paragraph, SimpleDocTemplate, Spacer, Table, TableStyle
+
+from .models import SERIES_DETAIL_MODELS
+
+
+COMPANY_NAME = "DELVAL FLOW CONTROLS PRIVATE LIMITED"
+REPORT_TITLE = "HEAT ANNEXTURE - ACTUATOR"
+
+# Bump when a layout changes so cached copies of the old layout are not served
+HEAT_REPORT_VERSION = 2
+ORDER_REPORT_VERSION = 2
+
+# Component columns (model field, heading) of each series' serial table
+HEAT_REPORT_COLUMNS = {
+    "25": [
+        ("housing_heat_no", "Housing Heat No"),
+        ("yoke_heat_no", "Yoke Heat No"),
+        ("top_cover_heat_no", "Top Cover Heat No"),
+        ("da_side_adaptor_plate_heat_no", "DA Side Adaptor"),
+        ("spring_side_adaptor_heat_no", "Spring Side Adaptor"),
+        ("da_side_end_plate_heat_no", "DA End Plate"),
+        ("spring_side_end_plate_heat_no", "Spring End Plate"),
+    ],
+    "21": [
+        ("body", "Body"),
+        ("end_cap_right", "End Cap Right"),
+        ("end_cap_left", "End Cap Left"),
+        ("pinion", "Pinion"),
+    ],
+}
+
+# Serial rows rendered per chunk of the printable HTML report
+HTML_ROWS_PER_CHUNK = 200
+
+PAGE_SIZE = landscape(A4)
+MARGIN = 1 * cm
+
+TITLE_STYLE = ParagraphStyle("title", fontName="Helvetica-Bold", fontSize=20, leading=24, alignment=1)
+SUBTITLE_STYLE = ParagraphStyle("subtitle", fontName="Helvetica-Bold", fontSize=14, leading=18, alignment=1)
+
+TABLE_STYLE = TableStyle([
+    ("GRID", (0, 0), (-1, -1), 0.4, colors.black),
+    ("BACKGROUND", (0, 0), (-1, 0), colors.lightgrey),
+    ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
+    ("ALIGN", (0, 0), (-1, 0), "CENTER"),
+    ("FONTSIZE", (0, 0), (-1, -1), 9),
+])
+
+
+def heat_report_rows(order):
+    """
+    Yield (actuator_serial_no, status, assembler, *component values) per serial
+    without building model instances
+    """
+    model = SERIES_DETAIL_MODELS.get(order.series)
+    if model is None:
+        return
+
+    fields = [field for field, _ in HEAT_REPORT_COLUMNS[order.series]]
+    rows = (
+        model.objects.filter(order_no=order)
+        .order_by("serial_index")
+        .values_list(
+            "actuator_serial_no",
+            "assembler_status",
+            "assembler_name__first_name",
+            "assembler_name__last_name",
+            *fields,
+        )
+    )
+    for serial_no, status, first_name, last_name, *values in rows.iterator(chunk_size=500):
+        assembler = f"{first_name or ''} {last_name or ''}".strip()
+        yield (serial_no, status, assembler, *values)
+
+
+def _header_table(order):
+    top_data = [
+        ["Item Code:", order.item_code, "Size:", f"{order.size}, {order.cylinder_size}, {order.spring_size or '-'}"],
+        ["Qty:", order.order_qty, "Date:", datetime.now().strftime("%d-%m-%Y")],
+        ["Customer:", order.customer, "SO Number:", order.sales_order_no],
+    ]
+    table = Table(top_data, colWidths=[3 * cm, 7 * cm, 3 * cm, 7 * cm], hAlign="LEFT")
+    table.setStyle(TableStyle([
+        ("FONTNAME", (0, 0), (-1, -1), "Helvetica"),
+        ("FONTSIZE", (0, 0), (-1, -1), 11),
+        ("ALIGN", (0, 0), (-1, -1), "LEFT"),
+        ("BOTTOMPADDING", (0, 0), (-1, -1), 6),
+    ]))
+    return table
+
+
+def _serial_table(order):
+    columns = HEAT_REPORT_COLUMNS.get(order.series, [])
+    headers = ["Sr No", "Actuator Serial"] + [heading for _, heading in columns] + ["Assembler"]
+
+    usable_width = PAGE_SIZE[0] - 2 * MARGIN
+    fixed = [1.5 * cm, 3.5 * cm]
+    assembler_width = 3.5 * cm
+    field_width = (usable_width - sum(fixed) - assembler_width) / max(len(columns), 1)
+    col_widths = fixed + [field_width] * len(columns) + [assembler_width]
+
+    rows = [
+        [i, serial_no] + [v or "" for v in values] + [assembler]
+        for i, (serial_no, _status, assembler, *values) in enumerate(heat_report_rows(order), start=1)
+    ]
+    if not rows and columns:
+        return None
+    table = Table([headers] + rows, repeatRows=1, colWidths=col_widths, hAlign="LEFT")
+    table.setStyle(TABLE_STYLE)
+    return table
+
+
+def _draw_page_footer(order_no):
+    def draw(canvas, doc):
+        canvas.saveState()
+        canvas.setFont("Helvetica", 8)
+        canvas.drawString(MARGIN, 0.6 * cm, f"Order {order_no}")
+        canvas.drawRightString(PAGE_SIZE[0] - MARGIN, 0.6 * cm, f"Page {doc.page}")
+        canvas.restoreState()
+    return draw
+
+
+def render_heat_report(order, fileobj):
+    """
+    Write the heat annexure PDF for ``order`` to a binary file-like object
+    """
+    doc = SimpleDocTemplate(
+        fileobj,
+        pagesize=PAGE_SIZE,
+        leftMargin=MARGIN,
+        rightMargin=MARGIN,
+        topMargin=MARGIN,
+        bottomMargin=1.2 * cm,
+        title=f"Heat Report {order.order_no}",
+    )
+
+    story = [
+        Paragraph(COMPANY_NAME, TITLE_STYLE),
+        Spacer(1, 0.3 * cm),
+        Paragraph(REPORT_TITLE, SUBTITLE_STYLE),
+        Spacer(1, 0.6 * cm),
+        _header_table(order),
+        Spacer(1, 0.6 * cm),
+    ]
+    serial_table = _serial_table(order)
+    if serial_table is not None:
+        story.append(serial_table)
+
+    footer = _draw_page_footer(order.order_no)
+    doc.build(story, onFirstPage=footer, onLaterPages=footer)
+
+
+def iter_order_report_html(order):
+    """
+    Yield the printable HTML report for ``order`` in fragments
+    """
+    columns = HEAT_REPORT_COLUMNS.get(order.series, [])
+    rows_template = get_template("reports/order_report_rows.html")
+
+    yield get_template("reports/order_report_head.html").render({
+        "order": order,
+        "company_name": COMPANY_NAME,
+        "report_title": REPORT_TITLE,
+        "headings": [heading for _, heading in columns],
+    })
+
+    chunk = []
+    for i, (serial_no, status, assembler, *values) in enumerate(heat_report_rows(order), start=1):
+        chunk.append({
+            "sr_no": i,
+            "serial_no": serial_no,
+            "completed": status == "completed",
+            "values": values,
+            "assembler": assembler,
+        })
+        if len(chunk) == HTML_ROWS_PER_CHUNK:
+            yield rows_template.render({"rows": chunk})
+            chunk = []
+    if chunk:
+        yield rows_template.render({"rows": chunk})
+
+    yield get_template("reports/order_report_foot.html").render()
@@ -0,0 +1,37 @@
+"""
+Order quantity rollups for capacity planning.
+
+Each rollup is one GROUP BY over MainActuator that sums the ordered quantity
+and the maintained assembly counters (see manufacturing.progress), so no order
+rows are loaded into Python.
+"""
+from django.db.models import Count, Sum
+
+from .models import MainActuator
+
+
+# Columns an order rollup can be grouped by
+ROLLUP_FIELDS = ("branch", "customer", "order_status", "series")
+
+
+def quantity_rollup(group_by, orders=None):
+    """
+    Per-``group_by`` order count and summed order/assembly quantities of
+    ``orders`` (a MainActuator queryset; default all), largest order_qty first
+    """
+    if group_by not in ROLLUP_FIELDS:
+        raise ValueError(f"Cannot group orders by '{group_by}'")
+
+    orders = MainActuator.objects.all() if orders is None else orders
+    return (
+        orders.order_by()
+        .values(group_by)
+        .annotate(
+            orders=Count("id"),
+            order_qty=Sum("order_qty"),
+            total_qty=Sum("total_qty"),
+            completed_qty=Sum("completed_qty"),
+            pending_qty=Sum("pending_qty"),
+        )
+        .order_by("-order_qty", group_by)
+    )
@@ -0,0 +1,56 @@
+"""
+Order search for the assembly engineer dashboard.
+
+On Postgres every searchable column has a GIN trigram index on UPPER(column)
+(migration 0007), which is exactly the expression Django's ``icontains``
+compiles to, so the OR of substring filters becomes a BitmapOr of index scans
+and results are ranked by trigram similarity. On SQLite (local runs and tests)
+the same filters fall back to table scans and a simple match-quality rank.
+"""
+from django.contrib.postgres.search import TrigramSimilarity
+from django.db import connections
+from django.db.models import Case, IntegerField, Q, Value, When
+from django.db.models.functions import Greatest
+
+
+SEARCH_FIELDS = ("order_no", "sales_order_no", "customer", "item_code")
+
+# Autocomplete settings
+MIN_QUERY_LENGTH = 2
+AUTOCOMPLETE_LIMIT = 10
+
+
+def filter_orders(queryset, query):
+    """
+    Orders where any searchable column contains ``query`` (case-insensitive)
+    """
+    condition = Q()
+    for field in SEARCH_FIELDS:
+        condition |= Q(**{f"{field}__icontains": query})
+    return queryset.filter(condition)
+
+
+def search_orders(queryset, query):
+    """
+    Matching orders, best match first: exact order no, then prefix matches,
+    then (on Postgres) by trigram similarity.
+    """
+    queryset = filter_orders(queryset, query).annotate(
+        match_rank=Case(
+            When(order_no__iexact=query, then=Value(3)),
+            When(
+                Q(order_no__istartswith=query) | Q(sales_order_no__istartswith=query),
+                then=Value(2),
+            ),
+            default=Value(1),
+            output_field=IntegerField(),
+        )
+    )
+
+    if connections[queryset.db].vendor == "postgresql":
+        queryset = queryset.annotate(
+            similarity=Greatest(*(TrigramSimilarity(field, query) for field in SEARCH_FIELDS))
+        )
+        return queryset.order_by("-match_rank", "-similarity", "order_no")
+
+    return queryset.order_by("-match_rank", "order_no")
@@ -0,0 +1,219 @@
+"""
+Heat number updates for serial rows.
+
+The order details page posts every edited row at once; the edits are validated
+together, written with a single ``bulk_update`` and, for submits, completed
+with one ``complete_serials`` call instead of one request per serial. The JSON
+API patches one serial with a single UPDATE and submits many by id. Every
+write refreshes the heat number traces of the serials it touched.
+"""
+import re
+
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.text import capfirst
+
+from .models import MainActuator, SERIES_DETAIL_MODELS
+from .progress import complete_serials
+from .traceability import sync_heat_traces
+
+
+ROW_INPUT_RE = re.compile(r"^(?P<field>[a-z_]+)-(?P<pk>\d+)$")
+
+
+def parse_row_edits(data, fields):
+    """
+    Collect {serial pk: {field: value}} from inputs named ``<field>-<pk>``
+    """
+    edits = {}
+    for key, value in data.items():
+        match = ROW_INPUT_RE.match(key)
+        if match and match["field"] in fields:
+            edits.setdefault(int(match["pk"]), {})[match["field"]] = value.strip()
+    return edits
+
+
+def heat_value_errors(model, values):
+    """
+    Validation messages for a {field: value} dict of heat numbers
+    """
+    errors = []
+    for field, value in values.items():
+        if field not in model.HEAT_FIELDS:
+            errors.append(f"Unknown field '{field}'.")
+            continue
+        label = capfirst(model._meta.get_field(field).verbose_name)
+        max_length = model._meta.get_field(field).max_length
+        if not isinstance(value, str):
+            errors.append(f"{label} must be text.")
+        elif len(value) > max_length:
+            errors.append(f"{label} is longer than {max_length} characters.")
+    return errors
+
+
+def save_serial_edits(order, edits, user, submit_ids=(), submit_all=False):
+    """
+    Apply heat number edits to many serials of ``order`` and optionally complete them.
+
+    ``submit_ids`` are serials to complete; ``submit_all`` completes every pending
+    serial whose heat numbers are all filled in. Rows that fail validation are
+    left untouched. Returns {"saved", "completed", "incomplete", "errors"} where
+    ``errors`` maps serial numbers to messages and ``incomplete`` counts pending
+    serials skipped by ``submit_all`` for missing heat numbers.
+    """
+    model = SERIES_DETAIL_MODELS[order.series]
+    fields = model.HEAT_FIELDS
+    report = {"saved": 0, "completed": 0, "incomplete": 0, "errors": {}}
+
+    wanted = Q(pk__in=set(edits) | set(submit_ids))
+    if submit_all:
+        wanted |= ~Q(assembler_status="completed")
+    rows = {
+        row.pk: row
+        for row in model.objects.filter(wanted, order_no=order).only(
+            "id", "actuator_serial_no", "assembler_status", *fields
+        )
+    }
+
+    def error(pk, message):
+        key = rows[pk].actuator_serial_no if pk in rows else f"#{pk}"
+        report["errors"].setdefault(key, []).append(message)
+
+    now = timezone.now()
+    changed = []
+    for pk, values in edits.items():
+        row = rows.get(pk)
+        if row is None:
+            error(pk, "Serial does not belong to this order.")
+            continue
+
+        invalid = heat_value_errors(model, values)
+        if invalid:
+            for message in invalid:
+                error(pk, message)
+            continue
+
+        dirty = False
+        for f, value in values.items():
+            if (getattr(row, f) or "") != value:
+                setattr(row, f, value)
+                dirty = True
+        if dirty:
+            row.updated_at = now  # bulk_update skips auto_now
+            changed.append(row)
+
+    ready = []
+    for pk in (rows if submit_all else submit_ids):
+        row = rows.get(pk)
+        if row is None:
+            error(pk, "Serial does not belong to this order.")
+            continue
+        if row.assembler_status == "completed" or row.actuator_serial_no in report["errors"]:
+            continue
+        if any(getattr(row, f) in ("", None) for f in fields):
+            if submit_all and pk not in submit_ids:
+                report["incomplete"] += 1
+            else:
+                error(pk, "All heat numbers required!")
+            continue
+        ready.append(pk)
+
+    with transaction.atomic():
+        if changed:
+            model.objects.bulk_update(changed, [*fields, "updated_at"], batch_size=500)
+            sync_heat_traces(model, model.objects.filter(pk__in=[row.pk for row in changed]))
+        if ready:
+            report["completed"] = complete_serials(model, ready, user)
+
+    report["saved"] = len(changed)
+    return report
+
+
+def patch_serial(model, pk, values):
+    """
+    Write heat numbers of one serial and refresh its traces; False if it does not exist.
+
+    One UPDATE for the serial, then sync_heat_traces() for just the patched
+    fields: a DELETE of their old traces, a SELECT of the row and one INSERT.
+    """
+    with transaction.atomic():
+        if model.objects.filter(pk=pk).update(**values, updated_at=timezone.now()) != 1:
+            return False
+        sync_heat_traces(model, model.objects.filter(pk=pk), fields=values)
+    return True
+
+
+def submit_serials(model, ids, user):
+    """
+    Complete the serials in ``ids`` whose heat numbers are all filled in.
+
+    Returns {"completed", "errors", "progress"}: ``errors`` maps serial ids to a
+    message and ``progress`` holds the counters of every order touched.
+    """
+    fields = model.HEAT_FIELDS
+    rows = model.objects.filter(pk__in=ids).values_list("pk", "order_no_id", "assembler_status", *fields)
+
+    errors = {}
+    ready, order_ids = [], set()
+    for pk, order_id, status, *values in rows:
+        order_ids.add(order_id)
+        if status == "completed":
+            continue
+        if any(v in ("", None) for v in values):
+            errors[pk] = "All heat numbers required!"
+        else:
+            ready.append(pk)
+    for pk in set(ids) - {row[0] for row in rows}:
+        errors[pk] = "Serial not found."
+
+    completed = complete_serials(model, ready, user) if ready else 0
+    progress = list(
+        MainActuator.objects.filter(pk__in=order_ids).values(
+            "order_no", "total_qty", "completed_qty", "pending_qty"
+        )
+    )
+    return {"completed": completed, "errors": errors, "progress": progress}
+
+
+def fill_heat_numbers(order, field, value, first=None, last=None, ids=(), overwrite=False):
+    """
+    Set one heat number on many serials of ``order`` with a single UPDATE.
+
+    Targets the selected serial ``ids`` or else serials ``first``..``last`` of the
+    order. Completed serials are never changed, and unless ``overwrite`` is set
+    neither are serials that already hold a value for ``field``; both count as
+    skipped. Returns (updated, skipped); raises ValueError for invalid input.
+    """
+    model = SERIES_DETAIL_MODELS[order.series]
+    value = value.strip()
+    if field not in model.HEAT_FIELDS:
+        raise ValueError("Choose the component to fill.")
+    if not value:
+        raise ValueError("Enter the heat number to fill.")
+    errors = heat_value_errors(model, {field: value})
+    if errors:
+        raise ValueError(" ".join(errors))
+
+    serials = model.objects.filter(order_no=order)
+    if ids:
+        serials = serials.filter(pk__in=ids)
+    elif first is not None and last is not None:
+        if first < 1 or last < first:
+            raise ValueError("Enter a serial range like 1 to 50.")
+        serials = serials.filter(serial_index__range=(first, last))
+    else:
+        raise ValueError("Select serials or enter a serial range.")
+
+    targets = serials
+    serials = serials.exclude(assembler_status="completed")
+    if not overwrite:
+        serials = serials.filter(Q(**{f"{field}__isnull": True}) | Q(**{field: ""}))
+
+    with transaction.atomic():
+        # Lock the targets so the UPDATE sees the rows counted here; FOR UPDATE
+        # can't be combined with COUNT(*) on PostgreSQL
+        total = len(targets.select_for_update().values_list("pk", flat=True))
+        updated = serials.update(**{field: value, "updated_at": timezone.now()})
+        sync_heat_traces(model, targets, fields=[field])
+    return updated, total - updated
@@ -0,0 +1,99 @@
+from django.db.models import F
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from .dashboard_cache import invalidate_dashboards
+from .models import (
+    HeatNumberTrace, MainActuator, OrderDetails_21_Series, OrderDetails_25_Series, SERIES_DETAIL_MODELS,
+)
+from .order_counts import KEY_FIELDS, adjust_order_counts, order_key
+from .report_cache import invalidate_order
+from .traceability import sync_heat_traces
+
+
+SERIAL_SERIES = {model: series for series, model in SERIES_DETAIL_MODELS.items()}
+
+
+def _deleting_order(origin):
+    # Serials removed by deleting their order are handled by the order's receivers
+    return isinstance(origin, MainActuator) or getattr(origin, "model", None) is MainActuator
+
+
+@receiver([post_save, post_delete], sender=MainActuator)
+def invalidate_order_dashboards(sender, instance, **kwargs):
+    invalidate_dashboards([instance.order_no])
+
+
+@receiver(post_delete, sender=MainActuator)
+def delete_order_reports(sender, instance, **kwargs):
+    # Saves change the report fingerprint, so stale files are never read again
+    # and age out through evict(); a deleted order's files are dropped at once
+    invalidate_order(instance.pk)
+
+
+@receiver(pre_save, sender=MainActuator)
+def remember_order_count_key(sender, instance, **kwargs):
+    # Orders loaded or saved through the ORM carry their stored count key
+    # (MainActuator.from_db); only others, e.g. built with a pk, are looked up
+    if instance.pk is not None and not hasattr(instance, "_saved_count_key"):
+        instance._saved_count_key = (
+            MainActuator.objects.filter(pk=instance.pk).values_list(*KEY_FIELDS).first()
+        )
+
+
+@receiver(post_save, sender=MainActuator)
+def count_saved_order(sender, instance, created, **kwargs):
+    # Read the stored key first: loading a deferred key field refreshes the instance
+    old_key = getattr(instance, "_saved_count_key", None)
+    key = order_key(instance)
+    if created or old_key is None:
+        adjust_order_counts({key: 1})
+    elif old_key != key:
+        adjust_order_counts({old_key: -1, key: 1})
+
+
+@receiver(post_delete, sender=MainActuator)
+def count_deleted_order(sender, instance, **kwargs):
+    adjust_order_counts({order_key(instance): -1})
+
+
+@receiver([post_save, post_delete], sender=OrderDetails_25_Series)
+@receiver([post_save, post_delete], sender=OrderDetails_21_Series)
+def invalidate_serial_dashboards(sender, instance, origin=None, update_fields=None, **kwargs):
+    if _deleting_order(origin):
+        return
+    # Dashboards show no heat numbers; a save limited to them changes nothing cached
+    if update_fields and set(update_fields) <= {*sender.HEAT_FIELDS, "updated_at"}:
+        return
+    if sender.order_no.is_cached(instance):
+        order_no = instance.order_no.order_no
+    else:
+        order_no = MainActuator.objects.filter(pk=instance.order_no_id).values_list("order_no", flat=True).first()
+    invalidate_dashboards([order_no] if order_no else [])
+
+
+@receiver(post_save, sender=OrderDetails_25_Series)
+@receiver(post_save, sender=OrderDetails_21_Series)
+def sync_serial_heat_traces(sender, instance, **kwargs):
+    sync_heat_traces(sender, sender.objects.filter(pk=instance.pk))
+
+
+@receiver(post_delete, sender=OrderDetails_25_Series)
+@receiver(post_delete, sender=OrderDetails_21_Series)
+def delete_serial_heat_traces(sender, instance, origin=None, **kwargs):
+    # An order's traces go with it through the HeatNumberTrace.order cascade
+    if _deleting_order(origin):
+        return
+    HeatNumberTrace.objects.filter(series=SERIAL_SERIES[sender], serial_id=instance.pk).delete()
+
+
+@receiver(post_delete, sender=OrderDetails_25_Series)
+@receiver(post_delete, sender=OrderDetails_21_Series)
+def uncount_deleted_serial(sender, instance, origin=None, **kwargs):
+    # Keep the order's progress counters (manufacturing.progress) in step
+    if _deleting_order(origin):
+        return
+    counter = "completed_qty" if instance.assembler_status == "completed" else "pending_qty"
+    MainActuator.objects.filter(pk=instance.order_no_id).update(
+        total_qty=F("total_qty") - 1, **{counter: F(counter) - 1}
+    )
@@ -1,3 +1,1388 @@
-from django.test import TestCase
+import io
+import json
+import math
+import os
+import re
+import shutil
+import tempfile
+import time
+from contextlib import redirect_stdout
+from datetime import timedelta
+from pathlib import Path
+from unittest import skipUnless
+from unittest.mock import patch
 
-# Create your tests here.
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import DEFAULT_DB_ALIAS, connection, connections
+from django.db.migrations.executor import MigrationExecutor
+from django.db.models import AutoField
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from reportlab import rl_config
+
+from accounts.models import Profile
+from ReportManagement.db.router import PIN_COOKIE
+
+from .dashboard_cache import ORDERS, cached_dashboard_data, invalidate_dashboards, order_namespace
+from .models import (
+    HeatNumberTrace, MainActuator, OrderCount, OrderDetails_21_Series, OrderDetails_25_Series,
+    SERIES_DETAIL_MODELS,
+)
+from .order_counts import adjust_order_counts, count_new_orders, order_count, rebuild_order_counts
+from .order_import import build_serials, import_orders
+from .pagination import encode_cursor, keyset_page
+from .progress import complete_serials, rebuild_progress
+from .report_cache import cached_report_path
+from .reports import render_heat_report
+from .rollups import quantity_rollup
+from .serial_updates import (
+    fill_heat_numbers, heat_value_errors, parse_row_edits, patch_serial, save_serial_edits, submit_serials,
+)
+from .traceability import normalise_heat_no, search_heat_traces, sync_heat_traces
+
+
+# Tables that grow with production volume; a full scan of any of them fails the plan tests
+LARGE_TABLES = [
+    model._meta.db_table
+    for model in (MainActuator, OrderDetails_25_Series, OrderDetails_21_Series, HeatNumberTrace)
+]
+
+
+def seed_orders(orders=40, serials=10):
+    """
+    Orders over both series and every status, each with ``serials`` units of
+    which the first half are completed with all heat numbers filled in
+    """
+    user = User.objects.create_user("seed-assembler")
+    statuses = [value for value, _ in MainActuator.STATUS_CHOICES]
+    created = MainActuator.objects.bulk_create(
+        MainActuator(
+            order_no=f"SEED{i:04d}",
+            sales_order_no=f"SO{i // 4:04d}",
+            line_item=str(i % 4),
+            customer=f"Customer {i % 7}",
+            series="25" if i % 2 else "21",
+            item_code=f"ITEM{i % 11}",
+            order_qty=serials,
+            order_status=statuses[i % len(statuses)],
+            creation_date=timezone.now() - timedelta(days=i),
+            total_qty=serials,
+            completed_qty=serials // 2,
+            pending_qty=serials - serials // 2,
+        )
+        for i in range(orders)
+    )
+    count_new_orders(created)
+    for order in created:
+        model = SERIES_DETAIL_MODELS[order.series]
+        rows = build_serials(order, serials)
+        for row in rows[:serials // 2]:
+            row.assembler_status = "completed"
+            row.assembler_name = user
+            for field in model.HEAT_FIELDS:
+                setattr(row, field, f"H{order.pk % 5}-{field[:3]}")
+        model.objects.bulk_create(rows)
+    for model in SERIES_DETAIL_MODELS.values():
+        sync_heat_traces(model)
+    return user
+
+
+def explain(sql):
+    with connection.cursor() as cursor:
+        if connection.vendor == "postgresql":
+            # The seeded tables are tiny; make the planner show the plan it would
+            # pick for large ones. A Seq Scan now means no usable index exists.
+            cursor.execute("SET LOCAL enable_seqscan = off")
+            cursor.execute(f"EXPLAIN {sql}")
+        else:
+            cursor.execute(f"EXPLAIN QUERY PLAN {sql}")
+        return "\n".join(str(row[-1]) for row in cursor.fetchall())
+
+
+def full_scans(plan):
+    """
+    Large tables read in full by a query plan (Postgres or SQLite)
+    """
+    if connection.vendor == "postgresql":
+        scanned = re.findall(r"Seq Scan on (\w+)", plan)
+    else:
+        # "SCAN <table> [AS alias]" without "USING ... INDEX" reads every row
+        scanned = re.findall(r"^\s*SCAN (\w+)(?! .*USING .*INDEX)", plan, re.MULTILINE)
+    return sorted({table for table in scanned if table in LARGE_TABLES})
+
+
+class TempReportCacheMixin:
+    """
+    Reports render into a temporary REPORT_CACHE_DIR: one for the class, used by
+    setUpTestData, and an empty one for every test
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cls.override_report_cache_dir(cls.addClassCleanup)
+        super().setUpClass()
+
+    @staticmethod
+    def override_report_cache_dir(add_cleanup):
+        cache_dir = tempfile.mkdtemp()
+        add_cleanup(shutil.rmtree, cache_dir, ignore_errors=True)
+        settings_override = override_settings(REPORT_CACHE_DIR=cache_dir)
+        settings_override.enable()
+        add_cleanup(settings_override.disable)
+
+    def setUp(self):
+        super().setUp()
+        self.override_report_cache_dir(self.addCleanup)
+
+
+class QueryPlanTests(TempReportCacheMixin, TestCase):
+    """
+    EXPLAIN every query the main views run and fail on a full scan of a large table
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = seed_orders()
+        cls.order_25 = MainActuator.objects.filter(series="25").latest("created_at")
+        cls.order_21 = MainActuator.objects.filter(series="21").latest("created_at")
+
+    def setUp(self):
+        super().setUp()
+        # Cached dashboard data would hide the queries under test
+        cache.clear()
+        self.client.force_login(self.user)
+
+    def assertIndexedView(self, url):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+            if getattr(response, "streaming", False):
+                b"".join(response.streaming_content)
+        self.assertLess(response.status_code, 400, url)
+
+        checked = 0
+        for query in queries.captured_queries:
+            sql = query["sql"]
+            if not sql.lstrip().upper().startswith("SELECT"):
+                continue
+            plan = explain(sql)
+            scanned = full_scans(plan)
+            self.assertEqual(scanned, [], f"{url} scans {scanned}:\n{sql}\n{plan}")
+            checked += 1
+        self.assertGreater(checked, 0, url)
+
+    def test_assembly_engineer_dashboard(self):
+        url = reverse("assembly_engineer_dashboard")
+        self.assertIndexedView(url)
+        self.assertIndexedView(f"{url}?status=under_assembly")
+        self.assertIndexedView(f"{url}?status=pending&sort=created_at&order=asc")
+        for sort in ("customer", "sales_order_no", "creation_date", "order_status"):
+            self.assertIndexedView(f"{url}?sort={sort}")
+
+    def test_assembly_engineer_dashboard_next_page(self):
+        url = reverse("assembly_engineer_dashboard")
+        first_page = self.client.get(url).context["actuators"]
+        self.assertIndexedView(f"{url}?after={first_page.next_cursor}")
+
+    def test_assembler_dashboard(self):
+        self.assertIndexedView(reverse("assembler_dashboard"))
+
+    def test_assembler_order_details(self):
+        for order in (self.order_25, self.order_21):
+            self.assertIndexedView(reverse("assembler_order_details", args=[order.order_no]))
+
+    def test_order_progress_api(self):
+        self.assertIndexedView(reverse("order_progress_api", args=[self.order_25.order_no]))
+
+    def test_reports(self):
+        for order in (self.order_25, self.order_21):
+            self.assertIndexedView(reverse("generate_heat_report", args=[order.order_no]))
+            self.assertIndexedView(reverse("print_order_report", args=[order.order_no]))
+
+    def test_heat_trace_search(self):
+        self.assertIndexedView(f"{reverse('heat_trace_api')}?q=H1-hou")
+        self.assertIndexedView(f"{reverse('heat_trace_search')}?q=H1-hou")
+
+    def test_full_scan_is_detected(self):
+        with CaptureQueriesContext(connection) as queries:
+            list(MainActuator.objects.filter(moc="steel"))
+        plan = explain(queries.captured_queries[0]["sql"])
+        self.assertEqual(full_scans(plan), [MainActuator._meta.db_table])
+
+
+def seed_order(order_no, series, qty, user):
+    """
+    An order under assembly with ``qty`` units, all heat numbers filled in
+    and the first half completed by ``user``
+    """
+    model = SERIES_DETAIL_MODELS[series]
+    done = qty // 2
+    order = MainActuator.objects.create(
+        order_no=order_no,
+        sales_order_no=f"SO-{order_no}",
+        customer="Budget Customer",
+        series=series,
+        item_code="ITEM-BUDGET",
+        order_qty=qty,
+        order_status="under_assembly",
+        creation_date=timezone.now(),
+        total_qty=qty,
+        completed_qty=done,
+        pending_qty=qty - done,
+    )
+    rows = build_serials(order, qty)
+    for row in rows:
+        for field in model.HEAT_FIELDS:
+            setattr(row, field, f"HB{order.pk}-{field[:3]}")
+    for row in rows[:done]:
+        row.assembler_status = "completed"
+        row.assembler_name = user
+    model.objects.bulk_create(rows)
+    sync_heat_traces(model, model.objects.filter(order_no=order))
+    return order
+
+
+def insert_batches(model, rows, batch_size=None):
+    """
+    INSERT statements bulk_create() runs for ``rows`` new ``model`` rows: one
+    on PostgreSQL, one per 999 parameters on SQLite
+    """
+    fields = [f for f in model._meta.concrete_fields if not isinstance(f, AutoField)]
+    size = connection.ops.bulk_batch_size(fields, [None] * rows)
+    if batch_size:
+        size = min(size, batch_size)
+    return math.ceil(rows / size)
+
+
+class HeatReportTests(TempReportCacheMixin, TestCase):
+    """
+    Layout of the heat annexure PDF
+    """
+
+    def test_header_row_once_per_page(self):
+        order = seed_order("PDF-0001", "25", 100, User.objects.create_user("report-assembler"))
+        buffer = io.BytesIO()
+        # Uncompressed page streams keep the drawn text searchable
+        with patch.object(rl_config, "pageCompression", 0):
+            render_heat_report(order, buffer)
+        pdf = buffer.getvalue()
+        pages = len(re.findall(rb"\(Page \d+\)", pdf))
+        self.assertGreater(pages, 1)
+        self.assertEqual(pdf.count(b"(Sr No)"), pages)
+
+
+class OrderCountTests(TempReportCacheMixin, TestCase):
+    """
+    OrderCount follows single-order saves without reading the order back
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.order = seed_order("COUNT-0001", "25", 2, User.objects.create_user("count-assembler"))
+
+    def assertStatusCounts(self, **expected):
+        for status, count in expected.items():
+            self.assertEqual(order_count(order_status=status), count, status)
+
+    def test_status_change_moves_the_order(self):
+        order = MainActuator.objects.get(pk=self.order.pk)
+        order.order_status = "under_testing"
+        with CaptureQueriesContext(connection) as queries:
+            order.save()
+        self.assertNotIn('FROM "manufacturing_mainactuator"', " ".join(query["sql"] for query in queries))
+        self.assertStatusCounts(under_assembly=0, under_testing=1)
+
+        order.order_status = "under_painting"
+        order.save()
+        self.assertStatusCounts(under_testing=0, under_painting=1)
+
+    def test_order_loaded_without_its_status(self):
+        order = MainActuator.objects.only("pk", "order_no").get(pk=self.order.pk)
+        order.order_status = "under_testing"
+        order.save()
+        self.assertStatusCounts(under_assembly=0, under_testing=1)
+
+    def test_refreshed_order(self):
+        order = MainActuator.objects.get(pk=self.order.pk)
+        MainActuator.objects.filter(pk=order.pk).update(order_status="under_testing")
+        order.refresh_from_db()
+        order.order_status = "under_qa"
+        order.save()
+        # The raw update bypassed the counts: under_testing is recounted rather
+        # than going negative, and under_assembly stays off until a reconcile
+        self.assertStatusCounts(under_assembly=1, under_testing=0, under_qa=1)
+        self.assertEqual(rebuild_order_counts(), 1)
+        self.assertStatusCounts(under_assembly=0, under_testing=0, under_qa=1)
+
+    def test_counts_never_go_negative(self):
+        key = self.order.count_key()
+        adjust_order_counts({key: -3})
+        self.assertStatusCounts(under_assembly=1)
+        OrderCount.objects.update(count=0)
+        self.order.delete()
+        self.assertFalse(OrderCount.objects.filter(count__lt=0).exists())
+
+
+class OrderImportTests(TempReportCacheMixin, TestCase):
+    """
+    Bulk import keeps the valid rows of a file and reports the rest
+    """
+
+    CSV = (
+        "Order No,Sales Order No,Series,Order Qty,Creation Date\n"
+        "IMP-0001,SO-1,25,3,2024-01-15\n"
+        "IMP-0002,,21,2,2024-01-15\n"
+        "IMP-0003,SO-3,99,2,15-01-2024\n"
+        "IMP-0004,SO-4,21,none,15/01/2024\n"
+        "IMP-0005,SO-5,21,2,someday\n"
+        "\n"
+        "IMP-0001,SO-1,25,3,2024-01-15\n"
+        "IMP-EXISTS,SO-6,21,2,2024-01-15\n"
+        "IMP-0006,SO-7,21,2,15/01/2024\n"
+    )
+
+    def setUp(self):
+        super().setUp()
+        seed_order("IMP-EXISTS", "21", 1, User.objects.create_user("import-assembler"))
+
+    def import_csv(self, **kwargs):
+        return import_orders(io.BytesIO(self.CSV.encode()), "orders.csv", **kwargs)
+
+    def assertReport(self, report):
+        self.assertEqual(report["rows"], 8)
+        self.assertEqual(report["created_orders"], 2)
+        self.assertEqual(report["created_serials"], 5)
+        self.assertEqual(
+            [(error["row"], error["order_no"]) for error in report["errors"]],
+            [(3, "IMP-0002"), (4, "IMP-0003"), (5, "IMP-0004"), (6, "IMP-0005"), (8, "IMP-0001"), (9, "IMP-EXISTS")],
+        )
+        errors = {error["row"]: error["errors"] for error in report["errors"]}
+        self.assertEqual(errors[3], ["Order No and Sales Order No are required."])
+        self.assertEqual(errors[4], ["Series must be either '21' or '25'"])
+        self.assertEqual(errors[5], ["Invalid order quantity 'none'"])
+        self.assertEqual(errors[6], ["Invalid creation date 'someday'"])
+        self.assertEqual(errors[8], ["Order IMP-0001 is repeated in the file."])
+        self.assertEqual(errors[9], ["Order IMP-EXISTS already exists."])
+
+    def test_valid_rows_are_imported(self):
+        self.assertReport(self.import_csv(batch_size=2))
+        order = MainActuator.objects.get(order_no="IMP-0006")
+        self.assertEqual((order.order_status, order.total_qty, order.pending_qty), ("under_assembly", 2, 2))
+        self.assertEqual(order.creation_date.date().isoformat(), "2024-01-15")
+        self.assertEqual(
+            list(OrderDetails_25_Series.objects.filter(order_no__order_no="IMP-0001")
+                 .order_by("serial_index").values_list("actuator_serial_no", flat=True)),
+            ["IMP-0001-1", "IMP-0001-2", "IMP-0001-3"],
+        )
+        self.assertEqual(order_count(order_status="under_assembly"), 3)
+
+    def test_dry_run_writes_nothing(self):
+        self.assertReport(self.import_csv(dry_run=True))
+        self.assertFalse(MainActuator.objects.filter(order_no__in=["IMP-0001", "IMP-0006"]).exists())
+        self.assertEqual(OrderDetails_21_Series.objects.count() + OrderDetails_25_Series.objects.count(), 1)
+        self.assertEqual(order_count(order_status="under_assembly"), 1)
+
+
+class KeysetPaginationTests(TestCase):
+    """
+    Walking keyset pages visits every row once, in order, in both directions
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        # Seven orders over three creation dates, so most page edges fall inside a tie
+        day = timezone.now()
+        MainActuator.objects.bulk_create(
+            MainActuator(
+                order_no=f"PAGE-{i:02d}", sales_order_no="SO-PAGE", series="21",
+                creation_date=day - timedelta(days=i % 3),
+            )
+            for i in range(7)
+        )
+        cls.orders = MainActuator.objects.filter(order_no__startswith="PAGE-")
+
+    def walk(self, per_page, descending=True):
+        """
+        Pages from first to last following next cursors, then back following previous cursors
+        """
+        pages = [keyset_page(self.orders, "creation_date", descending, per_page=per_page)]
+        while pages[-1].has_next():
+            pages.append(keyset_page(
+                self.orders, "creation_date", descending, after=pages[-1].next_cursor, per_page=per_page
+            ))
+        back = [pages[-1]]
+        while back[-1].has_previous():
+            back.append(keyset_page(
+                self.orders, "creation_date", descending, before=back[-1].previous_cursor, per_page=per_page
+            ))
+        return pages, back[::-1]
+
+    def test_forward_and_back(self):
+        for descending in (True, False):
+            prefix = "-" if descending else ""
+            expected = list(self.orders.order_by(f"{prefix}creation_date", f"{prefix}id"))
+            for per_page in (2, 3, 7, 10):
+                with self.subTest(descending=descending, per_page=per_page):
+                    pages, back = self.walk(per_page, descending)
+                    self.assertEqual([obj for page in pages for obj in page], expected)
+                    self.assertEqual([list(page) for page in back], [list(page) for page in pages])
+                    self.assertEqual(len(pages), math.ceil(len(expected) / per_page))
+                    self.assertFalse(pages[0].has_previous())
+                    self.assertFalse(pages[-1].has_next())
+                    self.assertTrue(all(page.has_next() for page in pages[:-1]))
+                    self.assertTrue(all(page.has_previous() for page in pages[1:]))
+
+    def test_page_past_the_end(self):
+        last = self.orders.order_by("creation_date", "id").first()
+        page = keyset_page(self.orders, "creation_date", after=encode_cursor(last.creation_date, last.pk))
+        self.assertEqual(len(page), 0)
+        self.assertFalse(page.has_other_pages())
+
+    def test_previous_page_from_inside_a_tie(self):
+        first = keyset_page(self.orders, "creation_date", per_page=3)
+        second = keyset_page(self.orders, "creation_date", after=first.next_cursor, per_page=3)
+        edge = second.object_list[1]
+        page = keyset_page(
+            self.orders, "creation_date", before=encode_cursor(edge.creation_date, edge.pk), per_page=3
+        )
+        self.assertEqual(list(page), first.object_list[1:] + second.object_list[:1])
+        self.assertTrue(page.has_previous())
+        self.assertTrue(page.has_next())
+
+    def test_malformed_cursor_starts_over(self):
+        self.assertEqual(
+            list(keyset_page(self.orders, "creation_date", after="not-a-cursor", per_page=3)),
+            list(keyset_page(self.orders, "creation_date", per_page=3)),
+        )
+
+
+class SerialUpdateTests(TempReportCacheMixin, TestCase):
+    """
+    Heat number edits from the order details page, validated row by row
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.user = User.objects.create_user("edit-assembler")
+        # Serials 1 and 2 completed, 3 and 4 pending; serial 4 is missing its housing heat number
+        self.order = seed_order("EDIT-0001", "25", 4, self.user)
+        self.model = OrderDetails_25_Series
+        self.serials = list(self.model.objects.filter(order_no=self.order).order_by("serial_index"))
+        self.model.objects.filter(pk=self.serials[3].pk).update(housing_heat_no=None)
+
+    def serial(self, index):
+        return self.model.objects.get(order_no=self.order, serial_index=index)
+
+    def test_parse_row_edits(self):
+        pk = self.serials[2].pk
+        data = {
+            f"housing_heat_no-{pk}": " HB 1 ", f"yoke_heat_no-{pk}": "", f"bogus-{pk}": "x",
+            "housing_heat_no": "no pk", "csrfmiddlewaretoken": "token",
+        }
+        self.assertEqual(
+            parse_row_edits(data, self.model.HEAT_FIELDS), {pk: {"housing_heat_no": "HB 1", "yoke_heat_no": ""}}
+        )
+
+    def test_invalid_rows_are_left_untouched(self):
+        other = seed_order("EDIT-0002", "25", 1, self.user)
+        other_serial = self.model.objects.get(order_no=other)
+        third, fourth = self.serials[2], self.serials[3]
+        edits = {
+            third.pk: {"housing_heat_no": "H" * 101, "yoke_heat_no": "HB-NEW"},
+            fourth.pk: {"housing_heat_no": "HB-NEW"},
+            other_serial.pk: {"housing_heat_no": "HB-NEW"},
+        }
+        report = save_serial_edits(self.order, edits, self.user, submit_ids=[third.pk])
+        self.assertEqual(report["errors"], {
+            third.actuator_serial_no: ["Housing heat no is longer than 100 characters."],
+            f"#{other_serial.pk}": ["Serial does not belong to this order."],
+        })
+        self.assertEqual((report["saved"], report["completed"]), (1, 0))
+
+        # A rejected row keeps every old value and is not submitted
+        third.refresh_from_db()
+        self.assertEqual((third.yoke_heat_no, third.assembler_status), (self.serials[2].yoke_heat_no, "pending"))
+        self.assertEqual(self.serial(4).housing_heat_no, "HB-NEW")
+        self.assertEqual(
+            self.model.objects.get(pk=other_serial.pk).housing_heat_no, other_serial.housing_heat_no
+        )
+
+    def test_value_errors(self):
+        self.assertEqual(
+            heat_value_errors(self.model, {"housing_heat_no": 7, "bogus": "x", "yoke_heat_no": "HB"}),
+            ["Housing heat no must be text.", "Unknown field 'bogus'."],
+        )
+
+    def test_submit_requires_every_heat_number(self):
+        fourth = self.serials[3]
+        report = save_serial_edits(self.order, {}, self.user, submit_ids=[fourth.pk])
+        self.assertEqual(report["errors"], {fourth.actuator_serial_no: ["All heat numbers required!"]})
+        self.assertEqual(report["completed"], 0)
+
+        # submit_all completes what it can and counts the rest
+        report = save_serial_edits(self.order, {}, self.user, submit_all=True)
+        self.assertEqual((report["completed"], report["incomplete"], report["errors"]), (1, 1, {}))
+        self.assertEqual(self.serial(3).assembler_status, "completed")
+        self.assertEqual(self.serial(4).assembler_status, "pending")
+
+    def fill(self, first, last, overwrite=False):
+        return fill_heat_numbers(self.order, "housing_heat_no", " hb-fill ", first, last, overwrite=overwrite)
+
+    def housing_heat_nos(self):
+        serials = self.model.objects.filter(order_no=self.order).order_by("serial_index")
+        return list(serials.values_list("housing_heat_no", flat=True))
+
+    def test_fill_range_keeps_filled_serials(self):
+        self.model.objects.filter(pk=self.serials[2].pk).update(housing_heat_no="")
+        old = self.serials[1].housing_heat_no
+        self.assertEqual(self.fill(2, 4), (2, 1))
+        self.assertEqual(self.housing_heat_nos(), [self.serials[0].housing_heat_no, old, "hb-fill", "hb-fill"])
+        self.assertEqual(
+            set(HeatNumberTrace.objects.filter(heat_no="HB-FILL").values_list("serial_id", flat=True)),
+            {self.serials[2].pk, self.serials[3].pk},
+        )
+
+    def test_fill_range_overwrite(self):
+        self.model.objects.filter(pk=self.serials[3].pk).update(housing_heat_no="HB-OLD")
+        self.assertEqual(self.fill(3, 4, overwrite=True), (2, 0))
+        self.assertEqual(self.housing_heat_nos()[2:], ["hb-fill", "hb-fill"])
+        self.assertEqual(HeatNumberTrace.objects.filter(heat_no="HB-FILL").count(), 2)
+        self.assertFalse(HeatNumberTrace.objects.filter(heat_no="HB-OLD").exists())
+
+    def test_fill_range_skips_completed_serials(self):
+        # Serials 1 and 2 are completed; their reported heat numbers stay as they are
+        self.model.objects.filter(pk=self.serials[1].pk).update(housing_heat_no="")
+        for overwrite in (False, True):
+            with self.subTest(overwrite=overwrite):
+                self.assertEqual(self.fill(1, 4, overwrite=overwrite), (2, 2) if overwrite else (1, 3))
+                self.assertEqual(self.housing_heat_nos()[:2], [self.serials[0].housing_heat_no, ""])
+        traces = HeatNumberTrace.objects.filter(serial_id__in=[self.serials[0].pk, self.serials[1].pk])
+        self.assertFalse(traces.filter(heat_no="HB-FILL").exists())
+        self.assertTrue(traces.filter(heat_no=normalise_heat_no(self.serials[0].housing_heat_no)).exists())
+
+    def test_fill_selected_serials(self):
+        ids = [self.serials[0].pk, self.serials[3].pk]
+        self.assertEqual(fill_heat_numbers(self.order, "housing_heat_no", "HB-FILL", ids=ids), (1, 1))
+        self.assertEqual(self.serial(4).housing_heat_no, "HB-FILL")
+
+    def test_fill_rejects_invalid_input(self):
+        for kwargs in (
+            {"field": "bogus", "value": "HB", "first": 1, "last": 2},
+            {"field": "housing_heat_no", "value": "  ", "first": 1, "last": 2},
+            {"field": "housing_heat_no", "value": "H" * 101, "first": 1, "last": 2},
+            {"field": "housing_heat_no", "value": "HB", "first": 3, "last": 2},
+            {"field": "housing_heat_no", "value": "HB", "first": 0, "last": 2},
+            {"field": "housing_heat_no", "value": "HB"},
+        ):
+            with self.subTest(**kwargs), self.assertRaises(ValueError):
+                fill_heat_numbers(self.order, **kwargs)
+        self.assertEqual(self.housing_heat_nos(), [serial.housing_heat_no for serial in self.serials[:3]] + [None])
+
+
+class HeatTraceSyncTests(TempReportCacheMixin, TestCase):
+    """
+    Saving or deleting a serial keeps its heat number traces in step
+    """
+
+    def setUp(self):
+        super().setUp()
+        user = User.objects.create_user("trace-assembler")
+        self.orders = [seed_order(f"TRACE-{series}", series, 2, user) for series in SERIES_DETAIL_MODELS]
+
+    def traces(self, serial):
+        return dict(
+            HeatNumberTrace.objects.filter(series=serial.order_no.series, serial_id=serial.pk)
+            .values_list("component", "heat_no")
+        )
+
+    def test_serial_save(self):
+        for order in self.orders:
+            model = SERIES_DETAIL_MODELS[order.series]
+            first, second = model.HEAT_FIELDS[:2]
+            serial = model.objects.select_related("order_no").filter(order_no=order).first()
+            with self.subTest(series=order.series):
+                setattr(serial, first, f"  hb {order.series}00 ")
+                setattr(serial, second, "")
+                serial.save()
+                traces = self.traces(serial)
+                self.assertEqual(traces[first], f"HB {order.series}00")
+                self.assertNotIn(second, traces)
+                self.assertEqual(len(traces), len(model.HEAT_FIELDS) - 1)
+                found = search_heat_traces(f"hb {order.series}00")
+                self.assertEqual([row["actuator_serial_no"] for row in found], [serial.actuator_serial_no])
+
+    def test_serial_delete(self):
+        for order in self.orders:
+            model = SERIES_DETAIL_MODELS[order.series]
+            serial, other = model.objects.select_related("order_no").filter(order_no=order).order_by("serial_index")
+            with self.subTest(series=order.series):
+                serial.delete()
+                self.assertEqual(self.traces(serial), {})
+                self.assertEqual(len(self.traces(other)), len(model.HEAT_FIELDS))
+
+    def test_order_delete(self):
+        for order in self.orders:
+            order.delete()
+        self.assertFalse(HeatNumberTrace.objects.exists())
+
+
+class ReportCacheTests(TempReportCacheMixin, TestCase):
+    """
+    Reports are served from the disk cache and revalidated by fingerprint
+    """
+
+    def setUp(self):
+        super().setUp()
+        user = User.objects.create_user("cache-assembler")
+        self.order = seed_order("CACHE-0001", "25", 2, user)
+        self.url = reverse("print_order_report", args=[self.order.order_no])
+        self.client.force_login(user)
+
+    def get(self, **headers):
+        """
+        (response, body) of the order's print report
+        """
+        response = self.client.get(self.url, **headers)
+        body = b"".join(response.streaming_content) if response.streaming else response.content
+        return response, body
+
+    def cached_files(self):
+        return sorted(path.name for path in Path(settings.REPORT_CACHE_DIR).iterdir())
+
+    def test_not_modified(self):
+        response, _ = self.get()
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("private", response["Cache-Control"])
+        self.assertIn("no-cache", response["Cache-Control"])
+        etag = response["ETag"]
+
+        with patch("manufacturing.views.assembly_views.iter_order_report_html") as render:
+            response, _ = self.get(HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(response.status_code, 304)
+            self.assertEqual(response["ETag"], etag)
+            # A client without the report gets the cached file
+            response, body = self.get()
+            self.assertEqual(response.status_code, 200)
+            self.assertIn(self.order.order_no.encode(), body)
+        render.assert_not_called()
+        self.assertEqual(len(self.cached_files()), 1)
+
+    def test_edit_changes_fingerprint(self):
+        etag = self.get()[0]["ETag"]
+        serial = OrderDetails_25_Series.objects.filter(order_no=self.order).first()
+        serial.housing_heat_no = "HB-EDITED"
+        serial.save()
+
+        response, body = self.get(HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+        self.assertIn(b"HB-EDITED", body)
+        # The stale file stays until evicted
+        self.assertEqual(len(self.cached_files()), 2)
+
+    def test_least_recently_used_are_evicted(self):
+        def render(fileobj):
+            fileobj.write(b"x" * 100)
+
+        def path(kind):
+            return cached_report_path(self.order, kind, 1, render, ".txt", fingerprint="f")
+
+        with override_settings(REPORT_CACHE_MAX_BYTES=250):
+            first, second = path("first"), path("second")
+            now = time.time()
+            os.utime(first, (now - 20, now - 20))
+            os.utime(second, (now - 10, now - 10))
+            self.assertEqual(path("first"), first)  # a hit marks it recently used
+            path("third")
+        self.assertEqual(self.cached_files(), [first.name, f"third-{self.order.pk}-f.txt"])
+
+    def test_order_delete_drops_its_files(self):
+        self.get()
+        self.assertEqual(len(self.cached_files()), 1)
+        self.order.delete()
+        self.assertEqual(self.cached_files(), [])
+
+
+class DashboardInvalidationTests(TempReportCacheMixin, TestCase):
+    """
+    Writes that change what dashboards show start new cache generations; heat number edits do not
+    """
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.user = User.objects.create_user("dashboard-assembler")
+        self.order = seed_order("DASH-0001", "25", 2, self.user)
+        self.serial = OrderDetails_25_Series.objects.filter(order_no=self.order).order_by("serial_index").last()
+        self.computations = 0
+
+    def compute(self):
+        self.computations += 1
+        return self.computations
+
+    def cached(self, namespaces):
+        """
+        Number of times the cached value had been computed when it was stored
+        """
+        return cached_dashboard_data("test_view", [], self.compute, namespaces)
+
+    def assertInvalidates(self, write, expected):
+        """
+        After ``write`` commits, each namespace in ``expected`` is recomputed if its value is true
+        """
+        before = {namespace: self.cached([namespace]) for namespace in expected}
+        with self.captureOnCommitCallbacks(execute=True):
+            write()
+        for namespace, invalidated in expected.items():
+            with self.subTest(namespace=namespace):
+                self.assertEqual(self.cached([namespace]) != before[namespace], invalidated)
+
+    def test_cached_until_invalidated(self):
+        self.assertEqual(self.cached([ORDERS]), 1)
+        self.assertEqual(self.cached([ORDERS]), 1)
+        with self.captureOnCommitCallbacks(execute=True):
+            invalidate_dashboards()
+        self.assertEqual(self.cached([ORDERS]), 2)
+
+    def test_order_save(self):
+        def write():
+            self.order.order_status = "under_testing"
+            self.order.save()
+        self.assertInvalidates(write, {ORDERS: True, order_namespace("DASH-0001"): True})
+
+    def test_heat_number_save(self):
+        def write():
+            self.serial.housing_heat_no = "HB-DASH"
+            self.serial.save(update_fields=["housing_heat_no", "updated_at"])
+        self.assertInvalidates(write, {ORDERS: False, order_namespace("DASH-0001"): False})
+
+    def test_full_serial_save(self):
+        def write():
+            self.serial.assembler_name = self.user
+            self.serial.save()
+        self.assertInvalidates(write, {ORDERS: True, order_namespace("DASH-0001"): True})
+
+    def test_completed_serials(self):
+        def write():
+            complete_serials(OrderDetails_25_Series, [self.serial.pk], self.user)
+        self.assertInvalidates(write, {ORDERS: True, order_namespace("DASH-0001"): True})
+
+    def test_bulk_heat_number_edits(self):
+        def write():
+            save_serial_edits(self.order, {self.serial.pk: {"housing_heat_no": "HB-DASH"}}, self.user)
+            fill_heat_numbers(self.order, "yoke_heat_no", "HB-DASH", 1, 2, overwrite=True)
+        self.assertInvalidates(write, {ORDERS: False, order_namespace("DASH-0001"): False})
+
+    def test_rebuild_progress(self):
+        self.assertInvalidates(rebuild_progress, {order_namespace("OTHER-ORDER"): True})
+
+
+class SerialApiTests(TempReportCacheMixin, TestCase):
+    """
+    Error paths and access checks of the serial JSON API
+    """
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.user = User.objects.create_user("api-assembler")
+        self.order = seed_order("API-0001", "25", 2, self.user)
+        self.serial = OrderDetails_25_Series.objects.filter(order_no=self.order).order_by("serial_index").last()
+        self.patch_url = reverse("serial_patch_api", args=["25", self.serial.pk])
+        self.submit_url = reverse("serial_submit_api", args=["25"])
+        self.client.force_login(self.user)
+
+    def patch(self, body, url=None):
+        return self.client.patch(url or self.patch_url, data=body, content_type="application/json")
+
+    def submit(self, body, url=None):
+        return self.client.post(url or self.submit_url, data=body, content_type="application/json")
+
+    def test_patch(self):
+        response = self.patch({"housing_heat_no": " hb-api "})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {"id": self.serial.pk, "values": {"housing_heat_no": "hb-api"}})
+        self.assertTrue(HeatNumberTrace.objects.filter(serial_id=self.serial.pk, heat_no="HB-API").exists())
+
+    def test_patch_statements(self):
+        # One UPDATE of the serial, then the traces of the patched field are rewritten
+        with CaptureQueriesContext(connection) as queries:
+            self.assertTrue(patch_serial(OrderDetails_25_Series, self.serial.pk, {"housing_heat_no": "HB-API"}))
+        statements = [
+            query["sql"].split()[0] for query in queries if "SAVEPOINT" not in query["sql"]
+        ]
+        self.assertEqual(statements, ["UPDATE", "DELETE", "SELECT", "INSERT"])
+
+    def test_bad_requests(self):
+        for body in ("not json", "[]", {}, {"housing_heat_no": "H" * 101}, {"bogus": "HB"}, {"housing_heat_no": 7}):
+            with self.subTest(patch=body):
+                response = self.patch(body)
+                self.assertEqual(response.status_code, 400)
+                self.assertTrue(response.json()["errors"])
+        for body in ("not json", {}, {"ids": []}, {"ids": self.serial.pk}, {"ids": [str(self.serial.pk)]}):
+            with self.subTest(submit=body):
+                response = self.submit(body)
+                self.assertEqual(response.status_code, 400)
+                self.assertIn("ids", response.json()["errors"])
+        self.serial.refresh_from_db()
+        self.assertEqual(self.serial.assembler_status, "pending")
+
+    def test_not_found(self):
+        missing = OrderDetails_25_Series.objects.order_by("-pk").first().pk + 1
+        response = self.patch({"housing_heat_no": "HB"}, reverse("serial_patch_api", args=["25", missing]))
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(response.json(), {"errors": ["Serial not found."]})
+        self.assertEqual(
+            self.patch({"body": "HB"}, reverse("serial_patch_api", args=["99", self.serial.pk])).status_code, 404
+        )
+        self.assertEqual(self.submit({"ids": [1]}, reverse("serial_submit_api", args=["99"])).status_code, 404)
+
+        # Unknown ids are reported per serial; the others are still completed
+        response = self.submit({"ids": [self.serial.pk, missing]})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["errors"], {str(missing): "Serial not found."})
+        self.assertEqual(response.json()["completed"], 1)
+
+    def test_method_not_allowed(self):
+        self.assertEqual(self.client.get(self.patch_url).status_code, 405)
+        self.assertEqual(self.client.post(self.patch_url).status_code, 405)
+        self.assertEqual(self.client.get(self.submit_url).status_code, 405)
+        self.assertEqual(self.client.patch(self.submit_url).status_code, 405)
+
+    def test_other_roles_cannot_edit(self):
+        Profile.objects.filter(user=self.user).update(role="Tester")
+        cache.clear()
+        response = self.patch({"housing_heat_no": "HB-DENIED"})
+        self.assertEqual(response.status_code, 403)
+        self.assertEqual(self.submit({"ids": [self.serial.pk]}).status_code, 403)
+        self.client.post(
+            reverse("assembler_order_details", args=[self.order.order_no]),
+            {f"housing_heat_no-{self.serial.pk}": "HB-DENIED", "submit_all": "1"},
+        )
+        self.client.post(
+            reverse("assembler_dashboard"),
+            {"order_detail_id": self.serial.pk, "series": "25", "housing_heat_no": "HB-DENIED", "save": "1"},
+        )
+        self.serial.refresh_from_db()
+        self.assertNotEqual(self.serial.housing_heat_no, "HB-DENIED")
+        self.assertEqual(self.serial.assembler_status, "pending")
+
+        # Staff may edit whatever their role
+        User.objects.filter(pk=self.user.pk).update(is_staff=True)
+        cache.clear()
+        self.assertEqual(self.patch({"housing_heat_no": "HB-STAFF"}).status_code, 200)
+
+
+class AssemblerOrderDetailsTests(TempReportCacheMixin, TestCase):
+    """
+    The order details page lists serials by their number
+    """
+
+    def test_serials_in_numeric_order(self):
+        user = User.objects.create_user("details-assembler")
+        order = seed_order("DETAILS-1", "21", 0, user)
+        # Created last-first so the page can't rely on insertion order
+        OrderDetails_21_Series.objects.bulk_create(reversed(build_serials(order, 12)))
+        self.client.force_login(user)
+        response = self.client.get(reverse("assembler_order_details", args=[order.order_no]))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [serial.actuator_serial_no for serial in response.context["actuators"]],
+            [f"DETAILS-1-{n}" for n in range(1, 13)],
+        )
+        content = response.content.decode()
+        positions = [content.index(f">DETAILS-1-{n}<") for n in range(1, 13)]
+        self.assertEqual(positions, sorted(positions))
+
+
+class QuantityRollupTests(TestCase):
+    """
+    Order quantity rollups match the orders they group
+    """
+
+    def test_rollup(self):
+        MainActuator.objects.bulk_create(
+            MainActuator(
+                order_no=f"ROLL-{i}", sales_order_no="SO-ROLL", series=series, branch=branch,
+                creation_date=timezone.now(), order_qty=qty,
+                total_qty=qty, completed_qty=done, pending_qty=qty - done,
+            )
+            for i, (series, branch, qty, done) in enumerate([
+                ("25", "Pune", 10, 4), ("25", "Pune", 5, 5), ("21", "Pune", 30, 0), ("21", "Nashik", 1, 1),
+            ])
+        )
+        self.assertEqual(list(quantity_rollup("branch")), [
+            {"branch": "Pune", "orders": 3, "order_qty": 45, "total_qty": 45, "completed_qty": 9, "pending_qty": 36},
+            {"branch": "Nashik", "orders": 1, "order_qty": 1, "total_qty": 1, "completed_qty": 1, "pending_qty": 0},
+        ])
+        by_series = quantity_rollup("series", MainActuator.objects.filter(branch="Pune"))
+        self.assertEqual([(row["series"], row["order_qty"]) for row in by_series], [("21", 30), ("25", 15)])
+        with self.assertRaises(ValueError):
+            quantity_rollup("order_no")
+
+
+class MigrationTests(TransactionTestCase):
+    """
+    Data migrations, run forwards from the schema just before them
+    """
+
+    def migrate(self, target):
+        """
+        Migrate manufacturing to ``target`` and return the app registry of that state
+        """
+        executor = MigrationExecutor(connection)
+        executor.migrate([("manufacturing", target)])
+        return executor.loader.project_state([("manufacturing", target)]).apps
+
+    def tearDown(self):
+        executor = MigrationExecutor(connection)
+        executor.migrate(executor.loader.graph.leaf_nodes())
+        super().tearDown()
+
+    def test_order_qty_normalised_to_integers(self):
+        # (stored order_qty, total_qty, order_qty after 0014); bad values fall back to total_qty
+        rows = [
+            (" 7 ", 99, 7), ("12", 99, 12), ("abc", 3, 3), ("", 4, 4), ("-2", 5, 5), ("\uff13", 6, 6), ("2.5", -1, 0),
+        ]
+        MainActuator = self.migrate("0012_hot_path_indexes").get_model("manufacturing", "MainActuator")
+        MainActuator.objects.bulk_create(
+            MainActuator(order_no=f"QTY-{i}", order_qty=value, total_qty=total, creation_date=timezone.now())
+            for i, (value, total, _) in enumerate(rows)
+        )
+
+        with redirect_stdout(io.StringIO()) as output:
+            apps = self.migrate("0014_mainactuator_order_qty_integer")
+        MainActuator = apps.get_model("manufacturing", "MainActuator")
+        self.assertEqual(
+            dict(MainActuator.objects.values_list("order_no", "order_qty")),
+            {f"QTY-{i}": qty for i, (_, _, qty) in enumerate(rows)},
+        )
+        self.assertIn("5 orders had an unparseable order_qty", output.getvalue())
+
+    def test_serial_index_backfill(self):
+        apps = self.migrate("0009_mainactuator_assembly_tab_indexes")
+        order = apps.get_model("manufacturing", "MainActuator").objects.create(
+            order_no="ORD-2", order_qty="12", creation_date=timezone.now()
+        )
+        # Inserted out of order, so neither the pk nor the text order is the serial order
+        serial_nos = [f"ORD-2-{n}" for n in (10, 2, 12, 1, 9, 11, 3, 8, 4, 7, 5, 6)]
+        serial_nos += ["OLD-ORD-13", "unnumbered"]
+        Serial = apps.get_model("manufacturing", "OrderDetails_25_Series")
+        Serial.objects.bulk_create(Serial(order_no=order, actuator_serial_no=serial_no) for serial_no in serial_nos)
+
+        Serial = self.migrate("0010_serial_index").get_model("manufacturing", "OrderDetails_25_Series")
+        self.assertEqual(
+            list(Serial.objects.order_by("serial_index").values_list("actuator_serial_no", "serial_index")),
+            [("unnumbered", 0), *((f"ORD-2-{n}", n) for n in range(1, 13)), ("OLD-ORD-13", 13)],
+        )
+
+
+class ProgressTests(TempReportCacheMixin, TestCase):
+    """
+    An order's progress counters always match its serials
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.user = User.objects.create_user("progress-assembler")
+        # Four serials, the first two completed
+        self.order = seed_order("PROGRESS-1", "21", 4, self.user)
+        self.model = OrderDetails_21_Series
+        self.serials = list(self.model.objects.filter(order_no=self.order).order_by("serial_index"))
+
+    def assertProgress(self, total, completed, pending):
+        self.order.refresh_from_db()
+        counters = (self.order.total_qty, self.order.completed_qty, self.order.pending_qty)
+        self.assertEqual(counters, (total, completed, pending))
+        serials = self.model.objects.filter(order_no=self.order)
+        self.assertEqual(
+            (serials.count(), serials.filter(assembler_status="completed").count()), (total, completed)
+        )
+
+    def test_complete_serials(self):
+        pending = [serial.pk for serial in self.serials[2:]]
+        # An already completed serial in the list is not counted again
+        self.assertEqual(complete_serials(self.model, [self.serials[0].pk, pending[0]], self.user), 1)
+        self.assertProgress(4, 3, 1)
+        self.assertEqual(complete_serials(self.model, pending, self.user), 1)
+        self.assertProgress(4, 4, 0)
+
+    def test_double_submit(self):
+        pending = [serial.pk for serial in self.serials[2:]]
+        self.assertEqual(complete_serials(self.model, pending, self.user), 2)
+        self.assertEqual(complete_serials(self.model, pending, self.user), 0)
+        self.assertEqual(submit_serials(self.model, pending, self.user)["completed"], 0)
+        self.assertProgress(4, 4, 0)
+
+    def test_serial_delete(self):
+        self.serials[0].delete()
+        self.assertProgress(3, 1, 2)
+        self.model.objects.filter(pk=self.serials[3].pk).delete()
+        self.assertProgress(2, 1, 1)
+
+    def test_rebuild_progress_repairs_drift(self):
+        other = seed_order("PROGRESS-2", "25", 2, self.user)
+        MainActuator.objects.filter(pk__in=[self.order.pk, other.pk]).update(
+            total_qty=9, completed_qty=9, pending_qty=0
+        )
+        # Bypasses the counters
+        self.model.objects.filter(pk=self.serials[3].pk).update(assembler_status="completed")
+
+        self.assertEqual(rebuild_progress(MainActuator.objects.filter(pk=self.order.pk)), 1)
+        self.assertProgress(4, 3, 1)
+        other.refresh_from_db()
+        self.assertEqual(other.total_qty, 9)
+
+        rebuild_progress()
+        other.refresh_from_db()
+        self.assertEqual((other.total_qty, other.completed_qty, other.pending_qty), (2, 1, 1))
+
+
+class AssemblerDashboardTests(TempReportCacheMixin, TestCase):
+    """
+    The assembler dashboard tabs: material text, totals and the user's own orders
+    """
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.user = User.objects.create_user("dashboard-assembler")
+        self.client.force_login(self.user)
+
+    def test_material_skips_empty_parts(self):
+        full = seed_order("MATERIAL-1", "21", 2, self.user)
+        MainActuator.objects.filter(pk=full.pk).update(
+            type="DA", size="25", cylinder_size="4", spring_size=None, moc="CS"
+        )
+        seed_order("MATERIAL-2", "25", 2, self.user)
+        response = self.client.get(reverse("assembler_dashboard"))
+        self.assertEqual(
+            {order.order_no: order.material for order in response.context["orders_under_assembly"]},
+            {"MATERIAL-1": "21, DA, 25, 4, CS", "MATERIAL-2": "25"},
+        )
+
+    def test_tab_totals(self):
+        seed_order("TOTAL-1", "21", 2, self.user)
+        seed_order("TOTAL-2", "25", 4, self.user)
+        done = seed_order("TOTAL-3", "25", 2, self.user)
+        serials = OrderDetails_25_Series.objects.filter(order_no=done).values_list("pk", flat=True)
+        complete_serials(OrderDetails_25_Series, list(serials), self.user)
+        # No serial tables for this series: on neither tab
+        MainActuator.objects.create(
+            order_no="TOTAL-4", sales_order_no="SO-TOTAL-4", customer="Budget Customer", series="30",
+            item_code="ITEM-BUDGET", order_qty=1, order_status="under_assembly", creation_date=timezone.now(),
+        )
+        response = self.client.get(reverse("assembler_dashboard"))
+        self.assertEqual(response.context["orders_under_assembly"].total, 2)
+        self.assertEqual(response.context["completed_orders"].total, 1)
+
+    def my_order_nos(self, user, **params):
+        self.client.force_login(user)
+        my_orders = self.client.get(reverse("assembler_dashboard"), params).context["my_orders"]
+        return [order.order_no for order in my_orders], my_orders
+
+    def test_my_orders_are_the_users_own(self):
+        other = User.objects.create_user("other-assembler")
+        seed_order("MINE-1", "21", 4, self.user)
+        seed_order("MINE-2", "25", 4, self.user)
+        seed_order("THEIRS-1", "25", 4, other)
+        # Nobody has completed a serial on this one yet
+        seed_order("NOBODY-1", "21", 1, self.user)
+        done = seed_order("DONE-1", "21", 2, self.user)
+        OrderDetails_21_Series.objects.filter(order_no=done).update(assembler_name=self.user)
+        MainActuator.objects.filter(pk=done.pk).update(completed_qty=2, pending_qty=0)
+
+        order_nos, my_orders = self.my_order_nos(self.user)
+        self.assertEqual(sorted(order_nos), ["MINE-1", "MINE-2"])
+        self.assertEqual(my_orders.total, 2)
+        order_nos, my_orders = self.my_order_nos(other)
+        self.assertEqual(order_nos, ["THEIRS-1"])
+        self.assertEqual(my_orders.total, 1)
+
+    @patch("manufacturing.views.assembly_views.ASSEMBLER_PAGE_SIZE", 2)
+    def test_my_orders_pages(self):
+        for n in range(5):
+            seed_order(f"PAGED-{n}", "21", 2, self.user)
+        seen, my_orders = self.my_order_nos(self.user)
+        while my_orders.has_next():
+            order_nos, my_orders = self.my_order_nos(self.user, tab="my-orders", my_after=my_orders.next_cursor)
+            seen += order_nos
+        self.assertEqual(sorted(seen), [f"PAGED-{n}" for n in range(5)])
+        self.assertEqual(my_orders.total, 5)
+
+
+class QueryBudgetTests(TempReportCacheMixin, TestCase):
+    """
+    Every manufacturing view runs a fixed number of queries, whether an order
+    has one serial unit or a thousand; only bulk inserts may take more INSERT
+    batches on SQLite (see insert_batches). Requests start with the session,
+    user and role cached, as they are in production, and nothing else cached.
+    """
+    SIZES = (1, 1000)
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user("budget-assembler", is_staff=True)
+        cls.orders = [
+            seed_order(f"BUDGET-{series}-{qty}", series, qty, cls.user)
+            for series in SERIES_DETAIL_MODELS
+            for qty in cls.SIZES
+        ]
+
+    def setUp(self):
+        super().setUp()
+        self.client.force_login(self.user)
+
+    def assertQueryBudget(self, budget, url, method="get", **kwargs):
+        # A first request loads the session, user and role into the cache
+        cache.clear()
+        self.client.get(reverse("tester_dashboard"))
+        with self.assertNumQueries(budget):
+            response = getattr(self.client, method)(url, **kwargs)
+            if response.streaming:
+                b"".join(response.streaming_content)
+        self.assertLess(response.status_code, 400, url)
+        return response
+
+    def assertOrderBudget(self, budget, url_name, method="get", data=None, inserts=None):
+        """
+        ``budget`` for ``url_name`` of every seeded order; ``data(order, model)``
+        returns the POST data, and ``inserts(order, model)`` the INSERT
+        statements the request runs on top of its first one
+        """
+        for order in self.orders:
+            model = SERIES_DETAIL_MODELS[order.series]
+            with self.subTest(series=order.series, qty=order.order_qty):
+                kwargs = {} if data is None else {"data": data(order, model)}
+                extra = 0 if inserts is None else inserts(order, model) - 1
+                self.assertQueryBudget(budget + extra, reverse(url_name, args=[order.order_no]), method, **kwargs)
+
+    def pending_serials(self, order):
+        model = SERIES_DETAIL_MODELS[order.series]
+        return model.objects.filter(order_no=order, assembler_status="pending").order_by("serial_index")
+
+    # ----------------------------------------------------------------
+    #   Assembly engineer
+    # ----------------------------------------------------------------
+    def test_assembly_engineer_dashboard(self):
+        url = reverse("assembly_engineer_dashboard")
+        # Totals come from the order count summary; search results are only counted on request
+        for query, budget in [
+            ("", 2), ("?status=under_assembly", 2), ("?sort=customer&order=asc", 2),
+            ("?search=budget", 1), ("?search=budget&count=exact", 2),
+        ]:
+            with self.subTest(query=query):
+                self.assertQueryBudget(budget, url + query)
+
+    def test_order_search_autocomplete(self):
+        self.assertQueryBudget(1, reverse("order_search_autocomplete") + "?q=BUDGET")
+
+    def test_create_order(self):
+        for series in SERIES_DETAIL_MODELS:
+            for qty in self.SIZES:
+                with self.subTest(series=series, qty=qty):
+                    model = SERIES_DETAIL_MODELS[series]
+                    payload = {
+                        "order_no": f"NEW-{series}-{qty}", "sales_order_no": "SO-NEW", "series": series,
+                        "order_qty": qty, "creation_date": "2024-01-15T08:00:00Z",
+                    }
+                    self.assertQueryBudget(
+                        8 + insert_batches(model, qty), reverse("assembly_engineer_dashboard"), "post",
+                        data={"actuator_data": json.dumps(payload)},
+                    )
+                    self.assertEqual(model.objects.filter(order_no__order_no=payload["order_no"]).count(), qty)
+
+    def test_import_orders(self):
+        for series in SERIES_DETAIL_MODELS:
+            for qty in self.SIZES:
+                with self.subTest(series=series, qty=qty):
+                    upload = SimpleUploadedFile(
+                        "orders.csv",
+                        f"Order No,Sales Order No,Series,Order Qty,Creation Date\n"
+                        f"IMP-{series}-{qty},SO-IMP,{series},{qty},2024-01-15\n".encode(),
+                    )
+                    model = SERIES_DETAIL_MODELS[series]
+                    self.assertQueryBudget(
+                        8 + insert_batches(model, qty, batch_size=1000),
+                        reverse("assembly_engineer_dashboard"), "post", data={"order_file": upload},
+                    )
+                    self.assertEqual(model.objects.filter(order_no__order_no=f"IMP-{series}-{qty}").count(), qty)
+
+    # ----------------------------------------------------------------
+    #   Assembler
+    # ----------------------------------------------------------------
+    def test_assembler_dashboard(self):
+        self.assertQueryBudget(7, reverse("assembler_dashboard"))
+
+    def test_assembler_dashboard_save_and_submit(self):
+        for order in self.orders:
+            model = SERIES_DETAIL_MODELS[order.series]
+            serial = self.pending_serials(order).first()
+            with self.subTest(series=order.series, qty=order.order_qty):
+                values = {field: getattr(serial, field) for field in model.HEAT_FIELDS}
+                data = {"order_detail_id": serial.pk, "series": order.series, **values}
+                self.assertQueryBudget(7, reverse("assembler_dashboard"), "post", data={**data, "save": "1"})
+                self.assertQueryBudget(7, reverse("assembler_dashboard"), "post", data={**data, "submit": "1"})
+
+    def test_assembler_order_details(self):
+        self.assertOrderBudget(2, "assembler_order_details")
+
+    def test_assembler_order_details_save_and_submit_all(self):
+        def data(order, model):
+            serial = model.objects.filter(order_no=order).order_by("serial_index").first()
+            return {f"{model.HEAT_FIELDS[0]}-{serial.pk}": "HB-EDIT", "submit_all": "1"}
+        self.assertOrderBudget(16, "assembler_order_details", "post", data)
+        for order in self.orders:
+            self.assertFalse(self.pending_serials(order).exists())
+
+    def test_assembler_order_details_fill_range(self):
+        def data(order, model):
+            return {
+                "fill_range": "1", "fill_field": model.HEAT_FIELDS[0], "fill_value": "HB-FILL",
+                "fill_from": "1", "fill_to": str(order.order_qty), "fill_overwrite": "1",
+            }
+        def inserts(order, model):
+            return insert_batches(HeatNumberTrace, order.order_qty)
+        self.assertOrderBudget(10, "assembler_order_details", "post", data, inserts)
+        for order in self.orders:
+            model = SERIES_DETAIL_MODELS[order.series]
+            filled = model.objects.filter(order_no=order, **{model.HEAT_FIELDS[0]: "HB-FILL"})
+            # Completed serials keep their heat numbers
+            self.assertEqual(set(filled), set(self.pending_serials(order)))
+
+    def test_serial_patch_api(self):
+        for order in self.orders:
+            model = SERIES_DETAIL_MODELS[order.series]
+            serial = model.objects.filter(order_no=order).first()
+            with self.subTest(series=order.series, qty=order.order_qty):
+                self.assertQueryBudget(
+                    8, reverse("serial_patch_api", args=[order.series, serial.pk]), "patch",
+                    data={model.HEAT_FIELDS[0]: "HB-PATCH"}, content_type="application/json",
+                )
+
+    def test_serial_submit_api(self):
+        for order in self.orders:
+            ids = list(self.pending_serials(order).values_list("pk", flat=True))
+            with self.subTest(series=order.series, qty=order.order_qty):
+                response = self.assertQueryBudget(
+                    8, reverse("serial_submit_api", args=[order.series]), "post",
+                    data={"ids": ids}, content_type="application/json",
+                )
+                self.assertEqual(response.json()["errors"], {})
+                self.assertFalse(self.pending_serials(order).exists())
+
+    def test_order_progress_api(self):
+        self.assertOrderBudget(1, "order_progress_api")
+
+    def test_order_rollup_api(self):
+        for query in ["?by=customer", "?by=branch&status=pending"]:
+            with self.subTest(query=query):
+                self.assertQueryBudget(1, reverse("order_rollup_api") + query)
+
+    def test_stats_apis(self):
+        self.assertQueryBudget(0, reverse("dashboard_cache_stats_api"))
+        self.assertQueryBudget(0, reverse("db_connection_stats_api"))
+
+    # ----------------------------------------------------------------
+    #   Reports and traceability
+    # ----------------------------------------------------------------
+    def test_generate_heat_report(self):
+        self.assertOrderBudget(3, "generate_heat_report")
+
+    def test_print_order_report(self):
+        self.assertOrderBudget(3, "print_order_report")
+
+    def test_export_heat_reports(self):
+        for order in self.orders:
+            with self.subTest(series=order.series, qty=order.order_qty):
+                self.assertQueryBudget(5, reverse("export_heat_reports") + f"?order_no={order.order_no}")
+
+    def test_heat_trace_views(self):
+        for order in self.orders:
+            model = SERIES_DETAIL_MODELS[order.series]
+            heat_no = f"HB{order.pk}-{model.HEAT_FIELDS[0][:3]}"
+            for url_name in ["heat_trace_search", "heat_trace_api", "heat_trace_export"]:
+                with self.subTest(url_name, series=order.series, qty=order.order_qty):
+                    self.assertQueryBudget(1, reverse(url_name) + f"?q={heat_no}")
+
+    # ----------------------------------------------------------------
+    #   Stage dashboards
+    # ----------------------------------------------------------------
+    def test_stage_dashboards(self):
+        for url_name in [
+            "tester_dashboard", "painting_engineer_dashboard", "painter_dashboard", "blaster_dashboard",
+            "name_plate_printer_dashboard", "finisher_dashboard", "qa_engineer_dashboard",
+        ]:
+            with self.subTest(url_name):
+                self.assertQueryBudget(0, reverse(url_name))
+
+
+@skipUnless(settings.DATABASE_REPLICA_ALIASES, "set DATABASE_REPLICAS to a second alias of the database")
+class ReplicaRoutingTests(TempReportCacheMixin, TransactionTestCase):
+    """
+    Dashboard and report reads go to the replica unless the user just wrote.
+    Run with e.g. DATABASE_ENGINE=sqlite DATABASE_REPLICAS=db.sqlite3; not a
+    TestCase, since reads inside its transaction stay on the primary.
+    """
+    databases = {DEFAULT_DB_ALIAS, *settings.DATABASE_REPLICA_ALIASES}
+
+    def setUp(self):
+        super().setUp()
+        self.user = seed_orders(orders=4, serials=4)
+        self.order = MainActuator.objects.filter(series="25").latest("created_at")
+        # Also drops the recent-invalidation markers that send reads to the primary
+        cache.clear()
+        self.client.force_login(self.user)
+
+    def get(self, url):
+        """
+        (response, queries on the primary, queries on the replicas)
+        """
+        replicas = [CaptureQueriesContext(connections[alias]) for alias in settings.DATABASE_REPLICA_ALIASES]
+        with CaptureQueriesContext(connection) as primary:
+            for capture in replicas:
+                capture.__enter__()
+            try:
+                response = self.client.get(url)
+                if getattr(response, "streaming", False):
+                    b"".join(response.streaming_content)
+            finally:
+                for capture in replicas:
+                    capture.__exit__(None, None, None)
+        self.assertEqual(response.status_code, 200, url)
+        return response, len(primary), sum(len(capture) for capture in replicas)
+
+    def test_dashboards_and_reports_read_from_replica(self):
+        for url in (
+            reverse("assembler_dashboard"),
+            reverse("assembler_order_details", args=[self.order.order_no]),
+            reverse("print_order_report", args=[self.order.order_no]),
+            f"{reverse('heat_trace_export')}?q=H1",
+        ):
+            response, _, replica_queries = self.get(url)
+            self.assertGreater(replica_queries, 0, url)
+            self.assertNotIn(PIN_COOKIE, response.cookies)
+
+    def test_write_pins_the_user_to_primary(self):
+        serial = OrderDetails_25_Series.objects.filter(order_no=self.order).first()
+        response = self.client.patch(
+            reverse("serial_patch_api", args=["25", serial.pk]),
+            data={"housing_heat_no": "HX-1"},
+            content_type="application/json",
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(PIN_COOKIE, response.cookies)
+
+        _, primary_queries, replica_queries = self.get(
+            reverse("assembler_order_details", args=[self.order.order_no])
+        )
+        self.assertEqual(replica_queries, 0)
+        self.assertGreater(primary_queries, 0)
+
+    def test_other_views_read_from_primary(self):
+        _, _, replica_queries = self.get(reverse("tester_dashboard"))
+        self.assertEqual(replica_queries, 0)
@@ -0,0 +1,101 @@
+"""
+Heat number traceability across both serial tables.
+
+Every non-empty component heat number of a serial is mirrored into
+HeatNumberTrace as (heat_no, component, serial, order), with heat numbers
+normalised so "hl 123 " and "HL 123" match. A recall lookup is then a single
+indexed query on heat_no instead of OR-ing eleven unindexed columns over two
+tables. Traces are rebuilt for exactly the serials and components that every
+write path touches.
+"""
+from django.db import transaction
+
+from .models import HeatNumberTrace, SERIES_DETAIL_MODELS
+
+
+SYNC_BATCH_SIZE = 2000
+
+# Heat numbers shorter than this are only matched exactly
+MIN_PREFIX_LENGTH = 3
+
+
+def normalise_heat_no(value):
+    return " ".join(str(value).split()).upper() if value else ""
+
+
+def _series_of(model):
+    for series, detail_model in SERIES_DETAIL_MODELS.items():
+        if detail_model is model:
+            return series
+    raise ValueError(f"{model.__name__} is not a serial model")
+
+
+def sync_heat_traces(model, serials=None, fields=None):
+    """
+    Rebuild the traces of ``serials`` (a queryset of ``model``; default all) for
+    ``fields`` (default every heat field). Returns the number of traces written.
+    """
+    series = _series_of(model)
+    fields = list(fields or model.HEAT_FIELDS)
+
+    stale = HeatNumberTrace.objects.filter(series=series, component__in=fields)
+    if serials is None:
+        serials = model.objects.all()
+    else:
+        stale = stale.filter(serial_id__in=serials.values("pk"))
+
+    written = 0
+    with transaction.atomic():
+        stale.delete()
+
+        batch = []
+        rows = serials.values_list("pk", "order_no_id", "actuator_serial_no", *fields)
+        for pk, order_id, serial_no, *values in rows.iterator(chunk_size=SYNC_BATCH_SIZE):
+            for field, value in zip(fields, values):
+                heat_no = normalise_heat_no(value)
+                if heat_no:
+                    batch.append(HeatNumberTrace(
+                        heat_no=heat_no,
+                        component=field,
+                        series=series,
+                        serial_id=pk,
+                        actuator_serial_no=serial_no,
+                        order_id=order_id,
+                    ))
+            if len(batch) >= SYNC_BATCH_SIZE:
+                HeatNumberTrace.objects.bulk_create(batch)
+                written += len(batch)
+                batch = []
+        if batch:
+            HeatNumberTrace.objects.bulk_create(batch)
+            written += len(batch)
+
+    return written
+
+
+def search_heat_traces(query):
+    """
+    Serials that used heat number ``query`` (or, from MIN_PREFIX_LENGTH characters,
+    any heat number starting with it), with their order and customer
+    """
+    heat_no = normalise_heat_no(query)
+    if not heat_no:
+        return HeatNumberTrace.objects.none()
+
+    traces = HeatNumberTrace.objects.all()
+    if len(heat_no) >= MIN_PREFIX_LENGTH:
+        traces = traces.filter(heat_no__startswith=heat_no)
+    else:
+        traces = traces.filter(heat_no=heat_no)
+
+    return traces.order_by("heat_no", "order_id", "actuator_serial_no").values(
+        "heat_no",
+        "component",
+        "series",
+        "actuator_serial_no",
+        "order__order_no",
+        "order__sales_order_no",
+        "order__customer",
+        "order__item_code",
+        "order__order_status",
+    )
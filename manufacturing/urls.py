@@ -4,11 +4,22 @@ from .views import assembly_views, testing_views, painting_views, finishing_view
 urlpatterns = [
     # Assembly URLs
     path('dashboard/assembly_engineer/', assembly_views.assembly_engineer_dashboard, name='assembly_engineer_dashboard'),
+    path('dashboard/assembly_engineer/search/', assembly_views.order_search_autocomplete, name='order_search_autocomplete'),
     path('dashboard/assembler/', assembly_views.assembler_dashboard, name='assembler_dashboard'),
     path('assembler/', assembly_views.assembler_dashboard, name='assembler_dashboard'),
     path('assembler/order/<str:order_no>/', assembly_views.assembler_order_details, name='assembler_order_details'),
     path('assembler/print-report/<str:order_no>/', assembly_views.print_order_report, name='print_order_report'),
+    path('api/serials/<str:series>/<int:pk>/', assembly_views.serial_patch_api, name='serial_patch_api'),
+    path('api/serials/<str:series>/submit/', assembly_views.serial_submit_api, name='serial_submit_api'),
+    path('api/orders/rollup/', assembly_views.order_rollup_api, name='order_rollup_api'),
+    path('api/dashboard-cache/stats/', assembly_views.dashboard_cache_stats_api, name='dashboard_cache_stats_api'),
+    path('api/db-connections/stats/', assembly_views.db_connection_stats_api, name='db_connection_stats_api'),
+    path('api/orders/<str:order_no>/progress/', assembly_views.order_progress_api, name='order_progress_api'),
     path("heat-report/<str:order_no>/", assembly_views.generate_heat_report, name="generate_heat_report"),
+    path("heat-reports/export/", assembly_views.export_heat_reports, name="export_heat_reports"),
+    path("heat-trace/", assembly_views.heat_trace_search, name="heat_trace_search"),
+    path("heat-trace/export/", assembly_views.heat_trace_export, name="heat_trace_export"),
+    path("api/heat-trace/", assembly_views.heat_trace_api, name="heat_trace_api"),
     
     # Testing URLs
     path('dashboard/tester/', testing_views.tester_dashboard, name='tester_dashboard'),
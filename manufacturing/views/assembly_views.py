@@ -1,27 +1,64 @@
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
-from django.db import models
-from django.db.models import IntegerField, Q
-from django.db.models.functions import Cast, Substr
-from django.http import HttpResponse
-from django.core.paginator import Paginator, EmptyPage, PageNotAnInteger
-from datetime import datetime
+from django.db import models, transaction
+from django.db.models import Case, Exists, OuterRef, Q, Value, When
+from django.db.models.functions import Concat
+from django.http import Http404, JsonResponse, StreamingHttpResponse
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+from django.views.decorators.http import require_GET, require_http_methods, require_POST
+import csv
 import json
-
-from ..models import MainActuator, OrderDetails_25_Series, OrderDetails_21_Series
-
-from reportlab.platypus import Table, TableStyle
-from reportlab.lib import colors
-from reportlab.lib.pagesizes import A4, landscape
-from reportlab.pdfgen import canvas
-from reportlab.lib.units import cm
+import re
+
+from accounts.roles import can_edit_serials
+from ReportManagement.db.metrics import connection_stats
+from ReportManagement.db.router import read_from_replica
+
+from ..dashboard_cache import cache_stats, cached_dashboard_data, order_namespace
+from ..models import MainActuator, OrderDetails_25_Series, OrderDetails_21_Series, SERIES_DETAIL_MODELS
+from ..order_counts import order_count
+from ..order_import import build_serials, get_field, import_orders, parse_quantity
+from ..pagination import keyset_page
+from ..progress import complete_serials
+from ..report_cache import cached_report_response
+from ..report_export import iter_heat_report_zip, select_export_orders
+from ..reports import (
+    HEAT_REPORT_COLUMNS, HEAT_REPORT_VERSION, ORDER_REPORT_VERSION, iter_order_report_html,
+    render_heat_report,
+)
+from ..rollups import ROLLUP_FIELDS, quantity_rollup
+from ..search import AUTOCOMPLETE_LIMIT, MIN_QUERY_LENGTH, filter_orders, search_orders
+from ..serial_updates import (
+    fill_heat_numbers, heat_value_errors, parse_row_edits, patch_serial, save_serial_edits,
+    submit_serials,
+)
+from ..traceability import search_heat_traces
+
+
+# Sort keys accepted by the order list; each has a (column, id) index on MainActuator
+ORDER_LIST_SORT_FIELDS = (
+    'created_at', 'creation_date', 'order_no', 'sales_order_no',
+    'customer', 'item_code', 'order_qty', 'order_status',
+)
+
+# Rows shown on the heat trace page and the default/maximum of the JSON API;
+# the CSV export has no limit
+HEAT_TRACE_PAGE_LIMIT = 500
+HEAT_TRACE_API_MAX_LIMIT = 5000
+
+HEAT_TRACE_CSV_HEADER = (
+    'Heat No', 'Component', 'Series', 'Actuator Serial No', 'Order No',
+    'Sales Order No', 'Customer', 'Item Code', 'Order Status',
+)
 
 
 # ================================================================
 #   ASSEMBLY ENGINEER – QR INSERT LOGIC
 # ================================================================
 @login_required
+@read_from_replica
 def assembly_engineer_dashboard(request):
     """
     Accepts POSTed JSON in 'actuator_data' (hidden input).
@@ -29,13 +66,17 @@ def assembly_engineer_dashboard(request):
     """
 
     if request.method == "POST":
+        # Bulk upload of an ERP export
+        if request.FILES.get("order_file"):
+            return _import_order_file(request)
+
         # parse posted actuator JSON
         raw = request.POST.get("actuator_data", "") or request.POST.dict()
         data = None
         try:
             # If actuator_data is a JSON string, parse it
             if isinstance(raw, str) and raw.strip():
-                data = json.loads(raw)  # <-- This line needs 'import json'
+                data = json.loads(raw)
             elif isinstance(raw, dict):
                 # some browsers may send form dict; try to extract known keys
                 data = {k: v for k, v in raw.items()}
@@ -45,16 +86,10 @@ def assembly_engineer_dashboard(request):
             messages.error(request, f"Invalid actuator data JSON: {e}")
             return redirect("assembly_engineer_dashboard")
 
-        # Normalize keys - prefer snake_case keys expected by the form
-        def get(d, *keys):
-            for k in keys:
-                if k in d and d[k] not in (None, ""):
-                    return d[k]
-            return ""
-
-        order_no = get(data, "order_no", "order no", "orderno")
-        sales_order_no = get(data, "sales_order_no", "sales order no", "salesorder")
-        order_qty = get(data, "order_qty", "order qty", "qty", "quantity") or "1"
+        # Normalize keys - same aliases the bulk import accepts
+        order_no = get_field(data, "order_no")
+        sales_order_no = get_field(data, "sales_order_no")
+        order_qty = get_field(data, "order_qty") or "1"
 
         if not order_no or not sales_order_no:
             messages.error(request, "Order No and Sales Order No are required.")
@@ -65,56 +100,44 @@ def assembly_engineer_dashboard(request):
             messages.error(request, f"Order {order_no} already exists.")
             return redirect("assembly_engineer_dashboard")
 
-        # Create MainActuator record (fill missing keys with empty string)
-        try:
-            actuator = MainActuator.objects.create(
-                sales_order_no = sales_order_no,
-                order_no = order_no,
-                line_item = get(data, "line_item", "line item"),
-                order_qty = order_qty,
-                series = get(data, "series"),
-                type = get(data, "type"),
-                size = get(data, "size"),
-                cylinder_size = get(data, "cylinder_size", "cylinder size"),
-                spring_size = get(data, "spring_size", "spring size"),
-                moc = get(data, "moc"),
-                customer = get(data, "customer"),
-                item_code = get(data, "item_code", "item code"),
-                creation_date = get(data, "creation_date"),
-                branch = get(data, "branch"),
-                order_status = "under_assembly"
-            )
-        except Exception as e:
-            messages.error(request, f"Failed to create actuator: {e}")
+        series = get_field(data, "series")
+        if series not in SERIES_DETAIL_MODELS:
+            # Series is required - show error if not specified
+            messages.error(request, "Series must be either '21' or '25'")
             return redirect("assembly_engineer_dashboard")
 
-        # Create OrderDetails serials based on series
-        try:
-            qty = int(order_qty)
-        except:
-            qty = 1
+        # Serial units to create based on series
+        qty = parse_quantity(order_qty)
+        if qty is None:
+            messages.error(request, f"Invalid order quantity '{order_qty}'")
+            return redirect("assembly_engineer_dashboard")
 
-        series = get(data, "series")
-        
-        if series == "25":
-            # Create OrderDetails_25_Series entries
-            order_details = [
-                OrderDetails_25_Series(order_no=actuator, actuator_serial_no=f"{order_no}-{i}")
-                for i in range(1, qty + 1)
-            ]
-            OrderDetails_25_Series.objects.bulk_create(order_details)
-        elif series == "21":
-            # Create OrderDetails_21_Series entries with auto-generated actuator_serial_no
-            order_details = []
-            for i in range(1, qty + 1):
-                actuator_serial_no = f"{order_no}-{i}"
-                order_details.append(
-                    OrderDetails_21_Series(order_no=actuator, actuator_serial_no=actuator_serial_no)
+        # Create MainActuator record (fill missing keys with empty string)
+        # and its serials together so the progress counters match the serials
+        try:
+            with transaction.atomic():
+                actuator = MainActuator.objects.create(
+                    sales_order_no = sales_order_no,
+                    order_no = order_no,
+                    line_item = get_field(data, "line_item"),
+                    order_qty = qty,
+                    series = series,
+                    type = get_field(data, "type"),
+                    size = get_field(data, "size"),
+                    cylinder_size = get_field(data, "cylinder_size"),
+                    spring_size = get_field(data, "spring_size"),
+                    moc = get_field(data, "moc"),
+                    customer = get_field(data, "customer"),
+                    item_code = get_field(data, "item_code"),
+                    creation_date = get_field(data, "creation_date"),
+                    branch = get_field(data, "branch"),
+                    order_status = "under_assembly",
+                    total_qty = qty,
+                    pending_qty = qty,
                 )
-            OrderDetails_21_Series.objects.bulk_create(order_details)
-        else:
-            # Series is required - show error if not specified
-            messages.error(request, "Series must be either '21' or '25'")
+                SERIES_DETAIL_MODELS[series].objects.bulk_create(build_serials(actuator, qty))
+        except Exception as e:
+            messages.error(request, f"Failed to create actuator: {e}")
             return redirect("assembly_engineer_dashboard")
 
         messages.success(request, f"Added order {order_no} • Created {qty} serial units")
@@ -126,44 +149,55 @@ def assembly_engineer_dashboard(request):
     status_filter = request.GET.get('status', '')
     sort_by = request.GET.get('sort', 'created_at')
     sort_order = request.GET.get('order', 'desc')
-    page = request.GET.get('page', 1)
-    
-    # Start with all actuators
-    actuators_queryset = MainActuator.objects.all()
-    
-    # Apply search filter
-    if search_query:
-        actuators_queryset = actuators_queryset.filter(
-            Q(order_no__icontains=search_query) |
-            Q(sales_order_no__icontains=search_query) |
-            Q(customer__icontains=search_query) |
-            Q(item_code__icontains=search_query)
+    if sort_by not in ORDER_LIST_SORT_FIELDS:
+        sort_by = 'created_at'
+    after = request.GET.get('after')
+    before = request.GET.get('before')
+    exact_count = request.GET.get('count') == 'exact'
+
+    def load_page():
+        # Start with all actuators
+        actuators_queryset = MainActuator.objects.all()
+
+        # Apply search filter (trigram-indexed on Postgres)
+        if search_query:
+            actuators_queryset = filter_orders(actuators_queryset, search_query)
+
+        # Apply status filter
+        if status_filter:
+            actuators_queryset = actuators_queryset.filter(order_status=status_filter)
+
+        # Keyset pagination on (sort column, id) - no OFFSET, no COUNT(*)
+        page = keyset_page(
+            actuators_queryset,
+            sort_by,
+            descending=(sort_order == 'desc'),
+            after=after,
+            before=before,
+            per_page=20,
         )
-    
-    # Apply status filter
-    if status_filter:
-        actuators_queryset = actuators_queryset.filter(order_status=status_filter)
-    
-    # Apply sorting
-    if sort_order == 'desc':
-        sort_by = f'-{sort_by}'
-    actuators_queryset = actuators_queryset.order_by(sort_by)
-    
-    # Pagination
-    paginator = Paginator(actuators_queryset, 20)  # 20 items per page
-    try:
-        actuators = paginator.page(page)
-    except PageNotAnInteger:
-        actuators = paginator.page(1)
-    except EmptyPage:
-        actuators = paginator.page(paginator.num_pages)
+
+        # Totals come from the order count summary unless a search is applied;
+        # counting search results is opt-in
+        if not search_query:
+            page.total = order_count(order_status=status_filter) if status_filter else order_count()
+        elif exact_count:
+            page.total = actuators_queryset.count()
+        return page
+
+    # One cache entry per filter/sort/cursor combination (see manufacturing/dashboard_cache.py)
+    actuators = cached_dashboard_data(
+        "engineer_orders",
+        [search_query, status_filter, sort_by, sort_order, after, before, exact_count],
+        load_page,
+    )
     
     # Prepare context for template
     context = {
         'actuators': actuators,
         'search_query': search_query,
         'status_filter': status_filter,
-        'sort_by': sort_by.lstrip('-'),
+        'sort_by': sort_by,
         'sort_order': sort_order,
         'status_choices': MainActuator.STATUS_CHOICES,
     }
@@ -171,14 +205,72 @@ def assembly_engineer_dashboard(request):
     return render(request, "dashboards/assembly_engineer_dashboard.html", context)
 
 
+@login_required
+@read_from_replica
+def order_search_autocomplete(request):
+    """
+    Ranked order suggestions for the dashboard search box (JSON)
+    """
+    query = request.GET.get("q", "").strip()
+    if len(query) < MIN_QUERY_LENGTH:
+        return JsonResponse({"results": []})
+
+    results = search_orders(MainActuator.objects.all(), query).values(
+        "order_no", "sales_order_no", "customer", "item_code"
+    )[:AUTOCOMPLETE_LIMIT]
+    return JsonResponse({"results": list(results)})
+
+
+# Per-row errors shown after an upload; the rest are summarised
+MAX_IMPORT_ERRORS_SHOWN = 20
+
+
+def _import_order_file(request):
+    """
+    Bulk-create orders and serials from an uploaded CSV/XLSX export
+    """
+    upload = request.FILES["order_file"]
+    dry_run = bool(request.POST.get("dry_run"))
+
+    try:
+        report = import_orders(upload, upload.name, dry_run=dry_run)
+    except Exception as e:
+        messages.error(request, f"Failed to import {upload.name}: {e}")
+        return redirect("assembly_engineer_dashboard")
+
+    verb = "Validated" if dry_run else "Imported"
+    messages.success(
+        request,
+        f"{verb} {report['created_orders']} of {report['rows']} orders "
+        f"• {report['created_serials']} serial units",
+    )
+    for error in report["errors"][:MAX_IMPORT_ERRORS_SHOWN]:
+        messages.error(request, f"Row {error['row']} ({error['order_no'] or '-'}): {' '.join(error['errors'])}")
+    hidden = len(report["errors"]) - MAX_IMPORT_ERRORS_SHOWN
+    if hidden > 0:
+        messages.error(request, f"...and {hidden} more rows with errors")
+
+    return redirect("assembly_engineer_dashboard")
+
+
 # ================================================================
 #   ASSEMBLER DASHBOARD
 # ================================================================
+# Orders per page on each assembler dashboard tab
+ASSEMBLER_PAGE_SIZE = 25
+
+SERIAL_EDIT_DENIED = "Only assembly staff can record heat numbers or complete serials."
+
+
 @login_required
+@read_from_replica
 def assembler_dashboard(request):
 
     # Handle POST requests for save/submit operations
     if request.method == "POST":
+        if not can_edit_serials(request.user):
+            messages.error(request, SERIAL_EDIT_DENIED)
+            return redirect("assembler_dashboard")
         try:
             order_detail_id = request.POST.get("order_detail_id")
             series = request.POST.get("series")
@@ -212,7 +304,8 @@ def assembler_dashboard(request):
                     for f in fields:
                         setattr(detail, f, request.POST.get(f, ""))
                 
-                detail.save()
+                # Heat numbers only: cached dashboards are left alone (manufacturing.signals)
+                detail.save(update_fields=[*fields, "updated_at"])
                 messages.success(request, f"{series} Series details saved.")
             
             elif "submit" in request.POST:
@@ -243,9 +336,7 @@ def assembler_dashboard(request):
                         messages.error(request, "All fields required for 21 Series!")
                         return redirect("assembler_dashboard")
                 
-                detail.assembler_status = "completed"
-                detail.assembler_name = request.user
-                detail.save()
+                complete_serials(type(detail), [detail.pk], request.user)
                 messages.success(request, f"{series} Series actuator marked completed.")
                 
         except Exception as e:
@@ -253,317 +344,401 @@ def assembler_dashboard(request):
         
         return redirect("assembler_dashboard")
 
-    # Get all orders with assembly status for both series
-    all_assembly_orders = MainActuator.objects.filter(
-        models.Q(series="25") | models.Q(series="21")
-    ).annotate(
-        total_qty=models.Case(
-            models.When(series="25", then=models.Count("order_details_25")),
-            models.When(series="21", then=models.Count("order_details_21")),
-            default=0,
-            output_field=IntegerField()
-        ),
-        completed_qty=models.Case(
-            models.When(
-                series="25",
-                then=models.Count(
-                    "order_details_25",
-                    filter=models.Q(order_details_25__assembler_status="completed")
-                )
-            ),
-            models.When(
-                series="21",
-                then=models.Count(
-                    "order_details_21",
-                    filter=models.Q(order_details_21__assembler_status="completed")
-                )
-            ),
-            default=0,
-            output_field=IntegerField()
-        )
+    cursors = [
+        request.GET.get(key)
+        for key in ("assembly_after", "assembly_before", "completed_after", "completed_before")
+    ]
+    lists = cached_dashboard_data("assembler_orders", cursors, lambda: _assembler_order_lists(*cursors))
+
+    my_cursors = [request.GET.get("my_after"), request.GET.get("my_before")]
+    my_orders = cached_dashboard_data(
+        "assembler_my_orders",
+        [request.user.pk, *my_cursors],
+        lambda: _my_orders_page(request.user, *my_cursors),
     )
 
-    # Process all orders and categorize them
-    orders_under_assembly = []
-    completed_orders = []
-    
-    for order in all_assembly_orders:
-        # Calculate pending quantity
-        pending_qty = order.total_qty - order.completed_qty
-        
-        # Create material description
-        material = f"{order.series or ''}, {order.type or ''}, {order.size or ''}, {order.cylinder_size or ''}, {order.spring_size or ''}, {order.moc or ''}".strip(', ')
-        
-        # Add calculated fields to order object
-        order.pending_qty = pending_qty
-        order.material = material
-        
-        # Categorize orders based on pending quantity
-        if pending_qty > 0:
-            orders_under_assembly.append(order)
-        else:
-            completed_orders.append(order)
+    return render(request, "dashboards/assembler_dashboard.html", {
+        "my_orders": my_orders,
+        **lists,
+    })
 
-    # Get all orders for stats
-    all_orders = MainActuator.objects.all()
-    total_orders = all_orders.count()
-    
-    # Get current user's assigned orders from both tables
-    orders_25_assigned = OrderDetails_25_Series.objects.filter(
-        assembler_status__in=['pending', 'in_progress']
-    ).values_list('order_no__order_no', flat=True).distinct()
-    
-    orders_21_assigned = OrderDetails_21_Series.objects.filter(
-        assembler_status__in=['pending', 'in_progress']
-    ).values_list('order_no__order_no', flat=True).distinct()
-    
-    my_orders = list(orders_25_assigned) + list(orders_21_assigned)
-    my_orders = list(set(my_orders))  # Remove duplicates
-    my_assigned_orders = MainActuator.objects.filter(order_no__in=my_orders)
 
-    return render(request, "dashboards/assembler_dashboard.html", {
-        "total_orders": total_orders,
-        "my_orders": my_assigned_orders,
+
+def _material():
+    """
+    "series, type, size, cylinder size, spring size, moc" of an order, leaving
+    out empty parts and their separators
+    """
+    parts = ["series"]
+    for field in ("type", "size", "cylinder_size", "spring_size", "moc"):
+        parts.append(Case(
+            When(Q(**{field: ""}) | Q(**{f"{field}__isnull": True}), then=Value("")),
+            default=Concat(Value(", "), field),
+            output_field=models.CharField(),
+        ))
+    return Concat(*parts, output_field=models.CharField())
+
+
+def _assembler_order_lists(assembly_after, assembly_before, completed_after, completed_before):
+    """
+    One page each of the orders under assembly and fully assembled, with totals
+    """
+    # Orders with assembly status for both series, split in the database on the
+    # maintained progress counters (see manufacturing/progress.py) and paginated
+    # independently so a request only loads one page of each list
+    assembly_orders = MainActuator.objects.filter(
+        series__in=SERIES_DETAIL_MODELS
+    ).annotate(material=_material())
+    under_assembly_queryset = assembly_orders.filter(pending_qty__gt=0)
+    completed_queryset = assembly_orders.filter(pending_qty__lte=0)
+
+    orders_under_assembly = keyset_page(
+        under_assembly_queryset,
+        "created_at",
+        after=assembly_after,
+        before=assembly_before,
+        per_page=ASSEMBLER_PAGE_SIZE,
+    )
+    # Only orders of these series have serials, so pending_qty > 0 implies the
+    # series: one count over the partial index, the rest from the order counts
+    orders_under_assembly.total = MainActuator.objects.filter(pending_qty__gt=0).count()
+
+    completed_orders = keyset_page(
+        completed_queryset,
+        "created_at",
+        after=completed_after,
+        before=completed_before,
+        per_page=ASSEMBLER_PAGE_SIZE,
+    )
+    completed_orders.total = (
+        order_count(series__in=list(SERIES_DETAIL_MODELS)) - orders_under_assembly.total
+    )
+
+    return {
         "orders_under_assembly": orders_under_assembly,
         "completed_orders": completed_orders,
-    })
+        # Stats read the order count summary (see manufacturing/order_counts.py)
+        "total_orders": order_count(),
+    }
+
+
+def _my_orders_page(user, after, before):
+    """
+    One page, with total, of the orders still under assembly on which ``user``
+    has completed at least one serial (assembler_name is set on submit)
+    """
+    assigned = Q()
+    for model in SERIES_DETAIL_MODELS.values():
+        assigned |= Q(Exists(model.objects.filter(order_no=OuterRef("pk"), assembler_name=user)))
+    queryset = MainActuator.objects.filter(assigned, pending_qty__gt=0).annotate(material=_material())
+
+    my_orders = keyset_page(queryset, "created_at", after=after, before=before, per_page=ASSEMBLER_PAGE_SIZE)
+    my_orders.total = queryset.count()
+    return my_orders
 
 
 
 # ================================================================
 #   ASSEMBLER – ORDER DETAILS PAGE
 # ================================================================
+# Per-row errors listed after a whole-order save
+MAX_SERIAL_ERRORS_SHOWN = 20
+
+
 @login_required
+@read_from_replica
 def assembler_order_details(request, order_no):
 
     order = get_object_or_404(MainActuator, order_no=order_no)
 
-    # Check series to determine which table to query
-    if order.series == "25":
-        actuators = (
-            OrderDetails_25_Series.objects.filter(order_no=order)
-            .annotate(serial_num=Cast(Substr("actuator_serial_no",
-                                            len(order_no) + 2), IntegerField()))
-            .order_by("serial_num")
-        )
-    elif order.series == "21":
-        actuators = (
-            OrderDetails_21_Series.objects.filter(order_no=order)
-            .annotate(serial_num=Cast(Substr("actuator_serial_no",
-                                            len(order_no) + 2), IntegerField()))
-            .order_by("serial_num")
-        )
+    # Check series to determine which table to query; (order_no, serial_index) is indexed
+    model = SERIES_DETAIL_MODELS.get(order.series)
+    if model is not None:
+        actuators = model.objects.filter(order_no=order).order_by("serial_index")
     else:
         # Handle case where series is not specified
         actuators = []
 
     if request.method == "POST":
-        try:
-            pk = request.POST["order_detail_id"]
-            
-            # Get the detail based on series
-            if order.series == "25":
-                detail = OrderDetails_25_Series.objects.get(id=pk)
-            elif order.series == "21":
-                detail = OrderDetails_21_Series.objects.get(id=pk)
-            else:
-                messages.error(request, "Unknown series for this order")
-                return redirect("assembler_order_details", order_no=order_no)
-
-            if "save" in request.POST:
-                if order.series == "25":
-                    # Update heat numbers for 25 series
-                    fields = [
-                        'housing_heat_no', 'yoke_heat_no', 'top_cover_heat_no',
-                        'da_side_adaptor_plate_heat_no', 'spring_side_adaptor_heat_no',
-                        'da_side_end_plate_heat_no', 'spring_side_end_plate_heat_no'
-                    ]
-
-                    for f in fields:
-                        setattr(detail, f, request.POST.get(f, ""))
-
-                    detail.save()
-                    messages.success(request, "Heat numbers saved.")
-                elif order.series == "21":
-                    # Update specific fields for 21 series
-                    fields = ['body', 'end_cap_right', 'end_cap_left', 'pinion']
-                    
-                    for f in fields:
-                        setattr(detail, f, request.POST.get(f, ""))
-                    
-                    # Also update assembler name if provided
-                    if request.POST.get('assembler_name'):
-                        detail.assembler_name = request.user
-                    
-                    detail.save()
-                    messages.success(request, "21 Series details saved.")
-
-            if "submit" in request.POST:
-                if order.series == "25":
-                    # Validate all required heat numbers for 25 series
-                    required = [
-                        detail.housing_heat_no,
-                        detail.yoke_heat_no,
-                        detail.top_cover_heat_no,
-                        detail.da_side_adaptor_plate_heat_no,
-                        detail.spring_side_adaptor_heat_no,
-                        detail.da_side_end_plate_heat_no,
-                        detail.spring_side_end_plate_heat_no,
-                    ]
-
-                    if any(v in ["", None] for v in required):
-                        messages.error(request, "All heat numbers required!")
-                        return redirect("assembler_order_details", order_no=order_no)
-
-                    detail.assembler_status = "completed"
-                    detail.assembler_name = request.user
-                    detail.save()
-                    messages.success(request, "25 Series actuator marked completed.")
-                    
-                elif order.series == "21":
-                    # Validate required fields for 21 series
-                    required = [
-                        detail.body,
-                        detail.end_cap_right,
-                        detail.end_cap_left,
-                        detail.pinion,
-                    ]
+        if not can_edit_serials(request.user):
+            messages.error(request, SERIAL_EDIT_DENIED)
+            return redirect("assembler_order_details", order_no=order_no)
+        if model is None:
+            messages.error(request, "Unknown series for this order")
+            return redirect("assembler_order_details", order_no=order_no)
 
-                    if any(v in ["", None] for v in required):
-                        messages.error(request, "All fields are required!")
-                        return redirect("assembler_order_details", order_no=order_no)
+        if "fill_range" in request.POST:
+            _fill_heat_range(request, order)
+            return redirect("assembler_order_details", order_no=order_no)
 
-                    detail.assembler_status = "completed"
-                    detail.assembler_name = request.user
-                    detail.save()
-                    messages.success(request, "21 Series actuator marked completed.")
+        # One POST carries every edited row; a row's Submit button posts its id
+        edits = parse_row_edits(request.POST, model.HEAT_FIELDS)
+        submit_ids = [int(pk) for pk in request.POST.getlist("submit_row") if pk.isdigit()]
 
+        try:
+            report = save_serial_edits(
+                order, edits, request.user,
+                submit_ids=submit_ids,
+                submit_all="submit_all" in request.POST,
+            )
         except Exception as e:
             messages.error(request, f"Error: {e}")
+        else:
+            _report_serial_save(request, report)
 
         return redirect("assembler_order_details", order_no=order_no)
 
     return render(request, "dashboards/assembler_order_details.html", {
         "order": order,
         "actuators": actuators,
+        "heat_columns": HEAT_REPORT_COLUMNS.get(order.series, []),
     })
 
 
+def _fill_heat_range(request, order):
+    def serial_number(key):
+        value = request.POST.get(key, "").strip()
+        return int(value) if value.isdigit() else None
+
+    field = request.POST.get("fill_field", "")
+    try:
+        updated, skipped = fill_heat_numbers(
+            order,
+            field,
+            request.POST.get("fill_value", ""),
+            first=serial_number("fill_from"),
+            last=serial_number("fill_to"),
+            ids=[int(pk) for pk in request.POST.getlist("selected") if pk.isdigit()],
+            overwrite="fill_overwrite" in request.POST,
+        )
+    except ValueError as e:
+        messages.error(request, str(e))
+        return
+
+    label = dict(HEAT_REPORT_COLUMNS[order.series]).get(field, field)
+    messages.success(request, f"{label} filled on {updated} serials.")
+    if skipped:
+        messages.warning(
+            request, f"{skipped} serials were left unchanged: already completed or already had a {label}."
+        )
+
+
+def _report_serial_save(request, report):
+    if report["saved"]:
+        messages.success(request, f"Heat numbers saved for {report['saved']} serials.")
+    if report["completed"]:
+        messages.success(request, f"{report['completed']} actuators marked completed.")
+    if report["incomplete"]:
+        messages.warning(request, f"{report['incomplete']} pending serials still have missing heat numbers.")
+    if not (report["saved"] or report["completed"] or report["errors"]):
+        messages.info(request, "No changes to save.")
+
+    errors = list(report["errors"].items())
+    for serial_no, row_errors in errors[:MAX_SERIAL_ERRORS_SHOWN]:
+        messages.error(request, f"{serial_no}: {' '.join(row_errors)}")
+    hidden = len(errors) - MAX_SERIAL_ERRORS_SHOWN
+    if hidden > 0:
+        messages.error(request, f"...and {hidden} more serials with errors")
+
+
+
+# ================================================================
+#   ASSEMBLER – SERIAL JSON API
+# ================================================================
+def _serial_model(series):
+    model = SERIES_DETAIL_MODELS.get(series)
+    if model is None:
+        raise Http404("Unknown series")
+    return model
+
+
+def _json_object(request):
+    try:
+        data = json.loads(request.body or b"{}")
+    except (ValueError, UnicodeDecodeError):
+        return None
+    return data if isinstance(data, dict) else None
+
+
+@login_required
+@require_http_methods(["PATCH"])
+def serial_patch_api(request, series, pk):
+    """
+    Update heat numbers of one serial from a JSON {field: value} body
+    """
+    if not can_edit_serials(request.user):
+        return JsonResponse({"errors": [SERIAL_EDIT_DENIED]}, status=403)
+    model = _serial_model(series)
+    data = _json_object(request)
+    if not data:
+        return JsonResponse({"errors": ["Send a JSON object of heat numbers."]}, status=400)
+
+    values = {f: v.strip() if isinstance(v, str) else v for f, v in data.items()}
+    errors = heat_value_errors(model, values)
+    if errors:
+        return JsonResponse({"errors": errors}, status=400)
+
+    if not patch_serial(model, pk, values):
+        return JsonResponse({"errors": ["Serial not found."]}, status=404)
+    return JsonResponse({"id": pk, "values": values})
+
+
+@login_required
+@require_POST
+def serial_submit_api(request, series):
+    """
+    Mark the serials in a JSON {"ids": [...]} body completed.
+    Serials without an entry in "errors" are completed.
+    """
+    if not can_edit_serials(request.user):
+        return JsonResponse({"errors": {"user": SERIAL_EDIT_DENIED}}, status=403)
+    model = _serial_model(series)
+    data = _json_object(request) or {}
+    ids = data.get("ids")
+    if not ids or not isinstance(ids, list) or not all(isinstance(pk, int) for pk in ids):
+        return JsonResponse({"errors": {"ids": "Send a JSON list of serial ids."}}, status=400)
+
+    result = submit_serials(model, ids, request.user)
+    result["errors"] = {str(pk): error for pk, error in result["errors"].items()}
+    return JsonResponse(result)
+
+
+@login_required
+@require_GET
+@read_from_replica
+def order_progress_api(request, order_no):
+    """
+    Assembly progress counters of an order (JSON)
+    """
+    progress = cached_dashboard_data(
+        "order_progress",
+        [order_no],
+        lambda: (
+            MainActuator.objects.filter(order_no=order_no)
+            .values("order_no", "total_qty", "completed_qty", "pending_qty")
+            .first()
+        ),
+        namespaces=[order_namespace(order_no)],
+    )
+    if progress is None:
+        raise Http404("Order not found")
+    return JsonResponse(progress)
+
+
+@login_required
+@require_GET
+@read_from_replica
+def order_rollup_api(request):
+    """
+    Order quantities summed per branch, customer, order status or series (JSON);
+    ?by=<field>&status=<order status>
+    """
+    group_by = request.GET.get("by", "order_status")
+    if group_by not in ROLLUP_FIELDS:
+        return JsonResponse({"errors": [f"'by' must be one of {', '.join(ROLLUP_FIELDS)}."]}, status=400)
+
+    orders = MainActuator.objects.all()
+    status = request.GET.get("status", "").strip()
+    if status:
+        orders = orders.filter(order_status=status)
+
+    return JsonResponse({"by": group_by, "results": list(quantity_rollup(group_by, orders))})
+
+
+@login_required
+@require_GET
+def dashboard_cache_stats_api(request):
+    """
+    Hit/miss counters of the dashboard query cache (JSON, staff only)
+    """
+    if not request.user.is_staff:
+        return JsonResponse({"errors": ["Staff only."]}, status=403)
+    return JsonResponse({"views": cache_stats()})
+
+
+@login_required
+@require_GET
+def db_connection_stats_api(request):
+    """
+    Database connections opened and reused by the worker serving the request (JSON, staff only)
+    """
+    if not request.user.is_staff:
+        return JsonResponse({"errors": ["Staff only."]}, status=403)
+    return JsonResponse(connection_stats())
+
+
 
 # ================================================================
 #   HEAT REPORT – PDF GENERATION
 # ================================================================
 @login_required
+@read_from_replica
 def generate_heat_report(request, order_no):
-
+    """
+    Stream the multi-page heat annexure PDF for an order
+    """
     order = get_object_or_404(MainActuator, order_no=order_no)
-    
-    # Get items based on series
-    if order.series == "25":
-        items = OrderDetails_25_Series.objects.filter(order_no=order).order_by("actuator_serial_no")
-    elif order.series == "21":
-        items = OrderDetails_21_Series.objects.filter(order_no=order).order_by("actuator_serial_no")
-    else:
-        items = []
-
-    response = HttpResponse(content_type="application/pdf")
-    response["Content-Disposition"] = f'attachment; filename="Heat_Report_{order_no}.pdf"'
-
-    pdf = canvas.Canvas(response, pagesize=landscape(A4))
-    width, height = landscape(A4)
-
-    y = height - 1.5 * cm
-
-    # ------------------------------
-    # TITLE
-    # ------------------------------
-    pdf.setFont("Helvetica-Bold", 20)
-    pdf.drawCentredString(width / 2, y, "DELVAL FLOW CONTROLS PRIVATE LIMITED")
-    y -= 1.2 * cm
-
-    pdf.setFont("Helvetica-Bold", 14)
-    pdf.drawCentredString(width / 2, y, "HEAT ANNEXTURE - ACTUATOR")
-    y -= 1.5 * cm
-
-    # ------------------------------
-    # TOP TABLE
-    # ------------------------------
-    top_data = [
-        ["Item Code:", order.item_code, "Size:", f"{order.size}, {order.cylinder_size}, {order.spring_size or '-'}"],
-        ["Qty:", order.order_qty, "Date:", datetime.now().strftime("%d-%m-%Y")],
-        ["Customer:", order.customer, "SO Number:", order.sales_order_no],
-    ]
 
-    top_table = Table(top_data, colWidths=[3*cm, 7*cm, 3*cm, 7*cm])
-    top_table.setStyle(TableStyle([
-        ("FONTNAME", (0,0), (-1,-1), "Helvetica"),
-        ("FONTSIZE", (0,0), (-1,-1), 11),
-        ("ALIGN", (0,0), (-1,-1), "LEFT"),
-        ("BOTTOMPADDING", (0,0), (-1,-1), 6),
-    ]))
-
-    top_table.wrapOn(pdf, width, height)
-    top_table.drawOn(pdf, 1*cm, y-3*cm)
-
-    y -= 4*cm
-
-    # ------------------------------
-    # MAIN TABLE
-    # ------------------------------
-    headers = [
-        "Sr No", "Actuator Serial", "Housing Heat No", "Yoke Heat No",
-        "Top Cover", "DA Adaptor", "Spring Adaptor", "DA End Plate",
-        "Spring End Plate", "Assembler"
+    return cached_report_response(
+        request, order, "heat", HEAT_REPORT_VERSION,
+        render=lambda fileobj: render_heat_report(order, fileobj),
+        content_type="application/pdf",
+        ext=".pdf",
+        filename=f"Heat_Report_{order_no}.pdf",
+    )
+
+
+
+# ================================================================
+#   HEAT REPORT – BATCH ZIP EXPORT
+# ================================================================
+@login_required
+@read_from_replica
+def export_heat_reports(request):
+    """
+    Stream a ZIP of heat reports for the given order numbers, or for a
+    creation date range and/or order status
+    """
+    order_nos = [
+        order_no
+        for value in request.GET.getlist("order_no")
+        for order_no in re.split(r"[\s,]+", value)
+        if order_no
     ]
+    status = request.GET.get("status", "").strip()
+
+    errors = []
+    dates = {}
+    for key in ("date_from", "date_to"):
+        value = request.GET.get(key, "").strip()
+        try:
+            dates[key] = parse_date(value) if value else None
+        except ValueError:
+            dates[key] = None
+        if value and dates[key] is None:
+            errors.append(f"Invalid date '{value}'")
+
+    if status and status not in dict(MainActuator.STATUS_CHOICES):
+        errors.append(f"Unknown order status '{status}'")
+    if not (order_nos or dates["date_from"] or dates["date_to"] or status):
+        errors.append("Choose order numbers, a date range or a status to export.")
+
+    if errors:
+        for error in errors:
+            messages.error(request, error)
+        return redirect("assembly_engineer_dashboard")
+
+    orders = select_export_orders(order_nos=order_nos, status=status, **dates)
+    if not orders.exists():
+        messages.error(request, "No orders match the export filters.")
+        return redirect("assembly_engineer_dashboard")
 
-    assembler = request.user.get_full_name() or request.user.username
-
-    table_data = [headers]
-    for i, a in enumerate(items, start=1):
-        if order.series == "25":
-            table_data.append([
-                i,
-                a.actuator_serial_no,
-                a.housing_heat_no or "",
-                a.yoke_heat_no or "",
-                a.top_cover_heat_no or "",
-                a.da_side_adaptor_plate_heat_no or "",
-                a.spring_side_adaptor_heat_no or "",
-                a.da_side_end_plate_heat_no or "",
-                a.spring_side_end_plate_heat_no or "",
-                assembler
-            ])
-        elif order.series == "21":
-            table_data.append([
-                i,
-                a.actuator_serial_no,
-                a.body or "",
-                a.end_cap_right or "",
-                a.end_cap_left or "",
-                a.pinion or "",
-                "", "", "", "",  # Empty columns for heat number fields
-                assembler
-            ])
-
-    table = Table(table_data, repeatRows=1, colWidths=[1.5*cm] + [3*cm]*9)
-
-    table.setStyle(TableStyle([
-        ("GRID", (0,0), (-1,-1), 0.4, colors.black),
-        ("BACKGROUND", (0,0), (-1,0), colors.lightgrey),
-        ("FONTNAME", (0,0), (-1,0), "Helvetica-Bold"),
-        ("ALIGN", (0,0), (-1,0), "CENTER"),
-        ("FONTSIZE", (0,0), (-1,-1), 9),
-    ]))
-
-    table.wrapOn(pdf, width, height)
-
-    # Auto calculate table height
-    table_height = len(table_data) * 0.7 * cm
-
-    table.drawOn(pdf, 1*cm, y - table_height)
-
-    pdf.showPage()
-    pdf.save()
+    # Rendered in this process: a worker pool would be started per request
+    response = StreamingHttpResponse(iter_heat_report_zip(orders), content_type="application/zip")
+    response["Content-Disposition"] = (
+        f'attachment; filename="Heat_Reports_{timezone.localdate():%Y%m%d}.zip"'
+    )
+    return response
 
 
 
@@ -571,210 +746,121 @@ def generate_heat_report(request, order_no):
 #   ASSEMBLER – PRINT ORDER REPORT
 # ================================================================
 @login_required
+@read_from_replica
 def print_order_report(request, order_no):
     """
     Generate a horizontal, well-aligned print report for an order
     """
     order = get_object_or_404(MainActuator, order_no=order_no)
-    
-    # Get items based on series
-    if order.series == "25":
-        items = OrderDetails_25_Series.objects.filter(order_no=order).order_by("actuator_serial_no")
-    elif order.series == "21":
-        items = OrderDetails_21_Series.objects.filter(order_no=order).order_by("actuator_serial_no")
-    else:
-        items = []
 
-    response = HttpResponse(content_type="text/html")
-    
-    # Create HTML content for the report
-    html_content = f"""
-    <!DOCTYPE html>
-    <html>
-    <head>
-        <title>Order Report - {order.order_no}</title>
-        <style>
-            @page {{
-                size: landscape;
-                margin: 1cm;
-            }}
-            body {{
-                font-family: Arial, sans-serif;
-                font-size: 10px;
-                margin: 0;
-                padding: 0;
-            }}
-            .header {{
-                text-align: center;
-                margin-bottom: 20px;
-            }}
-            .company-name {{
-                font-size: 18px;
-                font-weight: bold;
-                margin-bottom: 5px;
-            }}
-            .report-title {{
-                font-size: 14px;
-                font-weight: bold;
-                margin-bottom: 20px;
-            }}
-            .order-info {{
-                margin-bottom: 20px;
-                display: flex;
-                justify-content: space-between;
-            }}
-            .info-item {{
-                margin-bottom: 5px;
-            }}
-            table {{
-                width: 100%;
-                border-collapse: collapse;
-                margin-bottom: 20px;
-            }}
-            th, td {{
-                border: 1px solid #000;
-                padding: 5px;
-                text-align: left;
-                vertical-align: top;
-            }}
-            th {{
-                background-color: #f2f2f2;
-                font-weight: bold;
-                white-space: nowrap;
-            }}
-            .sr-no {{
-                width: 5%;
-            }}
-            .serial-no {{
-                width: 10%;
-            }}
-            .field-col {{
-                width: 10%;
-            }}
-            .status-col {{
-                width: 8%;
-            }}
-            .assembler-col {{
-                width: 12%;
-            }}
-            .completed {{
-                background-color: #e8f5e8;
-            }}
-            @media print {{
-                body {{
-                    font-size: 9px;
-                }}
-            }}
-        </style>
-    </head>
-    <body>
-        <div class="header">
-            <div class="company-name">DELVAL FLOW CONTROLS PRIVATE LIMITED</div>
-            <div class="report-title">HEAT ANNEXTURE - ACTUATOR</div>
-        </div>
-        
-        <div class="order-info">
-            <div>
-                <div class="info-item"><strong>Item Code:</strong> {order.item_code}</div>
-                <div class="info-item"><strong>Size:</strong> {order.size}, {order.cylinder_size}, {order.spring_size or '-'}</div>
-                <div class="info-item"><strong>Qty:</strong> {order.order_qty}</div>
-            </div>
-            <div>
-                <div class="info-item"><strong>Date:</strong> {datetime.now().strftime("%d-%m-%Y")}</div>
-                <div class="info-item"><strong>Customer:</strong> {order.customer}</div>
-                <div class="info-item"><strong>SO Number:</strong> {order.sales_order_no}</div>
-            </div>
-        </div>
-        
-        <table>
-            <thead>
-                <tr>
-                    <th class="sr-no">Sr No</th>
-                    <th class="serial-no">Actuator Serial</th>
+    return cached_report_response(
+        request, order, "print", ORDER_REPORT_VERSION,
+        render=lambda fileobj: fileobj.writelines(
+            part.encode() for part in iter_order_report_html(order)
+        ),
+        content_type="text/html; charset=utf-8",
+        ext=".html",
+    )
+
+
+
+# ================================================================
+#   HEAT NUMBER TRACEABILITY
+# ================================================================
+def _component_labels():
+    return {
+        (series, field): heading
+        for series, columns in HEAT_REPORT_COLUMNS.items()
+        for field, heading in columns
+    }
+
+
+def _heat_trace_rows(traces):
+    labels = _component_labels()
+    for trace in traces:
+        trace["component_label"] = labels.get((trace["series"], trace["component"]), trace["component"])
+        yield trace
+
+
+@login_required
+@require_GET
+@read_from_replica
+def heat_trace_search(request):
     """
-    
-    # Add series-specific headers
-    if order.series == "25":
-        html_content += """
-                    <th class="field-col">Housing Heat No</th>
-                    <th class="field-col">Yoke Heat No</th>
-                    <th class="field-col">Top Cover Heat No</th>
-                    <th class="field-col">DA Side Adaptor</th>
-                    <th class="field-col">Spring Side Adaptor</th>
-                    <th class="field-col">DA End Plate</th>
-                    <th class="field-col">Spring End Plate</th>
-        """
-    elif order.series == "21":
-        html_content += """
-                    <th class="field-col">Body</th>
-                    <th class="field-col">End Cap Right</th>
-                    <th class="field-col">End Cap Left</th>
-                    <th class="field-col">Pinion</th>
-        """
-    
-    html_content += """
-                    <th class="status-col">Status</th>
-                    <th class="assembler-col">Assembler</th>
-                </tr>
-            </thead>
-            <tbody>
+    Find every serial, order and customer that used a heat number
     """
-    
-    # Add table rows
-    for i, item in enumerate(items, start=1):
-        status_class = "completed" if item.assembler_status == "completed" else ""
-        assembler_name = item.assembler_name.get_full_name() if item.assembler_name else ""
-        
-        html_content += f"""
-                <tr class="{status_class}">
-                    <td class="sr-no">{i}</td>
-                    <td class="serial-no">
-        """
-        
-        if order.series == "25":
-            html_content += f"""
-                        {item.actuator_serial_no}
-                    </td>
-                    <td class="field-col">{item.housing_heat_no or ""}</td>
-                    <td class="field-col">{item.yoke_heat_no or ""}</td>
-                    <td class="field-col">{item.top_cover_heat_no or ""}</td>
-                    <td class="field-col">{item.da_side_adaptor_plate_heat_no or ""}</td>
-                    <td class="field-col">{item.spring_side_adaptor_heat_no or ""}</td>
-                    <td class="field-col">{item.da_side_end_plate_heat_no or ""}</td>
-                    <td class="field-col">{item.spring_side_end_plate_heat_no or ""}</td>
-            """
-        elif order.series == "21":
-            html_content += f"""
-                        {item.actuator_serial_no}
-                    </td>
-                    <td class="field-col">{item.body or ""}</td>
-                    <td class="field-col">{item.end_cap_right or ""}</td>
-                    <td class="field-col">{item.end_cap_left or ""}</td>
-                    <td class="field-col">{item.pinion or ""}</td>
-            """
-        
-        html_content += f"""
-                    <td class="status-col">
-                        {'Completed' if item.assembler_status == 'completed' else 'Pending'}
-                    </td>
-                    <td class="assembler-col">{assembler_name}</td>
-                </tr>
-        """
-    
-    html_content += """
-            </tbody>
-        </table>
-        
-        <script>
-            // Auto print when page loads
-            window.onload = function() {{
-                window.print();
-            }};
-        </script>
-    </body>
-    </html>
+    query = request.GET.get("q", "").strip()
+    traces, truncated = [], False
+    if query:
+        traces = list(_heat_trace_rows(search_heat_traces(query)[:HEAT_TRACE_PAGE_LIMIT + 1]))
+        truncated = len(traces) > HEAT_TRACE_PAGE_LIMIT
+        traces = traces[:HEAT_TRACE_PAGE_LIMIT]
+
+    context = {
+        "query": query,
+        "traces": traces,
+        "truncated": truncated,
+        "page_limit": HEAT_TRACE_PAGE_LIMIT,
+    }
+    return render(request, "dashboards/heat_trace.html", context)
+
+
+@login_required
+@require_GET
+@read_from_replica
+def heat_trace_api(request):
     """
-    
-    response.write(html_content)
+    Heat number search as JSON; ?q=<heat no>&limit=<n>
+    """
+    query = request.GET.get("q", "").strip()
+    try:
+        limit = int(request.GET.get("limit", HEAT_TRACE_PAGE_LIMIT))
+    except ValueError:
+        limit = HEAT_TRACE_PAGE_LIMIT
+    limit = max(1, min(limit, HEAT_TRACE_API_MAX_LIMIT))
+
+    results = list(_heat_trace_rows(search_heat_traces(query)[:limit + 1]))
+    return JsonResponse({
+        "query": query,
+        "results": results[:limit],
+        "truncated": len(results) > limit,
+    })
+
+
+class _Echo:
+    """
+    File-like object whose write() returns the value, for streaming csv.writer rows
+    """
+    def write(self, value):
+        return value
+
+
+@login_required
+@require_GET
+@read_from_replica
+def heat_trace_export(request):
+    """
+    Stream every match of a heat number search as CSV
+    """
+    query = request.GET.get("q", "").strip()
+    if not query:
+        messages.error(request, "Enter a heat number to export.")
+        return redirect("heat_trace_search")
+
+    writer = csv.writer(_Echo())
+    traces = _heat_trace_rows(search_heat_traces(query).iterator(chunk_size=2000))
+
+    def rows():
+        yield writer.writerow(HEAT_TRACE_CSV_HEADER)
+        for trace in traces:
+            yield writer.writerow((
+                trace["heat_no"], trace["component_label"], trace["series"],
+                trace["actuator_serial_no"], trace["order__order_no"],
+                trace["order__sales_order_no"], trace["order__customer"],
+                trace["order__item_code"], trace["order__order_status"],
+            ))
+
+    filename = re.sub(r"[^A-Za-z0-9_-]+", "_", query)
+    response = StreamingHttpResponse(rows(), content_type="text/csv")
+    response["Content-Disposition"] = f'attachment; filename="Heat_Trace_{filename}.csv"'
     return response
-    return response
\ No newline at end of file